@@ -0,0 +1,96 @@
+import os
+import tkinter as tk
+from typing import TYPE_CHECKING, Dict, Iterable, Tuple, Union
+
+# PIL is imported only when an icon has to be decoded and resized; icons
+# already in the disk cache are read by Tk itself (Tk 8.6 reads PNG)
+if TYPE_CHECKING:
+    from PIL import Image, ImageTk
+
+Size = Tuple[int, int]
+Photo = Union[tk.PhotoImage, "ImageTk.PhotoImage"]
+
+# Every icon the pages use, with the size they show it at
+ICONS: Tuple[Tuple[str, Size], ...] = (
+    ("images/login.png", (108, 108)),
+    ("images/login.png", (36, 36)),
+    ("images/shift.png", (24, 24)),
+    ("images/price.png", (24, 24)),
+    ("images/delivery.png", (24, 24)),
+    ("images/inventory.png", (24, 24)),
+    ("images/transaction.png", (24, 24)),
+    ("images/logout.png", (24, 24)),
+    ("images/diesel_1.png", (48, 48)),
+    ("images/diesel_2.png", (48, 48)),
+    ("images/premium_1.png", (48, 48)),
+    ("images/premium_2.png", (48, 48)),
+    ("images/premium_3.png", (48, 48)),
+    ("images/unleaded.png", (48, 48)),
+    ("images/pump.png", (48, 48)),      # pumps without an icon of their own
+)
+
+# Folder for pre-resized copies of the icons, filled on first use;
+# GAS_INVENTORY_ICON_CACHE="" turns the disk cache off
+CACHE_DIR = os.environ.get("GAS_INVENTORY_ICON_CACHE", "images/.cache") or None
+
+# Decodes and resizes each (path, size) once and hands the same PhotoImage
+# to every page that asks for it
+class AssetRegistry:
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir
+        self._photos: Dict[Tuple[str, Size], Photo] = {}
+
+    # Shared PhotoImage of an icon (needs a Tk root)
+    def icon(self, path: str, size: Size) -> Photo:
+        key = (path, size)
+        photo = self._photos.get(key)
+        if photo is None:
+            cached = self.fresh_cache(path, size)
+            if cached:
+                photo = tk.PhotoImage(file=cached)
+            else:
+                from PIL import ImageTk
+                photo = ImageTk.PhotoImage(self.resized(path, size))
+            self._photos[key] = photo
+        return photo
+
+    # Resized image, from the disk cache when it is newer than the source
+    def resized(self, path: str, size: Size) -> "Image.Image":
+        from PIL import Image
+
+        cached = self.fresh_cache(path, size)
+        if cached:
+            return Image.open(cached)
+        cached = self.cache_path(path, size)
+        image = Image.open(path).resize(size)
+        if cached:
+            try:
+                os.makedirs(os.path.dirname(cached), exist_ok=True)
+                image.save(cached)
+            except OSError:
+                pass  # read-only install, keep resizing in memory
+        return image
+
+    # Path of the cached copy if it exists and is newer than the source
+    def fresh_cache(self, path: str, size: Size) -> str | None:
+        cached = self.cache_path(path, size)
+        if cached and os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+            return cached
+        return None
+
+    def cache_path(self, path: str, size: Size) -> str | None:
+        if not self.cache_dir:
+            return None
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{size[0]}x{size[1]}.png")
+
+    # Writes the disk cache for the given icons without creating PhotoImages
+    def write_cache(self, icons: Iterable[Tuple[str, Size]] = ICONS) -> int:
+        written = 0
+        for path, size in icons:
+            self.resized(path, size)
+            written += 1
+        return written
+
+# Shared by every page of the running program
+assets = AssetRegistry(CACHE_DIR)
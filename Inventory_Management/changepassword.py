@@ -1,20 +1,9 @@
-import sqlite3
-import hashlib
-
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+from core import auth
+from core.db import get_connection, close_connection
 
 def change_password(username, new_password):
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    new_hash = hash_password(new_password)
-    cursor.execute(
-        'UPDATE users SET password_hash=? WHERE username=?',
-        (new_hash, username)
-    )
-    conn.commit()
-    updated = cursor.rowcount
-    conn.close()
+    updated = auth.change_password(get_connection(), username, new_password)
+    close_connection()
     if updated:
         print(f"Password for '{username}' changed successfully!")
     else:
@@ -23,4 +12,4 @@ def change_password(username, new_password):
 if __name__ == "__main__":
     user = input("Enter username: ")
     new_pass = input("Enter new password: ")
-    change_password(user, new_pass)
\ No newline at end of file
+    change_password(user, new_pass)
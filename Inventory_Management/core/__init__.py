@@ -0,0 +1,2 @@
+# Headless building blocks of the inventory system (database access, services).
+# Nothing in this package imports tkinter or PIL.
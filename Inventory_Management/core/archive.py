@@ -0,0 +1,253 @@
+# Year partitions of the transactions table. A closed year can be moved into
+# its own file (Databases/archive/transactions_2023.db, gzip-compressed once
+# it is cold) so the station database only holds recent sales. The rollups
+# keep counting archived sales, so the Inventory page does not change.
+#
+# Queries that read transaction rows go through sources(): it yields the
+# live table and then each archived year the date range touches, attached
+# one at a time (SQLite attaches at most 10 databases per connection).
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Tuple
+
+from . import rollups, timestamps
+
+# Folder of the partitions, next to the station database unless
+# GAS_INVENTORY_ARCHIVE points elsewhere. Decompressed copies of .gz
+# partitions are made on first use in its .cache folder.
+ARCHIVE_DIR_NAME = "archive"
+CACHE_DIR_NAME = ".cache"
+# gzip level of compressed partitions: 6 is about 4x faster than 9 for a
+# file only 5% larger
+COMPRESS_LEVEL = 6
+
+LIVE = "main.transactions"
+
+class Partition(NamedTuple):
+    year: int
+    path: str           # file name in archive_dir()
+    rows: int
+    first_id: int       # lowest and highest transaction_id in the file
+    last_id: int
+    income: float
+    volume: float
+    compressed: bool
+    archived: str
+
+# Table and indexes of a partition, the same as the live table's
+_PARTITION_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS {schema}.transactions (
+        transaction_id INTEGER PRIMARY KEY,
+        shift_id INTEGER NOT NULL,
+        pump_id INTEGER NOT NULL,
+        Volume REAL NOT NULL,
+        Price REAL NOT NULL,
+        Date DATETIME
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS {schema}.idx_transactions_date ON transactions(Date, pump_id, Price, Volume, shift_id)',
+    'CREATE INDEX IF NOT EXISTS {schema}.idx_transactions_pump ON transactions(pump_id, Date, Price, Volume)',
+)
+
+def archive_dir(conn: sqlite3.Connection) -> str:
+    configured = os.environ.get("GAS_INVENTORY_ARCHIVE")
+    if configured:
+        return configured
+    main_file = next(row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main")
+    return os.path.join(os.path.dirname(main_file), ARCHIVE_DIR_NAME)
+
+def _bounds(year: int) -> tuple[str, str]:
+    return timestamps.day_start(datetime.date(year, 1, 1)), timestamps.day_start(datetime.date(year + 1, 1, 1))
+
+def _file_name(year: int) -> str:
+    return f"transactions_{year}.db"
+
+# Every archived year, oldest first (none before schema 8)
+def partitions(conn: sqlite3.Connection) -> List[Partition]:
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archive_partitions'").fetchone() is None:
+        return []
+    return [Partition(*row[:7], bool(row[7]), row[8]) for row in conn.execute('''
+        SELECT year, path, rows, first_id, last_id, income, volume, compressed, archived
+        FROM archive_partitions ORDER BY year
+    ''')]
+
+# Archived years overlapping [start, end); None leaves that side open
+def partitions_between(conn: sqlite3.Connection, start: datetime.date | None = None,
+                       end: datetime.date | None = None) -> List[Partition]:
+    last = None
+    if end is not None:
+        last = (end - datetime.timedelta(microseconds=1)).year if isinstance(end, datetime.datetime) \
+            else (end - datetime.timedelta(days=1)).year
+    return [partition for partition in partitions(conn)
+            if (start is None or partition.year >= start.year) and (last is None or partition.year <= last)]
+
+# Path of a partition's database file, decompressed into the cache if needed
+def partition_file(conn: sqlite3.Connection, partition: Partition) -> str:
+    path = os.path.join(archive_dir(conn), partition.path)
+    if not partition.compressed:
+        return path
+    cached = os.path.join(archive_dir(conn), CACHE_DIR_NAME, _file_name(partition.year))
+    if not os.path.exists(cached) or os.path.getmtime(cached) < os.path.getmtime(path):
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        with gzip.open(path, "rb") as source, open(cached + ".part", "wb") as target:
+            shutil.copyfileobj(source, target, 1 << 20)
+        os.replace(cached + ".part", cached)
+    return cached
+
+# Attaches one partition for the duration of the block; yields its schema name
+@contextmanager
+def attached(conn: sqlite3.Connection, partition: Partition) -> Iterator[str]:
+    schema = f"archive_{partition.year}"
+    conn.execute("ATTACH DATABASE ? AS " + schema, (partition_file(conn, partition),))
+    try:
+        yield schema
+    finally:
+        conn.execute("DETACH DATABASE " + schema)
+
+# Table names to run a transactions query against, one after the other, in
+# date order: every archived year overlapping [start, end), then the live
+# table (the other way round when newest_first). Each archive is attached
+# only while the caller is on it, so read its rows before taking the next.
+def sources(conn: sqlite3.Connection, start: datetime.date | None = None, end: datetime.date | None = None,
+            newest_first: bool = False) -> Iterator[str]:
+    found = partitions_between(conn, start, end)
+    if newest_first:
+        found.reverse()
+        yield LIVE
+    for partition in found:
+        with attached(conn, partition) as schema:
+            yield f"{schema}.transactions"
+    if not newest_first:
+        yield LIVE
+
+# Per day and pump totals of every archived year, for rollups.backfill
+def daily_totals(conn: sqlite3.Connection) -> List[Tuple[str, int, float, float, int]]:
+    totals: List[Tuple[str, int, float, float, int]] = []
+    for table in sources(conn):
+        if table != LIVE:
+            totals.extend(conn.execute(rollups.DAILY_TOTALS.format(table=table), (0,)))
+    return totals
+
+# Moves every sale of a closed year into its own file and returns the
+# partition. The file is written and checked first; the rows leave the
+# station database in the same transaction that registers the partition.
+def archive_year(conn: sqlite3.Connection, year: int, compress: bool = False,
+                 today: datetime.date | None = None) -> Partition:
+    today = today or datetime.date.today()
+    if year >= today.year:
+        raise ValueError(f"{year} is not closed yet, only years before {today.year} can be archived")
+    if any(partition.year == year for partition in partitions(conn)):
+        raise ValueError(f"{year} is already archived")
+    start, end = _bounds(year)
+    rows, first_id, last_id, income, volume = conn.execute('''
+        SELECT COUNT(*), MIN(transaction_id), MAX(transaction_id), COALESCE(SUM(Price), 0), COALESCE(SUM(Volume), 0)
+        FROM transactions WHERE Date >= ? AND Date < ?
+    ''', (start, end)).fetchone()
+    if rows == 0:
+        raise ValueError(f"No sales in {year}")
+    # Archived years always come before the station database's sales, which
+    # keeps sources() in date order
+    earlier = conn.execute('SELECT substr(MIN(Date), 1, 4) FROM transactions WHERE Date < ?', (start,)).fetchone()[0]
+    if earlier is not None:
+        raise ValueError(f"Archive {earlier} first, years are archived oldest first")
+
+    folder = archive_dir(conn)
+    os.makedirs(folder, exist_ok=True)
+    name = _file_name(year)
+    path = os.path.join(folder, name)
+    partial = path + ".part"
+    if os.path.exists(partial):
+        os.remove(partial)   # left over from an interrupted run
+    conn.execute("ATTACH DATABASE ? AS archive_new", (partial,))
+    try:
+        with conn:
+            for statement in _PARTITION_SCHEMA[:1]:
+                conn.execute(statement.format(schema="archive_new"))
+            conn.execute('''
+                INSERT INTO archive_new.transactions
+                SELECT transaction_id, shift_id, pump_id, Volume, Price, Date
+                FROM main.transactions WHERE Date >= ? AND Date < ?
+            ''', (start, end))
+            # Indexes after the rows: one sort instead of a b-tree insert per row
+            for statement in _PARTITION_SCHEMA[1:]:
+                conn.execute(statement.format(schema="archive_new"))
+        copied = conn.execute('''
+            SELECT COUNT(*), COALESCE(SUM(Price), 0), COALESCE(SUM(Volume), 0) FROM archive_new.transactions
+        ''').fetchone()
+    finally:
+        conn.execute("DETACH DATABASE archive_new")
+    if copied[0] != rows or abs(copied[1] - income) > 1e-6 * max(1.0, abs(income)):
+        os.remove(partial)
+        raise RuntimeError(f"Archive of {year} does not match the station database, nothing was moved")
+
+    if compress:
+        _gzip(partial, partial + ".gz")
+        os.remove(partial)
+        name += ".gz"
+        os.replace(partial + ".gz", path + ".gz")
+    else:
+        os.replace(partial, path)
+
+    partition = Partition(year, name, rows, first_id, last_id, income, volume, compress, timestamps.stamp())
+    with conn:
+        deleted = conn.execute('DELETE FROM transactions WHERE Date >= ? AND Date < ?', (start, end)).rowcount
+        if deleted != rows:
+            raise RuntimeError(f"{year} changed while it was archived; run the archive again")
+        conn.execute('''
+            INSERT INTO archive_partitions(year, path, rows, first_id, last_id, income, volume, compressed, archived)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', partition)
+    return partition
+
+# Compresses the file of an archived year (done once it is rarely read)
+def compress_year(conn: sqlite3.Connection, year: int) -> Partition:
+    partition = _registered(conn, year)
+    if partition.compressed:
+        return partition
+    path = os.path.join(archive_dir(conn), partition.path)
+    _gzip(path, path + ".gz.part")
+    os.replace(path + ".gz.part", path + ".gz")
+    with conn:
+        conn.execute('UPDATE archive_partitions SET path = ?, compressed = 1 WHERE year = ?',
+                     (partition.path + ".gz", year))
+    os.remove(path)
+    return partition._replace(path=partition.path + ".gz", compressed=True)
+
+# Moves an archived year back into the station database and deletes its file
+def restore_year(conn: sqlite3.Connection, year: int) -> int:
+    partition = _registered(conn, year)
+    newest = partitions(conn)[-1].year
+    if year != newest:
+        raise ValueError(f"Restore {newest} first, years are restored newest first")
+    with attached(conn, partition) as schema:
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            # The rollups still count these sales, the trigger must not add them again
+            with rollups.trigger_dropped(cursor):
+                cursor.execute(f'''
+                    INSERT INTO main.transactions(transaction_id, shift_id, pump_id, Volume, Price, Date)
+                    SELECT transaction_id, shift_id, pump_id, Volume, Price, Date FROM {schema}.transactions
+                ''')
+            cursor.execute('DELETE FROM archive_partitions WHERE year = ?', (year,))
+    folder = archive_dir(conn)
+    os.remove(os.path.join(folder, partition.path))
+    cached = os.path.join(folder, CACHE_DIR_NAME, _file_name(year))
+    if os.path.exists(cached):
+        os.remove(cached)
+    return partition.rows
+
+def _registered(conn: sqlite3.Connection, year: int) -> Partition:
+    for partition in partitions(conn):
+        if partition.year == year:
+            return partition
+    raise ValueError(f"{year} is not archived")
+
+def _gzip(source_path: str, target_path: str) -> None:
+    with open(source_path, "rb") as source, gzip.open(target_path, "wb", COMPRESS_LEVEL) as target:
+        shutil.copyfileobj(source, target, 1 << 20)
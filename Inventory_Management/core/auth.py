@@ -0,0 +1,21 @@
+import hashlib
+import sqlite3
+from typing import Tuple
+
+def hash_password(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+# (True, user_id) when the username and password match, (False, None) otherwise
+def check_login(conn: sqlite3.Connection, username: str, password: str) -> Tuple[bool, int | None]:
+    dbrow = conn.execute('SELECT user_id, password_hash FROM users WHERE username=?',
+                         (username,)).fetchone()
+    if dbrow and hash_password(password) == dbrow[1]:
+        return True, dbrow[0]
+    return False, None
+
+# Returns the number of users updated (0 if the username does not exist)
+def change_password(conn: sqlite3.Connection, username: str, new_password: str) -> int:
+    with conn:
+        cursor = conn.execute('UPDATE users SET password_hash=? WHERE username=?',
+                              (hash_password(new_password), username))
+    return cursor.rowcount
@@ -0,0 +1,222 @@
+# Terminal side of the station server (core/server.py). StationClient sends
+# requests and matches the replies by id, so the Tk thread and the query
+# workers can share one socket; events the server pushes are queued for
+# poll(). RemoteStation gives the pages the same calls as LocalStation.
+import datetime
+import itertools
+import queue
+import socket
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from . import events, protocol, reporting
+from .pricing import price_resolver
+from .pumps import Forecourt, pump_registry
+
+# Seconds to wait for a reply before giving up on the server
+TIMEOUT = 10.0
+
+class _Pending:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.done = threading.Event()
+        self.reply: Dict[str, Any] | None = None
+
+class StationClient:
+    def __init__(self, address: str = protocol.DEFAULT_ADDRESS, timeout: float = TIMEOUT):
+        self.address = address
+        self.timeout = timeout
+        self.events: "queue.Queue[str]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._connecting = threading.Lock()
+        self._pending: Dict[int, _Pending] = {}
+        self._socket: socket.socket | None = None
+        self._login: Tuple[str, str] | None = None
+
+    # Connects (again, after the server went away) and says hello
+    def connect(self) -> None:
+        kind, target = protocol.parse_address(self.address)
+        if kind == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET6 if ":" in target[0] else socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        with self._lock:
+            self._socket = sock
+        threading.Thread(target=self._read, args=(sock,), name="station-client", daemon=True).start()
+        self._request("hello", {"version": protocol.PROTOCOL_VERSION})
+        if self._login is not None:
+            self._request("login", {"username": self._login[0], "password": self._login[1]})
+
+    def close(self) -> None:
+        with self._lock:
+            sock, self._socket = self._socket, None
+        if sock is not None:
+            sock.close()
+
+    # Result of one operation; raises RemoteError when the server refused it and
+    # ConnectionError when it could not be reached. A request whose reply was
+    # lost is not sent again (the sale may be recorded); the next call reconnects.
+    def call(self, op: str, **args: Any) -> Any:
+        if self._socket is None:
+            with self._connecting:
+                if self._socket is None:
+                    self.connect()
+        return self._request(op, args)
+
+    def login(self, username: str, password: str) -> Dict[str, Any]:
+        result = self.call("login", username=username, password=password)
+        # Logged in again by itself when it has to reconnect
+        self._login = (username, password) if result["ok"] else None
+        return result
+
+    def logout(self) -> None:
+        self._login = None
+        self.call("logout")
+
+    def _request(self, op: str, args: Dict[str, Any]) -> Any:
+        request_id = next(self._ids)
+        data = protocol.encode({"id": request_id, "op": op, "args": args})
+        with self._lock:
+            sock = self._socket
+            if sock is None:
+                raise ConnectionError("Not connected to the station server")
+            pending = self._pending[request_id] = _Pending(sock)
+            try:
+                sock.sendall(data)
+            except OSError as error:
+                del self._pending[request_id]
+                raise ConnectionError(f"Station server: {error}") from error
+        if not pending.done.wait(self.timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise ConnectionError(f"Station server did not answer {op} within {self.timeout:.0f}s")
+        reply = pending.reply
+        if reply is None:
+            raise ConnectionError("Lost the connection to the station server")
+        if not reply.get("ok"):
+            raise protocol.RemoteError(reply.get("error", "failed"), reply.get("kind", "server"))
+        return reply.get("result")
+
+    # Reader thread: replies to whoever waits for them, events to the queue
+    def _read(self, sock: socket.socket) -> None:
+        try:
+            with sock.makefile("rb") as stream:
+                for line in stream:
+                    message = protocol.decode(line)
+                    if "event" in message:
+                        self.events.put(message["event"])
+                        continue
+                    with self._lock:
+                        pending = self._pending.pop(message.get("id"), None)
+                    if pending is not None:
+                        pending.reply = message
+                        pending.done.set()
+        except (OSError, ValueError):
+            pass
+        finally:
+            # Wake everyone still waiting on this socket; their reply stays None
+            with self._lock:
+                if self._socket is sock:
+                    self._socket = None
+                waiting = [key for key, pending in self._pending.items() if pending.sock is sock]
+                lost = [self._pending.pop(key) for key in waiting]
+            for pending in lost:
+                pending.done.set()
+
+# The calls of LocalStation (core/station.py), answered by the station server
+class RemoteStation:
+    remote = True
+
+    def __init__(self, address: str = protocol.DEFAULT_ADDRESS):
+        self.client = StationClient(address)
+
+    def open(self) -> None:
+        self.client.connect()
+        price_resolver.loader = self.current_prices
+        pump_registry.loader = self.forecourt
+
+    def close(self) -> None:
+        self.client.close()
+
+    # Topics other terminals changed; prices are reloaded on next use
+    def poll(self) -> List[str]:
+        topics = []
+        while True:
+            try:
+                topic = self.client.events.get_nowait()
+            except queue.Empty:
+                return topics
+            if topic == events.PRICES:
+                price_resolver.invalidate()
+            if topic not in topics:
+                topics.append(topic)
+
+    def connection(self):
+        raise RuntimeError("This terminal uses the station server, it has no database file")
+
+    def check_login(self, username: str, password: str) -> Tuple[bool, int | None]:
+        result = self.client.login(username, password)
+        return result["ok"], result["user_id"]
+
+    def start_shift(self, user_id: int, shift_date: str, shift_type: str, start_time: str) -> int:
+        return self.client.call("start_shift", user_id=user_id, shift_date=shift_date,
+                                shift_type=shift_type, start_time=start_time)
+
+    def end_shift(self, shift_id: int, end_time: str) -> int | None:
+        return self.client.call("end_shift", shift_id=shift_id, end_time=end_time)
+
+    def last_finished_shift(self) -> Tuple[str, str] | None:
+        row = self.client.call("last_finished_shift")
+        return tuple(row) if row else None
+
+    def forecourt(self) -> Forecourt:
+        return Forecourt.from_json(self.client.call("forecourt"))
+
+    # Acknowledged once the sales are durable in the server's journal; refused
+    # unless shift_id is the shift this terminal's user has open
+    def record_sales(self, shift_id: int, sales: Sequence[Tuple[int, float, float]], date: str) -> None:
+        self.client.call("record_sales", shift_id=shift_id, sales=[list(sale) for sale in sales], date=date)
+
+    def current_prices(self) -> Dict[str, float]:
+        return self.client.call("current_prices")
+
+    def price_history(self, names: Sequence[str]) -> List[Tuple[str, float, str]]:
+        return [tuple(row) for row in self.client.call("price_history", names=list(names))]
+
+    def add_price(self, fuel_type_id: int, name: str, price: float) -> None:
+        self.client.call("add_price", fuel_type_id=fuel_type_id, name=name, price=price)
+        price_resolver.update(name, price)
+
+    def fetch_older(self, before_id: int | None = None) -> list:
+        return [tuple(row) for row in self.client.call("fetch_older", before_id=before_id)]
+
+    def fetch_newer(self, after_id: int) -> list:
+        return [tuple(row) for row in self.client.call("fetch_newer", after_id=after_id)]
+
+    def inventory_report(self) -> reporting.InventoryReport:
+        result = self.client.call("inventory_report")
+        fuels = []
+        for fuel in result["fuels"]:
+            fuel["lifetime_volume"] = protocol.int_keys(fuel["lifetime_volume"])
+            fuel["daily_volume"] = protocol.int_keys(fuel["daily_volume"])
+            fuels.append(reporting.FuelReport(**fuel))
+        return reporting.InventoryReport(result["periods"], fuels)
+
+    def time_series(self, start: datetime.date, end: datetime.date, granularity: str = "day",
+                    group_by: str = "pump") -> reporting.TimeSeries:
+        result = self.client.call("time_series", start=start.isoformat(), end=end.isoformat(),
+                                  granularity=granularity, group_by=group_by)
+        for name in ("groups", "income", "volume", "sales"):
+            result[name] = protocol.int_keys(result[name])
+        result["start"] = datetime.datetime.fromisoformat(result["start"])
+        result["end"] = datetime.datetime.fromisoformat(result["end"])
+        return reporting.TimeSeries(**result)
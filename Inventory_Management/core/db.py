@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from .profiling import ProfilingConnection, profiler
+
+# Path of the station database, relative to where the program is started.
+# GAS_INVENTORY_DB can point the app (or a benchmark) at another file.
+DB_PATH = os.environ.get("GAS_INVENTORY_DB", "Databases/inventory_db.db")
+
+# Settings applied once to every new connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",        # readers don't block the writer
+    "PRAGMA synchronous = NORMAL",      # safe with WAL, one fsync per checkpoint
+    "PRAGMA cache_size = -16000",       # ~16 MB page cache
+    "PRAGMA mmap_size = 268435456",     # map up to 256 MB of the file
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+
+# Opens a new connection with the pragmas above (a profiled one when the
+# profiler is on)
+def connect(path: str | None = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path or DB_PATH,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=True,
+        factory=ProfilingConnection if profiler.enabled else sqlite3.Connection,
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+# Returns the connection owned by the calling thread, opening it on first use
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        if conn is not None:
+            conn.close()
+        conn = connect(DB_PATH)
+        _local.conn = conn
+        _local.path = DB_PATH
+    return conn
+
+# Closes the calling thread's connection (called on shutdown and by worker threads)
+def close_connection() -> None:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+# Points every later get_connection() at another database file
+def set_database_path(path: str) -> None:
+    global DB_PATH
+    DB_PATH = path
+
+# Runs a block in one transaction: commit on success, rollback on error
+@contextmanager
+def transaction(conn: sqlite3.Connection | None = None) -> Iterator[sqlite3.Cursor]:
+    conn = conn or get_connection()
+    with conn:
+        yield conn.cursor()
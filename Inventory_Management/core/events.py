@@ -0,0 +1,23 @@
+from collections import defaultdict
+from typing import Callable, DefaultDict, List
+
+# Kinds of data a page can depend on
+TRANSACTIONS = "transactions"
+PRICES = "prices"
+SHIFTS = "shifts"
+
+_subscribers: DefaultDict[str, List[Callable[[], None]]] = defaultdict(list)
+
+# Calls callback whenever topic is published; returns a function that stops it
+def subscribe(topic: str, callback: Callable[[], None]) -> Callable[[], None]:
+    _subscribers[topic].append(callback)
+
+    def unsubscribe() -> None:
+        if callback in _subscribers[topic]:
+            _subscribers[topic].remove(callback)
+    return unsubscribe
+
+# Tells every subscriber that the data behind topic changed (after the commit)
+def publish(topic: str) -> None:
+    for callback in list(_subscribers[topic]):
+        callback()
@@ -0,0 +1,93 @@
+import queue
+import threading
+from typing import Any, Callable, List
+
+from . import station
+from .db import close_connection, get_connection
+
+# A read submitted to the executor. Jobs whose owner went away are skipped.
+class Job:
+    def __init__(self, work: Callable[[Any], Any], on_done: Callable[[Any], None],
+                 on_error: Callable[[BaseException], None] | None, alive: Callable[[], bool] | None):
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.alive = alive
+        self.cancelled = False
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+# Runs database reads on worker threads (each with its own connection) and
+# hands the results back to whoever calls poll(), i.e. the Tk main loop.
+# Work gets context() of the worker thread: its connection by default.
+class QueryExecutor:
+    def __init__(self, workers: int = 1, context: Callable[[], Any] = get_connection):
+        self._workers = workers
+        self._context = context
+        self._jobs: "queue.Queue[Job | None]" = queue.Queue()
+        self._finished: "queue.Queue[Job]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        for number in range(self._workers):
+            thread = threading.Thread(target=self._run, name=f"query-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    # Queues work(context); on_done(result) runs later on the polling thread.
+    # alive() is checked on the polling thread before the callback runs.
+    def submit(self, work: Callable[[Any], Any], on_done: Callable[[Any], None],
+               on_error: Callable[[BaseException], None] | None = None,
+               alive: Callable[[], bool] | None = None) -> Job:
+        self.start()
+        job = Job(work, on_done, on_error, alive)
+        self._jobs.put(job)
+        return job
+
+    # Delivers the results of finished jobs; returns how many callbacks ran
+    def poll(self) -> int:
+        delivered = 0
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                return delivered
+            if job.cancelled or (job.alive is not None and not job.alive()):
+                continue
+            if job.error is not None:
+                if job.on_error is None:
+                    raise job.error
+                job.on_error(job.error)
+            else:
+                job.on_done(job.result)
+            delivered += 1
+
+    def shutdown(self) -> None:
+        for _ in self._threads:
+            self._jobs.put(None)
+        self._threads = []
+
+    def _run(self) -> None:
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                if job.cancelled:
+                    continue
+                try:
+                    job.result = job.work(self._context())
+                except Exception as error:
+                    job.error = error
+                self._finished.put(job)
+        finally:
+            close_connection()
+
+# Shared by every page of the running program; work gets the station the
+# program uses (core/station.py), whose reads use the worker's connection
+query_executor = QueryExecutor(context=station.current)
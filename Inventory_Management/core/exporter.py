@@ -0,0 +1,227 @@
+# Export of transactions, shifts and price history to CSV, gzip-compressed
+# CSV or an XLSX workbook. Rows go from the cursor to the file one batch at
+# a time (fetchmany -> writer), so the size of an export never shows in
+# memory. The file is written under a temporary name and renamed when done.
+import csv
+import datetime
+import gzip
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple
+
+from . import archive, timestamps
+
+DATASETS = ("transactions", "shifts", "prices")
+# format -> file name ending
+FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "xlsx": ".xlsx"}
+# Rows fetched and written at a time
+BATCH_SIZE = 5000
+# Rows per worksheet; an XLSX sheet holds 1,048,576 including the header
+SHEET_ROWS = 1_000_000
+
+# Called after every batch with the number of rows written so far
+Progress = Callable[[int], None]
+
+# What to export. Dates are days: start is the first one, end the day after
+# the last one. Pump and fuel only apply to transactions and prices.
+@dataclass
+class ExportFilter:
+    start: datetime.date | None = None
+    end: datetime.date | None = None
+    pump_id: int | None = None
+    fuel_type_id: int | None = None
+    shift_id: int | None = None
+
+# (column names, indexes of the timestamp columns, SQL, parameters) of a
+# dataset; the transactions SQL has a {table} to fill in (see _rows)
+def _query(conn: sqlite3.Connection, dataset: str,
+           filters: ExportFilter) -> Tuple[List[str], Tuple[int, ...], str, List[Any]]:
+    where: List[str] = []
+    params: List[Any] = []
+
+    def date_range(column: str) -> None:
+        if filters.start is not None:
+            where.append(f"{column} >= ?")
+            params.append(timestamps.day_start(filters.start))
+        if filters.end is not None:
+            where.append(f"{column} < ?")
+            params.append(timestamps.day_start(filters.end))
+
+    if dataset == "transactions":
+        date_range("t.Date")
+        if filters.pump_id is not None:
+            where.append("t.pump_id = ?")
+            params.append(filters.pump_id)
+        if filters.fuel_type_id is not None:
+            where.append("p.fuel_type_id = ?")
+            params.append(filters.fuel_type_id)
+        if filters.shift_id is not None:
+            where.append("t.shift_id = ?")
+            params.append(filters.shift_id)
+            # A shift's sales are within the days it ran: a range of the date index
+            # instead of a scan (whole days, as sales before schema 5 have no time)
+            row = conn.execute('SELECT shift_start_time, shift_end_time FROM shift WHERE shift_id = ?',
+                               (filters.shift_id,)).fetchone()
+            if row is not None and row[0]:
+                where.append("t.Date >= ?")
+                params.append(row[0][:10])
+                if row[1]:
+                    where.append("t.Date < ?")
+                    params.append(timestamps.day_start(timestamps.parse(row[1]).date() + datetime.timedelta(days=1)))
+        header = ["Transaction ID", "Date & Time", "Pump Label", "Fuel Type", "Volume (Liters)",
+                  "Price (Pesos)", "Shift ID", "Shift", "Cashier"]
+        # Ordered by Date alone so idx_transactions_date (or idx_transactions_pump)
+        # hands the rows over in order, without sorting the whole export
+        sql = '''
+            SELECT t.transaction_id, t.Date, p.pump_label, f.fuel_name, t.Volume, t.Price,
+                   t.shift_id, s.shift_type, u.username
+            FROM {{table}} AS t
+            JOIN pump AS p ON p.pump_id = t.pump_id
+            JOIN fuel_type AS f ON f.fuel_type_id = p.fuel_type_id
+            LEFT JOIN shift AS s ON s.shift_id = t.shift_id
+            LEFT JOIN users AS u ON u.user_id = s.user_id
+            {where}
+            ORDER BY t.Date
+        '''
+        return header, (1,), sql.format(where=_where(where)), params
+
+    if dataset == "shifts":
+        date_range("s.shift_start_time")
+        if filters.shift_id is not None:
+            where.append("s.shift_id = ?")
+            params.append(filters.shift_id)
+        header = ["Shift ID", "Cashier", "Shift Date", "Shift", "Start", "End"]
+        sql = '''
+            SELECT s.shift_id, u.username, s.shift_date, s.shift_type, s.shift_start_time, s.shift_end_time
+            FROM shift AS s
+            LEFT JOIN users AS u ON u.user_id = s.user_id
+            {where}
+            ORDER BY s.shift_start_time
+        '''
+        return header, (4, 5), sql.format(where=_where(where)), params
+
+    if dataset == "prices":
+        date_range("pr.effective_date")
+        if filters.fuel_type_id is not None:
+            where.append("pr.fuel_type_id = ?")
+            params.append(filters.fuel_type_id)
+        header = ["Price ID", "Effective Date", "Fuel Type", "Name", "Price (Pesos)"]
+        sql = '''
+            SELECT pr.price_id, pr.effective_date, f.fuel_name, pr.Name, pr.price
+            FROM price AS pr
+            JOIN fuel_type AS f ON f.fuel_type_id = pr.fuel_type_id
+            {where}
+            ORDER BY pr.effective_date, pr.price_id
+        '''
+        return header, (1,), sql.format(where=_where(where)), params
+
+    raise ValueError(f"dataset must be one of {', '.join(DATASETS)}")
+
+def _where(conditions: Sequence[str]) -> str:
+    return "WHERE " + " AND ".join(conditions) if conditions else ""
+
+# Rows of the cursor, BATCH_SIZE at a time
+def batches(cursor: sqlite3.Cursor, size: int = BATCH_SIZE) -> Iterator[List[Tuple[Any, ...]]]:
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+# Batches of the query over every table it reads: for transactions the
+# archived years in the range (core/archive.py), oldest first, then the
+# station database, so the rows stay in date order
+def _rows(conn: sqlite3.Connection, dataset: str, sql: str, params: List[Any],
+          filters: ExportFilter) -> Iterator[List[Tuple[Any, ...]]]:
+    if dataset != "transactions":
+        yield from batches(conn.execute(sql, params))
+        return
+    for table in archive.sources(conn, filters.start, filters.end):
+        cursor = conn.execute(sql.format(table=table), params)
+        try:
+            yield from batches(cursor)
+        finally:
+            cursor.close()
+
+# Counts the rows passing through and reports them after every batch
+def _counted(rows: Iterable[List[Tuple[Any, ...]]], progress: Progress | None,
+             total: List[int]) -> Iterator[List[Tuple[Any, ...]]]:
+    for batch in rows:
+        yield batch
+        total[0] += len(batch)
+        if progress is not None:
+            progress(total[0])
+
+def write_csv(path: str, header: Sequence[str], rows: Iterable[List[Tuple[Any, ...]]],
+              compress: bool = False) -> None:
+    opener = gzip.open if compress else open
+    with opener(path, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for batch in rows:
+            writer.writerows(batch)
+
+# Write-only workbook (rows are streamed to the file, not kept in memory),
+# with timestamps as real Excel dates and a new sheet every SHEET_ROWS rows
+def write_xlsx(path: str, header: Sequence[str], rows: Iterable[List[Tuple[Any, ...]]],
+               title: str, date_columns: Sequence[int] = ()) -> None:
+    try:
+        from openpyxl import Workbook
+    except ImportError as error:
+        raise ValueError("Writing .xlsx files needs openpyxl (pip install openpyxl)") from error
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheets = sheet_rows = 0
+    for batch in rows:
+        for row in batch:
+            if sheet is None or sheet_rows == SHEET_ROWS:
+                sheets += 1
+                sheet = workbook.create_sheet(title if sheets == 1 else f"{title} {sheets}")
+                sheet.append(list(header))
+                sheet_rows = 0
+            values = list(row)
+            for index in date_columns:
+                try:
+                    values[index] = timestamps.parse(values[index])
+                except (TypeError, ValueError):
+                    pass    # empty, or not a timestamp: written as it is
+            sheet.append(values)
+            sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet(title).append(list(header))
+    workbook.save(path)
+
+# Format of a file name ("csv", "csv.gz" or "xlsx"), csv when unknown
+def format_for(path: str) -> str:
+    name = path.lower()
+    for fmt, ending in sorted(FORMATS.items(), key=lambda item: -len(item[1])):
+        if name.endswith(ending):
+            return fmt
+    return "csv"
+
+# Writes one dataset to path and returns the number of rows written
+def export(conn: sqlite3.Connection, dataset: str, path: str, filters: ExportFilter | None = None,
+           fmt: str | None = None, progress: Progress | None = None) -> int:
+    fmt = fmt or format_for(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    filters = filters or ExportFilter()
+    header, date_columns, sql, params = _query(conn, dataset, filters)
+    partial = path + ".part"
+    total = [0]
+    source = _rows(conn, dataset, sql, params, filters)
+    try:
+        rows = _counted(source, progress, total)
+        if fmt == "xlsx":
+            write_xlsx(partial, header, rows, dataset.capitalize(), date_columns)
+        else:
+            write_csv(partial, header, rows, compress=fmt == "csv.gz")
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    finally:
+        source.close()
+    return total[0]
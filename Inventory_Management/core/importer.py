@@ -0,0 +1,385 @@
+# Bulk import of historical sales from CSV or XLSX files. Rows are streamed
+# (csv.reader, openpyxl's read-only mode), checked against the pump and
+# fuel_type tables and written CHUNK_SIZE at a time. Each chunk is committed
+# together with the number of rows read so far (import_progress, schema
+# version 7), so an interrupted import continues after the last committed chunk.
+import bisect
+import csv
+import datetime
+import hashlib
+import itertools
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from . import archive, rollups, timestamps
+from .pricing import BULK_VOLUME
+
+# Rows per transaction
+CHUNK_SIZE = 20_000
+# Messages of rejected rows kept for the summary
+MAX_ERRORS = 50
+# Bytes at the start of a file that identify it in import_progress
+FINGERPRINT_BYTES = 65536
+
+# Header names accepted for each field, compared lower-case with _ for spaces
+COLUMNS = {
+    "pump": ("pump", "pump_label", "pump_id"),
+    "fuel": ("fuel", "fuel_type", "fuel_name", "fuel_type_id"),
+    "volume": ("volume", "liters", "litres"),
+    "price": ("price", "amount", "total"),
+    "date": ("date", "datetime", "date_&_time", "transaction_datetime", "timestamp"),
+    "shift": ("shift", "shift_id"),
+}
+REQUIRED = ("pump", "volume", "date")
+# Date formats tried after ISO-8601 (datetime.fromisoformat)
+DATE_FORMATS = ("%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M", "%m/%d/%Y", timestamps.LEGACY_PRICE_DATE_FORMAT)
+
+# shift_id, pump_id, Volume, Price, Date
+InsertRow = Tuple[int, int, float, float, str]
+
+# A row that cannot be imported; line is the row number in the file
+class InvalidRow(ValueError):
+    def __init__(self, line: int, message: str):
+        super().__init__(f"row {line}: {message}")
+        self.line = line
+
+@dataclass
+class ImportResult:
+    path: str
+    rows: int = 0               # data rows read, including earlier runs
+    imported: int = 0
+    skipped: int = 0
+    resumed_from: int = 0       # rows already done by an interrupted run
+    shifts_created: int = 0
+    finished: bool = False
+    errors: List[str] = field(default_factory=list)
+
+# Called after every committed chunk with the fraction of the file read
+Progress = Callable[[ImportResult, float], None]
+
+# Hash of the first bytes of a file: the same file keeps its progress when
+# it is renamed, moved or has rows appended
+def fingerprint(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(FINGERPRINT_BYTES)).hexdigest()
+
+# Header and data rows of a CSV or XLSX file, read one row at a time
+class SalesFile:
+    def __init__(self, path: str, sheet: str | None = None):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.line = 1
+        self._close: Callable[[], None]
+        if path.lower().endswith((".xlsx", ".xlsm")):
+            self._open_workbook(sheet)
+        else:
+            self._open_csv()
+
+    def _open_csv(self) -> None:
+        f = open(self.path, newline="", encoding="utf-8-sig")
+        reader = csv.reader(f)
+        self.header: List[Any] = next(reader, [])
+        self._rows: Iterator[Sequence[Any]] = reader
+        self._total_rows: int | None = None
+        self._close = f.close
+        self._file = f
+
+    def _open_workbook(self, sheet: str | None) -> None:
+        try:
+            import openpyxl
+        except ImportError as error:
+            raise ValueError("Reading .xlsx files needs openpyxl (pip install openpyxl)") from error
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        self._close = workbook.close
+        self._file = None
+        if sheet is not None:
+            if sheet not in workbook.sheetnames:
+                workbook.close()
+                raise ValueError(f"{self.path} has no sheet {sheet!r} ({', '.join(workbook.sheetnames)})")
+            worksheets = [workbook[sheet]]
+        else:
+            worksheets = workbook.worksheets
+        # The named sheet, or the first one with the required columns
+        for worksheet in worksheets:
+            rows = worksheet.iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            if sheet is not None or all(field in column_map(header) for field in REQUIRED):
+                self.header, self._rows = header, rows
+                self._total_rows = worksheet.max_row
+                return
+        workbook.close()
+        raise ValueError(f"No sheet of {self.path} has {', '.join(REQUIRED)} columns")
+
+    # (line, cells) of every data row
+    def rows(self) -> Iterator[Tuple[int, Sequence[Any]]]:
+        for cells in self._rows:
+            self.line += 1
+            yield self.line, cells
+
+    # Fraction of the file read so far, for progress reports
+    def fraction(self) -> float:
+        if self._total_rows:
+            return min(1.0, self.line / self._total_rows)
+        if self._file is None:
+            return 0.0      # a workbook saved without its dimensions
+        try:
+            return min(1.0, self._file.buffer.tell() / self.size) if self.size else 1.0
+        except (OSError, ValueError):
+            return 0.0
+
+    def close(self) -> None:
+        self._close()
+
+# field -> column index of the fields found in a header row
+def column_map(header: Sequence[Any]) -> Dict[str, int]:
+    names = ["_".join(str(cell or "").strip().lower().split()) for cell in header]
+    columns = {}
+    for field_name, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                columns[field_name] = names.index(alias)
+                break
+    return columns
+
+# Price rows of every Name sorted by effective_date, to price rows without a Price column
+class PriceHistory:
+    def __init__(self, conn: sqlite3.Connection):
+        self._dates: Dict[str, List[str]] = {}
+        self._prices: Dict[str, List[float]] = {}
+        for name, price, date in conn.execute('''
+            SELECT Name, price, effective_date FROM price ORDER BY Name, effective_date, price_id
+        '''):
+            self._dates.setdefault(name, []).append(date)
+            self._prices.setdefault(name, []).append(price)
+
+    # Price per liter in effect at date, None when no price was set yet
+    def price_per_liter(self, fuel_name: str, volume: float, date: str) -> float | None:
+        name = fuel_name if volume < BULK_VOLUME else f"{fuel_name}100"
+        index = bisect.bisect_right(self._dates.get(name, []), date) - 1
+        return self._prices[name][index] if index >= 0 else None
+
+# Shift of each imported sale when the file has no shift column: the recorded
+# shift that was open at that time, or else one shift per half day (AM/PM)
+# created for the import and owned by user_id
+class ImportShifts:
+    def __init__(self, conn: sqlite3.Connection, user_id: int):
+        self.conn = conn
+        self.user_id = user_id
+        self.created = 0
+        self._last: Tuple[str, str, int] | None = None   # start, end, shift_id
+
+    def shift_for(self, date: str) -> int:
+        last = self._last
+        if last is not None and last[0] <= date < last[1]:
+            return last[2]
+        row = self.conn.execute('''
+            SELECT shift_start_time, shift_end_time, shift_id FROM shift
+            WHERE shift_start_time <= ? AND shift_end_time IS NOT NULL
+            ORDER BY shift_start_time DESC LIMIT 1
+        ''', (date,)).fetchone()
+        if row is None or date >= row[1]:
+            row = self._create(timestamps.parse(date))
+        self._last = row
+        return row[2]
+
+    def _create(self, moment: datetime.datetime) -> Tuple[str, str, int]:
+        start = moment.replace(hour=0 if moment.hour < 12 else 12, minute=0, second=0)
+        start_time = timestamps.stamp(start)
+        end_time = timestamps.stamp(start + datetime.timedelta(hours=12))
+        cursor = self.conn.execute('''
+            INSERT INTO shift(user_id, shift_date, shift_type, shift_start_time, shift_end_time)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (self.user_id, start.strftime(timestamps.DATE_FORMAT), start.strftime("%p"), start_time, end_time))
+        self.created += 1
+        return start_time, end_time, int(cursor.lastrowid or 0)
+
+    # Forgets the cached shift after a rollback
+    def reset(self) -> None:
+        self._last = None
+
+# Turns the cells of one row into an InsertRow, or raises InvalidRow
+class RowParser:
+    def __init__(self, conn: sqlite3.Connection, columns: Dict[str, int], shifts: ImportShifts):
+        self.indexes = [columns.get(field_name) for field_name in COLUMNS]
+        self.shifts = shifts
+        self.pumps: Dict[str, Tuple[int, int]] = {}      # label or id -> pump_id, fuel_type_id
+        for pump_id, fuel_type_id, label in conn.execute('SELECT pump_id, fuel_type_id, pump_label FROM pump'):
+            self.pumps[str(pump_id)] = self.pumps[label.strip().lower()] = (pump_id, fuel_type_id)
+        self.fuel_names = dict(conn.execute('SELECT fuel_type_id, fuel_name FROM fuel_type'))
+        self.fuels = {name.strip().lower(): fuel_id for fuel_id, name in self.fuel_names.items()}
+        self.fuels.update({str(fuel_id): fuel_id for fuel_id in self.fuel_names})
+        self.shift_ids = {shift_id for (shift_id,) in conn.execute('SELECT shift_id FROM shift')} \
+            if "shift" in columns else None
+        self.prices = PriceHistory(conn) if "price" not in columns else None
+        self.archived = {str(partition.year) for partition in archive.partitions(conn)}
+
+    # Stripped value of every field in COLUMNS order, None for absent ones
+    def fields(self, cells: Sequence[Any]) -> List[Any]:
+        width = len(cells)
+        values = []
+        for index in self.indexes:
+            value = cells[index] if index is not None and index < width else None
+            values.append(value.strip() if isinstance(value, str) else value)
+        return values
+
+    def parse(self, line: int, cells: Sequence[Any]) -> InsertRow:
+        pump, fuel, volume, price, date, shift = self.fields(cells)
+        key = str(int(pump)) if isinstance(pump, float) and pump.is_integer() else str(pump or "").lower()
+        if key not in self.pumps:
+            raise InvalidRow(line, f"unknown pump {pump!r}")
+        pump_id, fuel_type_id = self.pumps[key]
+
+        if fuel not in (None, ""):
+            fuel_key = str(int(fuel)) if isinstance(fuel, float) and fuel.is_integer() else str(fuel).lower()
+            if fuel_key not in self.fuels:
+                raise InvalidRow(line, f"unknown fuel type {fuel!r}")
+            if self.fuels[fuel_key] != fuel_type_id:
+                raise InvalidRow(line, f"pump {pump!r} dispenses {self.fuel_names[fuel_type_id]}, not {fuel!r}")
+
+        volume = self.number(line, volume, "volume")
+        if volume <= 0:
+            raise InvalidRow(line, f"volume must be positive, got {volume}")
+        date = self.timestamp(line, date)
+        if date[:4] in self.archived:
+            raise InvalidRow(line, f"{date[:4]} is archived, restore it before importing sales into it")
+
+        if self.prices is None:
+            price = self.number(line, price, "price")
+            if price < 0:
+                raise InvalidRow(line, f"price must not be negative, got {price}")
+        else:
+            fuel_name = self.fuel_names[fuel_type_id]
+            per_liter = self.prices.price_per_liter(fuel_name, volume, date)
+            if per_liter is None:
+                raise InvalidRow(line, f"no {fuel_name} price was set on {date}, add a price column")
+            price = volume * per_liter
+
+        if self.shift_ids is not None:
+            try:
+                shift_id = int(shift)
+            except (TypeError, ValueError):
+                raise InvalidRow(line, f"bad shift id {shift!r}") from None
+            if shift_id not in self.shift_ids:
+                raise InvalidRow(line, f"unknown shift {shift_id}")
+        else:
+            shift_id = self.shifts.shift_for(date)
+        return shift_id, pump_id, volume, price, date
+
+    @staticmethod
+    def number(line: int, value: Any, field_name: str) -> float:
+        try:
+            return float(value.replace(",", "") if isinstance(value, str) else value)
+        except (TypeError, ValueError):
+            raise InvalidRow(line, f"bad {field_name} {value!r}") from None
+
+    # The value as a stored timestamp; text already in that form is only checked
+    @staticmethod
+    def timestamp(line: int, value: Any) -> str:
+        if isinstance(value, datetime.datetime):
+            return timestamps.stamp(value)
+        if isinstance(value, datetime.date):
+            return timestamps.day_start(value)
+        if isinstance(value, str) and value:
+            try:
+                moment = datetime.datetime.fromisoformat(value)
+                return value if len(value) == 19 and value[10] == " " else timestamps.stamp(moment)
+            except ValueError:
+                pass
+            for date_format in DATE_FORMATS:
+                try:
+                    return timestamps.stamp(datetime.datetime.strptime(value, date_format))
+                except ValueError:
+                    pass
+        raise InvalidRow(line, f"bad date {value!r}")
+
+# Imports the sales of a CSV or XLSX file. Stops at the first invalid row
+# unless skip_invalid; rows before it stay imported and a later run
+# continues from there. A file that was fully imported is refused unless
+# again is set (then it is imported once more, from the top).
+def import_sales(conn: sqlite3.Connection, path: str, *, sheet: str | None = None, user_id: int = 1,
+                 chunk_size: int = CHUNK_SIZE, skip_invalid: bool = False, again: bool = False,
+                 progress: Progress | None = None) -> ImportResult:
+    source = fingerprint(path)
+    result = ImportResult(path)
+    state = conn.execute('''
+        SELECT rows_done, imported, skipped, size, started, finished FROM import_progress WHERE source = ?
+    ''', (source,)).fetchone()
+    started = timestamps.stamp()
+    sales_file = SalesFile(path, sheet)
+    if state is not None and not again:
+        rows_done, imported, skipped, size, started, finished = state
+        if finished and size == sales_file.size:
+            sales_file.close()
+            raise ValueError(f"{path} was already imported on {finished}")
+        # Interrupted, or rows were appended since it finished
+        result.rows = result.resumed_from = rows_done
+        result.imported, result.skipped = imported, skipped
+    try:
+        columns = column_map(sales_file.header)
+        missing = [field_name for field_name in REQUIRED if field_name not in columns]
+        if missing:
+            raise ValueError(f"{path} has no {', '.join(missing)} column")
+        shifts = ImportShifts(conn, user_id)
+        parser = RowParser(conn, columns, shifts)
+        rows = itertools.islice(sales_file.rows(), result.rows, None)
+        while True:
+            chunk: List[InsertRow] = []
+            read = skipped = 0
+            invalid: InvalidRow | None = None
+            finished = None
+            try:
+                for line, cells in itertools.islice(rows, chunk_size):
+                    if all(cell in (None, "") for cell in cells):
+                        read += 1
+                        continue
+                    try:
+                        chunk.append(parser.parse(line, cells))
+                    except InvalidRow as error:
+                        if not skip_invalid:
+                            invalid = error   # commit the rows before it, then stop
+                            break
+                        skipped += 1
+                        if len(result.errors) < MAX_ERRORS:
+                            result.errors.append(str(error))
+                    read += 1
+                else:
+                    if read < chunk_size:
+                        finished = timestamps.stamp()
+                with conn:
+                    cursor = conn.cursor()
+                    if not conn.in_transaction:
+                        cursor.execute("BEGIN")
+                    with rollups.bulk_insert(cursor):
+                        cursor.executemany('''
+                            INSERT INTO transactions(shift_id, pump_id, Volume, Price, Date)
+                            VALUES(?,?,?,?,?)
+                        ''', chunk)
+                    cursor.execute('''
+                        INSERT INTO import_progress(source, path, size, rows_done, imported, skipped, started, finished)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(source) DO UPDATE SET
+                            path = excluded.path, size = excluded.size, rows_done = excluded.rows_done,
+                            imported = excluded.imported, skipped = excluded.skipped,
+                            started = excluded.started, finished = excluded.finished
+                    ''', (source, os.path.abspath(path), sales_file.size, result.rows + read,
+                          result.imported + len(chunk), result.skipped + skipped, started, finished))
+            except BaseException:
+                conn.rollback()   # also drops the import shifts of the chunk
+                shifts.reset()
+                shifts.created = result.shifts_created
+                raise
+            result.rows += read
+            result.imported += len(chunk)
+            result.skipped += skipped
+            result.shifts_created = shifts.created
+            if progress is not None:
+                progress(result, sales_file.fraction())
+            if invalid is not None:
+                raise invalid
+            if finished:
+                result.finished = True
+                return result
+    finally:
+        sales_file.close()
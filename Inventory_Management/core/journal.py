@@ -0,0 +1,300 @@
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from . import db, timestamps
+from .transactions import Sale
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# Write-behind recording of sales.
+#
+# append() writes the sales of one submit as a line of JSON to the journal file
+# (flushed, and fsync'd unless disabled) and returns. A writer thread commits
+# the queued entries to the transactions table in batches, together with the
+# number of the newest entry in journal_state, so each entry is written exactly
+# once. On start, entries the database has not seen yet (after a crash) are
+# replayed. The file is emptied whenever everything in it is committed.
+#
+# Every program on a database (copies of the app, a station server) writes its
+# own journal: it takes the first free slot, a journal file it holds an
+# exclusive lock on until it closes or dies, with its own journal_state row.
+# Slots nobody holds are replayed on start, so a crashed program's sales reach
+# the database even if it does not run again.
+
+# Programs that can record sales into one database at the same time
+MAX_SLOTS = 32
+
+# Tries at committing a batch while the database stays locked or busy (each one
+# already waits out busy_timeout); the pause between them doubles up to 8 s
+COMMIT_ATTEMPTS = 8
+FIRST_RETRY_DELAY = 0.25
+MAX_RETRY_DELAY = 8.0
+
+# The writer gave up on the database: sales appended so far stay in the journal
+# file and are written on the next start, new ones are refused
+class JournalError(RuntimeError):
+    pass
+
+# Journal file of a slot next to the database: Databases/inventory_db.journal
+# for the first program, Databases/inventory_db.2.journal for a second, ...
+def default_journal_path(db_path: str | None = None, slot: int = 1) -> str:
+    base = os.path.splitext(db_path or db.DB_PATH)[0]
+    return base + ".journal" if slot == 1 else f"{base}.{slot}.journal"
+
+# Opens (or creates) a journal file locked for this program; None if another
+# program holds it. The lock goes away with the file, also when the program dies.
+def _open_locked(path: str):
+    journal = open(path, "a+", encoding="utf-8")
+    try:
+        if sys.platform == "win32":
+            journal.seek(0)
+            msvcrt.locking(journal.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        journal.close()
+        return None
+    return journal
+
+class SalesJournal:
+    # A path given here is used as is, with journal_state row slot (1 unless
+    # given); otherwise open() takes the first free slot next to the database
+    def __init__(self, path: str | None = None, batch_size: int = 500,
+                 max_delay: float = 0.05, fsync: bool = True, slot: int | None = None):
+        self._fixed_path = path
+        self._fixed_slot = slot
+        self.path = path
+        self.slot = slot or 1
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._synced = 0
+        self._queue: "queue.Queue[Dict[str, Any] | None]" = queue.Queue()
+        self._file = None
+        self._thread: threading.Thread | None = None
+        self._last_appended = 0
+        self._last_committed = 0
+        self._committed_batches = 0
+        self._idle = threading.Condition(self._lock)
+        self.failure: str | None = None
+
+    # Takes a slot, replays entries left by a crash (in it and in slots nobody
+    # holds), then starts the writer thread. Returns the number of entries replayed.
+    def open(self) -> int:
+        if self._thread is not None:
+            return 0
+        conn = db.get_connection()
+        self.failure = None
+        self._file = self._claim()
+        replayed = self._replay(conn, self._file, self.slot)
+        self._last_appended = self._last_committed = self._committed_seq(conn, self.slot)
+        if self._fixed_path is None:
+            for slot in range(1, MAX_SLOTS + 1):
+                path = default_journal_path(slot=slot)
+                if slot == self.slot or not os.path.exists(path) or not os.path.getsize(path):
+                    continue
+                orphan = _open_locked(path)
+                if orphan is not None:
+                    with orphan:
+                        replayed += self._replay(conn, orphan, slot)
+        self._thread = threading.Thread(target=self._run, name="sales-journal", daemon=True)
+        self._thread.start()
+        return replayed
+
+    # Makes the sales durable in the journal and queues them for the database.
+    # Appends from several threads (the station server's terminals) share
+    # fsyncs: one call syncs everything written before it started. Entries are
+    # queued in seq order, which the high-water mark in journal_state relies on.
+    def append(self, shift_id: int, sales: Sequence[Sale], date: str) -> int:
+        if self._file is None:
+            raise RuntimeError("SalesJournal.open() has not been called")
+        with self._lock:
+            if self.failure is not None:
+                raise JournalError(self.failure)
+            self._last_appended += 1
+            entry = {"seq": self._last_appended, "shift_id": shift_id,
+                     "sales": [list(sale) for sale in sales], "date": date}
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            self._queue.put(entry)
+        if self.fsync:
+            with self._sync_lock:
+                if self._synced < entry["seq"]:
+                    with self._lock:
+                        written = self._last_appended
+                        fileno = self._file.fileno()
+                    os.fsync(fileno)
+                    self._synced = written
+        return entry["seq"]
+
+    # Number of batches committed since the last call (for the UI to refresh pages)
+    def poll(self) -> int:
+        with self._lock:
+            batches, self._committed_batches = self._committed_batches, 0
+        return batches
+
+    # Waits until everything appended so far is in the database; raises
+    # JournalError if the writer gave up
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._idle:
+            done = self._idle.wait_for(
+                lambda: self._last_committed >= self._last_appended or self.failure is not None, timeout)
+            if self.failure is not None:
+                raise JournalError(self.failure)
+            return done
+
+    # Commits what is queued, stops the writer and closes the file
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path = self._fixed_path
+        self.slot = self._fixed_slot or 1
+
+    # The locked journal file of the slot to write to
+    def _claim(self):
+        if self._fixed_path is not None:
+            journal = _open_locked(self._fixed_path)
+            if journal is None:
+                raise RuntimeError(f"The sales journal {self._fixed_path} is in use by another program")
+            return journal
+        for slot in range(1, MAX_SLOTS + 1):
+            path = default_journal_path(slot=slot)
+            journal = _open_locked(path)
+            if journal is not None:
+                self.path, self.slot = path, slot
+                return journal
+        raise RuntimeError(f"{MAX_SLOTS} programs are already recording sales into this database")
+
+    # Commits the entries of a locked journal file the database has not seen, then empties it
+    def _replay(self, conn: sqlite3.Connection, journal, slot: int) -> int:
+        journal.seek(0)
+        entries: List[Dict[str, Any]] = []
+        for line in journal:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break  # torn last line of a crash, never acknowledged
+        committed = self._committed_seq(conn, slot)
+        pending = [entry for entry in entries if entry["seq"] > committed]
+        if pending:
+            self._commit(conn, pending, slot)
+        journal.seek(0)
+        journal.truncate()
+        return len(pending)
+
+    @staticmethod
+    def _committed_seq(conn: sqlite3.Connection, slot: int) -> int:
+        row = conn.execute('SELECT last_seq FROM journal_state WHERE id = ?', (slot,)).fetchone()
+        return row[0] if row else 0
+
+    # Writes entries and the new high-water mark of the slot in one transaction.
+    # Entries at or below the mark are in the database already and are left out.
+    # An entry the database rejects is moved to journal_rejects, so it cannot
+    # block the rest and is not lost (see `manage.py rejected-sales`).
+    def _commit(self, conn: sqlite3.Connection, entries: List[Dict[str, Any]], slot: int) -> None:
+        committed = self._committed_seq(conn, slot)
+        entries = [entry for entry in entries if entry["seq"] > committed]
+        if not entries:
+            return
+        rows = [(entry["shift_id"], pump_id, volume, price, entry["date"])
+                for entry in entries for pump_id, volume, price in entry["sales"]]
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO transactions(shift_id, pump_id, Volume, Price, Date)
+                    VALUES(?,?,?,?,?)
+                ''', rows)
+                conn.execute('INSERT OR REPLACE INTO journal_state(id, last_seq) VALUES (?, ?)',
+                             (slot, entries[-1]["seq"]))
+        except sqlite3.IntegrityError as error:
+            if len(entries) == 1:
+                print(f"Sales journal: entry {entries[0]['seq']} rejected ({error}), "
+                      "see manage.py rejected-sales", file=sys.stderr)
+                with conn:
+                    conn.execute('''
+                        INSERT INTO journal_rejects(slot, seq, entry, error, rejected)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (slot, entries[0]["seq"], json.dumps(entries[0]), str(error), timestamps.stamp()))
+                    conn.execute('INSERT OR REPLACE INTO journal_state(id, last_seq) VALUES (?, ?)',
+                                 (slot, entries[0]["seq"]))
+            else:
+                for entry in entries:
+                    self._commit(conn, [entry], slot)
+
+    def _run(self) -> None:
+        conn = db.get_connection()
+        conn.execute("PRAGMA synchronous = FULL")  # the journal is emptied after a commit
+        stopping = False
+        try:
+            while not stopping:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+                batch = [entry]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.batch_size:
+                    try:
+                        entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if entry is None:
+                        stopping = True
+                        break
+                    batch.append(entry)
+                if not self._write_batch(conn, batch):
+                    break
+        finally:
+            db.close_connection()
+
+    # Commits a batch, retrying while the database is busy; False when it gave
+    # up, which stops the writer and leaves the batch in the file
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]) -> bool:
+        delay = FIRST_RETRY_DELAY
+        for attempt in range(1, COMMIT_ATTEMPTS + 1):
+            try:
+                self._commit(conn, batch, self.slot)
+                break
+            except sqlite3.OperationalError as error:  # e.g. database is locked, disk full
+                if attempt == COMMIT_ATTEMPTS:
+                    print(f"Sales journal: giving up after {attempt} tries ({error})", file=sys.stderr)
+                    with self._idle:
+                        self.failure = (f"Sales cannot be written to the database ({error}); they are kept "
+                                        f"in {self.path} and written when the program starts again")
+                        self._idle.notify_all()
+                    return False
+                print(f"Sales journal: try {attempt} failed ({error}), retrying in {delay:g}s", file=sys.stderr)
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+        with self._idle:
+            self._last_committed = batch[-1]["seq"]
+            self._committed_batches += 1
+            if self._last_committed >= self._last_appended and self._file is not None:
+                self._file.seek(0)
+                self._file.truncate()
+            self._idle.notify_all()
+        return True
+
+# (reject_id, rejected, entry, error) of the entries the database refused, oldest first
+def rejected_entries(conn: sqlite3.Connection) -> List[Tuple[int, str, Dict[str, Any], str]]:
+    return [(reject_id, rejected, json.loads(entry), error) for reject_id, rejected, entry, error in conn.execute(
+        'SELECT reject_id, rejected, entry, error FROM journal_rejects ORDER BY reject_id')]
+
+# Shared by every page of the running program
+sales_journal = SalesJournal()
@@ -0,0 +1,296 @@
+import datetime
+import sqlite3
+from typing import Callable, List
+
+from . import rollups, timestamps
+
+# Schema changes, applied in order. The database remembers how many have run
+# in PRAGMA user_version, so a current database skips all of them at startup.
+# Never edit a released step; append a new one instead.
+
+# 1 - the original tables (CREATE IF NOT EXISTS so older databases upgrade in place)
+def _base_tables(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS shift (
+            shift_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            shift_date DATETIME,
+            shift_type TEXT,
+            shift_start_time DATETIME,
+            shift_end_time DATETIME,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fuel_type (
+            fuel_type_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fuel_name TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pump (
+            pump_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fuel_type_id INTEGER NOT NULL,
+            pump_label TEXT NOT NULL,
+            FOREIGN KEY (fuel_type_id) REFERENCES fuel_type(fuel_type_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shift_id INTEGER NOT NULL,
+            pump_id INTEGER NOT NULL,
+            Volume REAL NOT NULL,
+            Price REAL NOT NULL,
+            Date DATETIME,
+            FOREIGN KEY (shift_id) REFERENCES shift(shift_id),
+            FOREIGN KEY (pump_id) REFERENCES pump(pump_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS price(
+        price_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fuel_type_id INTEGER NOT NULL,
+        Name Text Not NULL,
+        price REAL NOT NULL,
+        effective_date DATETIME,
+        FOREIGN KEY (fuel_type_id) REFERENCES fuel_type(fuel_type_id)
+        )
+    ''')
+
+# 2 - covering indexes for the queries the pages run
+def _report_indexes(cursor: sqlite3.Cursor) -> None:
+    # Inventory reports: totals by date, per pump
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_date
+        ON transactions(Date, pump_id, Price, Volume)
+    ''')
+    # Inventory reports: totals of one pump
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_pump
+        ON transactions(pump_id, Date, Price, Volume)
+    ''')
+    # Latest price of a fuel: WHERE fuel_type_id = ? AND Name = ? ORDER BY price_id DESC
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_price_fuel_name
+        ON price(fuel_type_id, Name, price_id, price)
+    ''')
+    # Open shift of a user: WHERE user_id = ? AND shift_end_time IS NULL
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_shift_open
+        ON shift(user_id, shift_id) WHERE shift_end_time IS NULL
+    ''')
+
+# 3 - per-pump sales rollups for the Inventory page, filled from existing history.
+# The table, trigger and backfill as released (core/rollups.py has moved on since,
+# through later steps): day, week, month and year buckets plus a lifetime row.
+_ROLLUP_PERIODS_V3 = (("day", "%Y-%m-%d"), ("week", "%Y-%W"), ("month", "%Y-%m"), ("year", "%Y"))
+
+def _sales_rollups(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_rollup (
+            period TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            pump_id INTEGER NOT NULL,
+            income REAL NOT NULL DEFAULT 0,
+            volume REAL NOT NULL DEFAULT 0,
+            sales INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, bucket, pump_id)
+        ) WITHOUT ROWID
+    ''')
+    rows = ",\n".join(
+        f"('{period}', strftime('{fmt}', new.Date), new.pump_id, new.Price, new.Volume, 1)"
+        for period, fmt in _ROLLUP_PERIODS_V3
+    )
+    cursor.execute('DROP TRIGGER IF EXISTS trg_transactions_rollup')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_transactions_rollup AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+            VALUES {rows},
+            ('lifetime', 'all', new.pump_id, new.Price, new.Volume, 1)
+            ON CONFLICT(period, bucket, pump_id) DO UPDATE SET
+                income = income + excluded.income,
+                volume = volume + excluded.volume,
+                sales = sales + excluded.sales;
+        END
+    ''')
+
+    cursor.execute('DELETE FROM sales_rollup')
+    for period, fmt in _ROLLUP_PERIODS_V3:
+        cursor.execute(f'''
+            INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+            SELECT '{period}', strftime('{fmt}', Date) AS bucket, pump_id,
+                   SUM(Price), SUM(Volume), COUNT(*)
+            FROM transactions
+            GROUP BY bucket, pump_id
+        ''')
+    cursor.execute('''
+        INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+        SELECT 'lifetime', 'all', pump_id, SUM(Price), SUM(Volume), COUNT(*)
+        FROM transactions
+        GROUP BY pump_id
+    ''')
+
+# 4 - newest sales journal entry already written to transactions (see core/journal.py)
+def _journal_state(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS journal_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_seq INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO journal_state(id, last_seq) VALUES (1, 0)')
+
+# 5 - every date and time as a sortable ISO-8601 timestamp (see core/timestamps.py),
+# with indexes for range queries on shift and price history. Sales recorded
+# before this version only have a date; they get 00:00:00.
+def _iso_timestamps(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        UPDATE transactions SET Date = Date || ' 00:00:00'
+        WHERE length(Date) = 10
+    ''')
+
+    shifts = []
+    for shift_id, shift_date, start, end in cursor.execute(
+            'SELECT shift_id, shift_date, shift_start_time, shift_end_time FROM shift').fetchall():
+        try:
+            started = timestamps.from_legacy_shift_time(shift_date, start)
+            ended = timestamps.from_legacy_shift_time(shift_date, end, started) if end else None
+        except (TypeError, ValueError):
+            continue  # already converted or not a legacy value
+        shifts.append((timestamps.stamp(started), ended and timestamps.stamp(ended), shift_id))
+    cursor.executemany('UPDATE shift SET shift_start_time = ?, shift_end_time = ? WHERE shift_id = ?', shifts)
+
+    prices = []
+    for price_id, effective_date in cursor.execute('SELECT price_id, effective_date FROM price').fetchall():
+        try:
+            day = datetime.datetime.strptime(effective_date, timestamps.LEGACY_PRICE_DATE_FORMAT).date()
+        except (TypeError, ValueError):
+            continue
+        prices.append((timestamps.day_start(day), price_id))
+    cursor.executemany('UPDATE price SET effective_date = ? WHERE price_id = ?', prices)
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_shift_start ON shift(shift_start_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_effective ON price(effective_date)')
+
+# 6 - shift_id in the date index, so reports by shift or user over a date
+# range (core/reporting.py time_series) stay a covering range scan
+def _date_index_shift(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('DROP INDEX IF EXISTS idx_transactions_date')
+    cursor.execute('''
+        CREATE INDEX idx_transactions_date
+        ON transactions(Date, pump_id, Price, Volume, shift_id)
+    ''')
+
+# 7 - how far each imported sales file got, keyed by a hash of its first
+# bytes (see core/importer.py)
+def _import_progress(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_progress (
+            source TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            rows_done INTEGER NOT NULL,
+            imported INTEGER NOT NULL,
+            skipped INTEGER NOT NULL,
+            started DATETIME NOT NULL,
+            finished DATETIME
+        )
+    ''')
+
+# 8 - registry of the years moved out to archive files (see core/archive.py)
+def _archive_partitions(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_partitions (
+            year INTEGER PRIMARY KEY,
+            path TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            first_id INTEGER NOT NULL,
+            last_id INTEGER NOT NULL,
+            income REAL NOT NULL,
+            volume REAL NOT NULL,
+            compressed INTEGER NOT NULL DEFAULT 0,
+            archived DATETIME NOT NULL
+        )
+    ''')
+
+# 9 - one journal_state row per journal slot: every program on the database
+# writes its own journal file (see core/journal.py); id 1 keeps its high-water mark
+def _journal_slots(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE journal_state_new (
+            id INTEGER PRIMARY KEY CHECK (id >= 1),
+            last_seq INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT INTO journal_state_new(id, last_seq) SELECT id, last_seq FROM journal_state')
+    cursor.execute('DROP TABLE journal_state')
+    cursor.execute('ALTER TABLE journal_state_new RENAME TO journal_state')
+
+# 10 - no more week rollups: reports sum weeks from the day rows, so the
+# trigger stops writing them
+def _drop_week_rollup(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("DELETE FROM sales_rollup WHERE period = 'week'")
+    rollups.create_trigger(cursor)
+
+# 11 - journal entries the database refused (see core/journal.py), kept for
+# `manage.py rejected-sales` instead of being dropped
+def _journal_rejects(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS journal_rejects (
+            reject_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slot INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            entry TEXT NOT NULL,
+            error TEXT NOT NULL,
+            rejected DATETIME NOT NULL
+        )
+    ''')
+
+MIGRATIONS: List[Callable[[sqlite3.Cursor], None]] = [
+    _base_tables,
+    _report_indexes,
+    _sales_rollups,
+    _journal_state,
+    _iso_timestamps,
+    _date_index_shift,
+    _import_progress,
+    _archive_partitions,
+    _journal_slots,
+    _drop_week_rollup,
+    _journal_rejects,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def needs_upgrade(conn: sqlite3.Connection) -> bool:
+    return current_version(conn) < SCHEMA_VERSION
+
+# Applies every pending step on the caller's cursor and returns the new version.
+# The caller owns the transaction, so a failed upgrade leaves the database untouched.
+def migrate(cursor: sqlite3.Cursor) -> int:
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this program ({SCHEMA_VERSION})"
+        )
+    for number, step in enumerate(MIGRATIONS[version:], start=version + 1):
+        step(cursor)
+        cursor.execute(f"PRAGMA user_version = {number}")
+    return SCHEMA_VERSION
@@ -0,0 +1,78 @@
+import sqlite3
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from . import timestamps
+from .db import get_connection
+
+# Volume (liters) from which the per-100-liter price rows (Diesel100, ...) apply
+BULK_VOLUME = 100
+
+# Latest price of every price Name, kept in memory so computing a sale price
+# while the cashier types never touches the database
+class PriceResolver:
+    def __init__(self):
+        self._prices: Dict[str, float] | None = None
+        # Asked instead of the database when no connection is given (set on
+        # terminals of a station server, see core/client.py)
+        self.loader: Callable[[], Dict[str, float]] | None = None
+
+    # Reads the newest row of each price Name in one query
+    def load(self, conn: sqlite3.Connection | None = None) -> Dict[str, float]:
+        if conn is None and self.loader is not None:
+            self._prices = dict(self.loader())
+            return self._prices
+        conn = conn or get_connection()
+        rows = conn.execute('''
+            SELECT Name, price FROM price
+            WHERE price_id IN (SELECT MAX(price_id) FROM price GROUP BY Name)
+        ''').fetchall()
+        self._prices = {name: price for name, price in rows}
+        return self._prices
+
+    # Drops the cached prices; the next lookup reloads them
+    def invalidate(self) -> None:
+        self._prices = None
+
+    # Records a price that was just committed without going back to disk
+    def update(self, name: str, price: float) -> None:
+        if self._prices is not None:
+            self._prices[name] = price
+
+    def current_prices(self) -> Dict[str, float]:
+        if self._prices is None:
+            return dict(self.load())
+        return dict(self._prices)
+
+    # Price per liter of a fuel for the given volume (bulk price from BULK_VOLUME up)
+    def price_per_liter(self, fuel_name: str, volume: float) -> float:
+        prices = self._prices if self._prices is not None else self.load()
+        name = fuel_name if volume < BULK_VOLUME else f"{fuel_name}100"
+        return prices[name]
+
+    # Total price of a sale
+    def sale_price(self, fuel_name: str, volume: float) -> float:
+        return volume * self.price_per_liter(fuel_name, volume)
+
+# Shared by every page of the running program
+price_resolver = PriceResolver()
+
+# Commits a new price row and makes it the current price of that Name
+def add_price(conn: sqlite3.Connection, fuel_type_id: int, name: str, price: float,
+              date: str | None = None) -> None:
+    date = date or timestamps.stamp()
+    with conn:
+        conn.execute('''
+            INSERT INTO price(fuel_type_id, Name, price, effective_date)
+            VALUES (?,?,?,?)
+        ''', (fuel_type_id, name, price, date))
+    price_resolver.update(name, price)
+
+# (Name, price, effective_date) of every price row of the given Names,
+# grouped by Name with the newest row first
+def price_history(conn: sqlite3.Connection, names: Sequence[str]) -> List[Tuple[str, float, str]]:
+    placeholders = ", ".join("?" * len(names))
+    return conn.execute(f'''
+        SELECT Name, price, effective_date FROM price
+        WHERE Name IN ({placeholders})
+        ORDER BY Name ASC, price_id DESC
+    ''', tuple(names)).fetchall()
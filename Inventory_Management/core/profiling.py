@@ -0,0 +1,200 @@
+import collections
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Deque, Iterator, List, Tuple
+
+# logging is imported by the first sample, core.db imports this module on every start
+if TYPE_CHECKING:
+    import logging
+
+# GAS_INVENTORY_PROFILE=1 (or Mainframe.py --profile) turns the profiler on
+ENV_FLAG = "GAS_INVENTORY_PROFILE"
+# Where the samples are logged, next to the database by default
+LOG_PATH = os.environ.get("GAS_INVENTORY_PROFILE_LOG", "Databases/profile.log")
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+# Samples kept in memory for the diagnostics page
+KEEP = 5000
+
+QUERY = "query"
+PAGE = "page"
+
+# Plain class rather than a dataclass, which takes milliseconds to import
+class Sample:
+    __slots__ = ("kind", "name", "ms", "rows", "thread", "at")
+
+    def __init__(self, kind: str, name: str, ms: float, rows: int, thread: str, at: float):
+        self.kind = kind        # QUERY or PAGE
+        self.name = name        # SQL text or page class name
+        self.ms = ms
+        self.rows = rows
+        self.thread = thread
+        self.at = at            # time.time() when it started
+
+# Records the wall time and row count of every database call and the build
+# time of every page, in memory and in a rotating log file
+class Profiler:
+    def __init__(self):
+        self.enabled = os.environ.get(ENV_FLAG, "") not in ("", "0")
+        self.samples: Deque[Sample] = collections.deque(maxlen=KEEP)
+        self.log_path = LOG_PATH
+        self._logger: "logging.Logger | None" = None
+        self._lock = threading.Lock()
+
+    def enable(self, log_path: str | None = None) -> None:
+        self.enabled = True
+        if log_path:
+            self.log_path = log_path
+
+    def logger(self) -> "logging.Logger":
+        with self._lock:
+            if self._logger is None:
+                import logging
+                import logging.handlers
+
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    self.log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                self._logger = logging.getLogger("gas_inventory.profile")
+                self._logger.setLevel(logging.INFO)
+                self._logger.propagate = False
+                self._logger.addHandler(handler)
+            return self._logger
+
+    def record(self, sample: Sample) -> None:
+        self.samples.append(sample)
+        name = " ".join(sample.name.split())
+        self.logger().info("%s %.3fms rows=%d thread=%s %s",
+                           sample.kind, sample.ms, sample.rows, sample.thread, name)
+
+    # Times the block as a PAGE sample (or any other kind)
+    @contextmanager
+    def timed(self, name: str, kind: str = PAGE) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        at, start = time.time(), time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(Sample(kind, name, (time.perf_counter() - start) * 1000, 0,
+                               threading.current_thread().name, at))
+
+    # The n slowest samples kept in memory, slowest first
+    def slowest(self, n: int = 20) -> List[Sample]:
+        return sorted(list(self.samples), key=lambda s: s.ms, reverse=True)[:n]
+
+    # (kind, name, count, p50, p95, p99, max) per statement or page, slowest p95 first
+    def summary(self) -> List[Tuple[str, str, int, float, float, float, float]]:
+        import statistics
+
+        groups: dict[Tuple[str, str], List[float]] = collections.defaultdict(list)
+        for sample in list(self.samples):
+            groups[(sample.kind, " ".join(sample.name.split()))].append(sample.ms)
+        rows = []
+        for (kind, name), times in groups.items():
+            times.sort()
+            rows.append((kind, name, len(times), statistics.median(times),
+                         percentile(times, 95), percentile(times, 99), times[-1]))
+        rows.sort(key=lambda row: row[4], reverse=True)
+        return rows
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+def percentile(sorted_times: List[float], p: float) -> float:
+    return sorted_times[min(len(sorted_times) - 1, int(len(sorted_times) * p / 100))]
+
+# One sample per execute: the statement's own time plus the time spent
+# fetching its rows. It is recorded once the rows are exhausted, the cursor
+# runs another statement or is garbage collected.
+class ProfilingCursor(sqlite3.Cursor):
+    _sample: Sample | None = None
+
+    def execute(self, sql: str, parameters=(), /):  # type: ignore[override]
+        self._finish()
+        start = time.perf_counter()
+        self._sample = Sample(QUERY, sql, 0.0, 0, threading.current_thread().name, time.time())
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._add(start, 0)
+
+    def executemany(self, sql: str, seq_of_parameters, /):  # type: ignore[override]
+        self._finish()
+        start = time.perf_counter()
+        self._sample = Sample(QUERY, sql, 0.0, 0, threading.current_thread().name, time.time())
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._add(start, 0)
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add(start, row is not None)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size: int | None = None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add(start, len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._finish()
+            raise
+        self._add(start, 1)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _add(self, start: float, rows: int) -> None:
+        if self._sample is not None:
+            self._sample.ms += (time.perf_counter() - start) * 1000
+            self._sample.rows += rows
+
+    def _finish(self) -> None:
+        sample, self._sample = self._sample, None
+        if sample is not None:
+            if sample.rows == 0 and self.rowcount > 0:
+                sample.rows = self.rowcount
+            profiler.record(sample)
+
+# Connection whose cursors are profiled. conn.execute() does not go through
+# cursor() in C, so the shortcuts are routed through a profiled cursor here.
+class ProfilingConnection(sqlite3.Connection):
+    def cursor(self, factory=ProfilingCursor):  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters=(), /):  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters, /):  # type: ignore[override]
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+# Shared by the app, core.db picks the connection class from it
+profiler = Profiler()
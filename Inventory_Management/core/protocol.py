@@ -0,0 +1,61 @@
+# Wire format between the terminals and the station server (core/server.py,
+# core/client.py). Every message is one line of UTF-8 JSON:
+#
+#   request   {"id": 7, "op": "record_sales", "args": {...}}
+#   reply     {"id": 7, "ok": true, "result": ...}
+#             {"id": 7, "ok": false, "error": "No shift is open", "kind": "value"}
+#   event     {"event": "transactions"}     pushed when another terminal changed data
+#
+# Replies carry the id of their request; events have none and may arrive
+# between a request and its reply.
+import datetime
+import json
+import os
+from typing import Any, Dict, Tuple
+
+PROTOCOL_VERSION = 2     # 2: end_shift takes the shift_id
+
+# Where terminals find the server unless --server / GAS_INVENTORY_SERVER say otherwise
+DEFAULT_ADDRESS = "127.0.0.1:8757"
+
+# Longest line accepted, a guard against a peer that never sends a newline
+MAX_LINE = 1 << 20
+
+# Error kinds: "value" (bad request or rejected by a rule), "auth" (not logged
+# in, not allowed), "server" (anything else, the server's log has details)
+ERROR_KINDS = ("value", "auth", "server")
+
+class RemoteError(Exception):
+    def __init__(self, message: str, kind: str = "server"):
+        super().__init__(message)
+        self.kind = kind
+
+# ("tcp", (host, port)) or ("unix", path) of "host:port", ":port", "unix:/path"
+# or a file system path
+def parse_address(address: str) -> Tuple[str, Any]:
+    if address.startswith("unix:"):
+        return "unix", address[5:]
+    if os.sep in address or address.endswith(".sock"):
+        return "unix", address
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Bad server address {address!r}, expected host:port or unix:/path")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":"), default=_default) + "\n").encode("utf-8")
+
+def decode(line: bytes) -> Dict[str, Any]:
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("A message must be a JSON object")
+    return message
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime.datetime) else value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+# JSON objects only have string keys; turns the ids of a decoded dict back into ints
+def int_keys(values: Dict[str, Any]) -> Dict[int, Any]:
+    return {int(key): value for key, value in values.items()}
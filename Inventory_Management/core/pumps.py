@@ -0,0 +1,106 @@
+# The station's fuel types and pumps as stored in the fuel_type and pump
+# tables. The dispenser grid, the sale prices, the price page, the station
+# server's checks and the reports are all built from a Forecourt, so a
+# station with 12 or 24 pumps needs rows in those tables and no code change.
+import sqlite3
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, cast
+
+from . import timestamps
+from .db import get_connection
+
+class Pump(NamedTuple):
+    pump_id: int
+    label: str
+    fuel_type_id: int
+    fuel_name: str
+
+# One snapshot of the tables; lookups by id, label and fuel are dicts
+class Forecourt:
+    def __init__(self, fuels: Dict[int, str], pumps: List[Pump]):
+        self.fuels = fuels          # fuel_type_id -> fuel_name, by fuel_type_id
+        self.pumps = pumps          # by pump_id
+        self.by_id = {pump.pump_id: pump for pump in pumps}
+        self.by_label = {pump.label: pump for pump in pumps}
+
+    # pump label -> pump_id
+    def pump_ids(self) -> Dict[str, int]:
+        return {pump.label: pump.pump_id for pump in self.pumps}
+
+    def pumps_of(self, fuel_type_id: int) -> List[Pump]:
+        return [pump for pump in self.pumps if pump.fuel_type_id == fuel_type_id]
+
+    # fuel_type_id of a fuel name, None if the station does not sell it
+    def fuel_id(self, fuel_name: str) -> int | None:
+        for fuel_type_id, name in self.fuels.items():
+            if name == fuel_name:
+                return fuel_type_id
+        return None
+
+    # JSON form sent by the station server
+    def to_json(self) -> Dict[str, Any]:
+        return {"fuels": [[fuel_type_id, name] for fuel_type_id, name in self.fuels.items()],
+                "pumps": [list(pump) for pump in self.pumps]}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Forecourt":
+        return cls({fuel_type_id: name for fuel_type_id, name in data["fuels"]},
+                   [Pump(*row) for row in data["pumps"]])
+
+# Reads the fuel types and pumps of the database behind conn
+def read(conn: sqlite3.Connection) -> Forecourt:
+    fuels = dict(conn.execute('SELECT fuel_type_id, fuel_name FROM fuel_type ORDER BY fuel_type_id'))
+    pumps = [Pump(pump_id, label, fuel_type_id, fuels[fuel_type_id])
+             for pump_id, label, fuel_type_id in conn.execute(
+                 'SELECT pump_id, pump_label, fuel_type_id FROM pump ORDER BY pump_id')]
+    return Forecourt(fuels, pumps)
+
+# Adds a pump; a fuel type the station does not sell yet is added with its
+# (per liter, per 100 liters) prices, which it then needs. Returns the pump_id.
+# Running programs see the pump after a restart.
+def add_pump(conn: sqlite3.Connection, label: str, fuel_name: str,
+             prices: Tuple[float, float] | None = None) -> int:
+    forecourt = read(conn)
+    if label in forecourt.by_label:
+        raise ValueError(f"There is already a pump {label!r}")
+    fuel_type_id = forecourt.fuel_id(fuel_name)
+    if fuel_type_id is None and prices is None:
+        raise ValueError(f"{fuel_name!r} is a new fuel type, its prices are needed")
+    with conn:
+        if fuel_type_id is None:
+            fuel_type_id = cast(int, conn.execute('INSERT INTO fuel_type (fuel_name) VALUES (?)',
+                                                  (fuel_name,)).lastrowid)
+            date = timestamps.stamp()
+            conn.executemany('INSERT INTO price(fuel_type_id, Name, price, effective_date) VALUES (?,?,?,?)',
+                             [(fuel_type_id, fuel_name, prices[0], date),
+                              (fuel_type_id, f"{fuel_name}100", prices[1], date)])
+        cursor = conn.execute('INSERT INTO pump (fuel_type_id, pump_label) VALUES (?, ?)',
+                              (fuel_type_id, label))
+    return cast(int, cursor.lastrowid)
+
+# The Forecourt of the running program, read once: pumps are added with
+# `manage.py pumps --add`, which takes a restart (like the schema)
+class PumpRegistry:
+    def __init__(self):
+        self._forecourt: Forecourt | None = None
+        # Asked instead of the database when no connection is given (set on
+        # terminals of a station server, see core/client.py)
+        self.loader: Callable[[], Forecourt] | None = None
+
+    # Reads the tables again
+    def load(self, conn: sqlite3.Connection | None = None) -> Forecourt:
+        if conn is None and self.loader is not None:
+            self._forecourt = self.loader()
+        else:
+            self._forecourt = read(conn or get_connection())
+        return self._forecourt
+
+    def invalidate(self) -> None:
+        self._forecourt = None
+
+    def forecourt(self, conn: sqlite3.Connection | None = None) -> Forecourt:
+        if self._forecourt is None:
+            return self.load(conn)
+        return self._forecourt
+
+# Shared by every page of the running program and the station server
+pump_registry = PumpRegistry()
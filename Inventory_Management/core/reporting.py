@@ -0,0 +1,296 @@
+import datetime
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from . import archive, pumps, rollups, timestamps
+
+# Periods shown on the Inventory page
+PERIODS = ("day", "week", "month", "year", "lifetime")
+
+# Figures of one fuel type; income is keyed by period, volumes by pump_id
+@dataclass
+class FuelReport:
+    fuel_type_id: int
+    fuel_name: str
+    pump_ids: List[int] = field(default_factory=list)
+    income: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PERIODS, 0.0))
+    lifetime_volume: Dict[int, float] = field(default_factory=dict)
+    daily_volume: Dict[int, float] = field(default_factory=dict)
+
+# Everything the Inventory page shows, for every fuel type and pump. periods
+# holds the label of the calendar period each figure covers ("2025-W29", ...)
+@dataclass
+class InventoryReport:
+    periods: Dict[str, str] = field(default_factory=dict)
+    fuels: List[FuelReport] = field(default_factory=list)
+
+# Income of the current day, ISO week, month and year plus lifetime totals,
+# for the calendar periods that contain today (zero when nothing was sold yet),
+# for every fuel type and pump of forecourt (read from conn when not given)
+def inventory_report(conn: sqlite3.Connection, today: datetime.date | None = None,
+                     forecourt: pumps.Forecourt | None = None) -> InventoryReport:
+    today = today or datetime.date.today()
+    report = InventoryReport()
+    if forecourt is None:
+        forecourt = pumps.read(conn)
+    fuel_of_pump: Dict[int, FuelReport] = {}
+    for fuel_type_id, fuel_name in forecourt.fuels.items():
+        fuel = FuelReport(fuel_type_id, fuel_name)
+        report.fuels.append(fuel)
+        for pump in forecourt.pumps_of(fuel_type_id):
+            fuel.pump_ids.append(pump.pump_id)
+            fuel.lifetime_volume[pump.pump_id] = 0.0
+            fuel.daily_volume[pump.pump_id] = 0.0
+            fuel_of_pump[pump.pump_id] = fuel
+
+    for period in PERIODS[:-1]:
+        start = floor(period, datetime.datetime.combine(today, datetime.time()))
+        series = time_series(conn, start, step(period, start), period, "pump", forecourt)
+        report.periods[period] = series.labels[0]
+        for pump_id, income in series.income.items():
+            fuel = fuel_of_pump.get(pump_id)
+            if fuel is None:
+                continue
+            fuel.income[period] += income[0]
+            if period == "day":
+                fuel.daily_volume[pump_id] = series.volume[pump_id][0]
+
+    report.periods["lifetime"] = rollups.LIFETIME_BUCKET
+    for pump_id, income, volume in conn.execute('''
+        SELECT pump_id, income, volume FROM sales_rollup WHERE period = 'lifetime'
+    '''):
+        fuel = fuel_of_pump.get(pump_id)
+        if fuel is not None:
+            fuel.income["lifetime"] += income
+            fuel.lifetime_volume[pump_id] = volume
+    return report
+
+GRANULARITIES = ("hour", "day", "week", "month", "year")
+GROUPINGS = ("pump", "fuel", "shift", "user")
+METRICS = ("income", "volume", "sales")
+
+# Length of the Date prefix ("YYYY-MM-DD HH") a bucket is grouped on in SQL.
+# Weeks are grouped by day and folded into ISO weeks in Python, because
+# SQLite (before 3.46) has no ISO week number.
+_KEY_LENGTH = {"hour": 13, "day": 10, "week": 10, "month": 7, "year": 4}
+# Granularities each sales_rollup period can be summed into
+_ROLLUP_SERVES = {"year": ("year",), "month": ("month", "year"), "day": ("day", "week", "month", "year")}
+
+# Sales over a range of time, one dense series per group: every bucket of the
+# range is present, in order, with zeros where nothing was sold
+@dataclass
+class TimeSeries:
+    granularity: str
+    group_by: str
+    start: datetime.datetime
+    end: datetime.datetime
+    keys: List[str] = field(default_factory=list)     # bucket keys, oldest first
+    labels: List[str] = field(default_factory=list)   # "2025-03-10", "2025-W11", ...
+    groups: Dict[int, str] = field(default_factory=dict)  # pump/fuel/shift/user id -> label
+    income: Dict[int, List[float]] = field(default_factory=dict)
+    volume: Dict[int, List[float]] = field(default_factory=dict)
+    sales: Dict[int, List[int]] = field(default_factory=dict)
+
+    def series(self, metric: str) -> Dict[int, List[float]]:
+        return getattr(self, metric)
+
+    # Sum of one metric over the whole range, per group
+    def totals(self, metric: str) -> Dict[int, float]:
+        return {group: sum(values) for group, values in self.series(metric).items()}
+
+# Start of the bucket that holds moment
+def floor(granularity: str, moment: datetime.datetime) -> datetime.datetime:
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+# Start of the bucket after the one starting at moment
+def step(granularity: str, moment: datetime.datetime) -> datetime.datetime:
+    if granularity == "hour":
+        return moment + datetime.timedelta(hours=1)
+    if granularity == "day":
+        return moment + datetime.timedelta(days=1)
+    if granularity == "week":
+        return moment + datetime.timedelta(days=7)
+    if granularity == "month":
+        return moment.replace(year=moment.year + moment.month // 12, month=moment.month % 12 + 1)
+    return moment.replace(year=moment.year + 1)
+
+def _bucket_key(granularity: str, moment: datetime.datetime) -> str:
+    return timestamps.stamp(moment)[:_KEY_LENGTH[granularity]]
+
+def _bucket_label(granularity: str, moment: datetime.datetime) -> str:
+    if granularity == "hour":
+        return moment.strftime("%Y-%m-%d %H:00")
+    if granularity == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    return _bucket_key(granularity, moment)
+
+# Key of the bucket a grouped Date prefix (or rollup bucket) falls in
+def _key_of(granularity: str, key: str) -> str:
+    if granularity == "week":
+        day = datetime.date.fromisoformat(key[:10])
+        return (day - datetime.timedelta(days=day.weekday())).isoformat()
+    return key[:_KEY_LENGTH[granularity]]
+
+def _as_datetime(value: datetime.date) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.combine(value, datetime.time())
+
+# Coarsest sales_rollup period that can answer the query exactly, None when the
+# raw transactions have to be read (hourly buckets, shift/user groups, bounds
+# that are not whole days)
+def _rollup_period(granularity: str, group_by: str, start: datetime.datetime,
+                   end: datetime.datetime) -> str | None:
+    if group_by not in ("pump", "fuel") or granularity == "hour":
+        return None
+    if any(moment != floor("day", moment) for moment in (start, end)):
+        return None
+    for period in ("year", "month", "day"):
+        if granularity in _ROLLUP_SERVES[period] and all(floor(period, m) == m for m in (start, end)):
+            return period
+    return None
+
+# (bucket, group, income, volume, sales) rows of the range, grouped as finely
+# as the granularity needs; always a range scan of an index
+def _grouped_rows(conn: sqlite3.Connection, granularity: str, group_by: str,
+                  start: datetime.datetime, end: datetime.datetime) -> Iterable[Tuple[str, int, float, float, int]]:
+    period = _rollup_period(granularity, group_by, start, end)
+    if period is not None:
+        # Primary key range of sales_rollup: (period, bucket, pump_id)
+        return conn.execute('''
+            SELECT bucket, pump_id, income, volume, sales FROM sales_rollup
+            WHERE period = ? AND bucket >= ? AND bucket < ?
+        ''', (period, _bucket_key(period, start), _bucket_key(period, end)))
+    return _raw_rows(conn, granularity, group_by, start, end)
+
+# _grouped_rows read from transactions, in the station database and in every
+# archived year the range reaches (see core/archive.py)
+def _raw_rows(conn: sqlite3.Connection, granularity: str, group_by: str,
+              start: datetime.datetime, end: datetime.datetime) -> Iterator[Tuple[str, int, float, float, int]]:
+    bounds = (timestamps.stamp(start), timestamps.stamp(end))
+    length = _KEY_LENGTH[granularity]
+    for table in archive.sources(conn, start, end):
+        if group_by == "user":
+            yield from conn.execute(f'''
+                SELECT substr(t.Date, 1, {length}), s.user_id, SUM(t.Price), SUM(t.Volume), COUNT(*)
+                FROM {table} AS t JOIN shift AS s ON s.shift_id = t.shift_id
+                WHERE t.Date >= ? AND t.Date < ?
+                GROUP BY 1, 2
+            ''', bounds).fetchall()
+            continue
+        column = "shift_id" if group_by == "shift" else "pump_id"
+        # For pumps and fuels idx_transactions_date covers the whole query
+        yield from conn.execute(f'''
+            SELECT substr(Date, 1, {length}), {column}, SUM(Price), SUM(Volume), COUNT(*)
+            FROM {table}
+            WHERE Date >= ? AND Date < ?
+            GROUP BY 1, 2
+        ''', bounds).fetchall()
+
+_SHIFT_LABEL = "shift_type || ' ' || shift_start_time"
+
+# id -> label of every group shown even without sales
+def _group_labels(conn: sqlite3.Connection, group_by: str, start: datetime.datetime,
+                  end: datetime.datetime, forecourt: pumps.Forecourt) -> Dict[int, str]:
+    if group_by == "pump":
+        return {pump.pump_id: pump.label for pump in forecourt.pumps}
+    if group_by == "fuel":
+        return dict(forecourt.fuels)
+    if group_by == "user":
+        query, params = 'SELECT user_id, username FROM users ORDER BY user_id', ()
+    else:
+        query = f'''
+            SELECT shift_id, {_SHIFT_LABEL} FROM shift
+            WHERE shift_start_time >= ? AND shift_start_time < ? ORDER BY shift_id
+        '''
+        params = (timestamps.stamp(start), timestamps.stamp(end))
+    return {key: label for key, label in conn.execute(query, params)}
+
+# Income, volume and sales count from start (inclusive) to end (exclusive),
+# per hour/day/ISO week/month/year and per pump, fuel type, shift or user.
+# Whole-day ranges of pumps or fuels are summed from sales_rollup; everything
+# else is a range scan of transactions on idx_transactions_date. Pumps and
+# fuel types come from forecourt, read from conn when not given.
+def time_series(conn: sqlite3.Connection, start: datetime.date, end: datetime.date,
+                granularity: str = "day", group_by: str = "pump",
+                forecourt: pumps.Forecourt | None = None) -> TimeSeries:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+    if group_by not in GROUPINGS:
+        raise ValueError(f"group_by must be one of {', '.join(GROUPINGS)}")
+    start, end = _as_datetime(start), _as_datetime(end)
+    result = TimeSeries(granularity, group_by, start, end)
+    moment = floor(granularity, start)
+    while moment < end:
+        result.keys.append(_bucket_key(granularity, moment))
+        result.labels.append(_bucket_label(granularity, moment))
+        moment = step(granularity, moment)
+    position = {key: index for index, key in enumerate(result.keys)}
+    if forecourt is None:
+        forecourt = pumps.read(conn)
+    result.groups = _group_labels(conn, group_by, start, end, forecourt)
+
+    fuel_of_pump = {}
+    if group_by == "fuel":
+        fuel_of_pump = {pump.pump_id: pump.fuel_type_id for pump in forecourt.pumps}
+    empty = len(result.keys)
+
+    def add_group(group: int) -> None:
+        result.income[group] = [0.0] * empty
+        result.volume[group] = [0.0] * empty
+        result.sales[group] = [0] * empty
+
+    for group in result.groups:
+        add_group(group)
+    for key, group, income, volume, sales in _grouped_rows(conn, granularity, group_by, start, end):
+        index = position.get(_key_of(granularity, key))
+        if index is None:
+            continue
+        if group_by == "fuel":
+            group = fuel_of_pump.get(group, group)
+        if group not in result.income:
+            # A shift that started before the range, or a deleted pump/user
+            result.groups[group] = str(group)
+            add_group(group)
+        result.income[group][index] += income
+        result.volume[group][index] += volume
+        result.sales[group][index] += sales
+    if group_by == "shift":
+        earlier = [group for group, label in result.groups.items() if label == str(group)]
+        if earlier:
+            result.groups.update(conn.execute(f'''
+                SELECT shift_id, {_SHIFT_LABEL} FROM shift WHERE shift_id IN ({",".join("?" * len(earlier))})
+            ''', earlier))
+            result.groups = dict(sorted(result.groups.items()))
+    return result
+
+# income, volume and number of sales of one pump
+PumpTotals = Tuple[float, float, int]
+
+# Sales of every pump with start <= Date < end. Both bounds are timestamps
+# (see core/timestamps.py), so this is a range scan of idx_transactions_date;
+# the index also holds Price and Volume, so no table row is read. Archived
+# years in the range are added in.
+def sales_between(conn: sqlite3.Connection, start: str, end: str) -> Dict[int, PumpTotals]:
+    totals: Dict[int, PumpTotals] = {}
+    for table in archive.sources(conn, timestamps.parse(start), timestamps.parse(end)):
+        for pump_id, income, volume, sales in conn.execute(f'''
+            SELECT pump_id, SUM(Price), SUM(Volume), COUNT(*)
+            FROM {table}
+            WHERE Date >= ? AND Date < ?
+            GROUP BY pump_id
+        ''', (start, end)).fetchall():
+            before = totals.get(pump_id, (0.0, 0.0, 0))
+            totals[pump_id] = (before[0] + income, before[1] + volume, before[2] + sales)
+    return totals
@@ -0,0 +1,130 @@
+import datetime
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Per-pump totals of the transactions table, kept current by a trigger so the
+# Inventory page reads a few rows instead of grouping the whole history.
+#
+#   period    bucket
+#   day       2025-07-19
+#   month     2025-07
+#   year      2025
+#   lifetime  all
+#
+# Weeks are summed from the day rows (see core/reporting.py).
+# Only inserts are tracked: transactions are never edited by the program.
+ROLLUP_PERIODS: Dict[str, str] = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+LIFETIME_BUCKET = "all"
+
+# Creates the rollup table and the trigger that updates it on every sale
+def create_rollups(cursor: sqlite3.Cursor) -> None:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_rollup (
+            period TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            pump_id INTEGER NOT NULL,
+            income REAL NOT NULL DEFAULT 0,
+            volume REAL NOT NULL DEFAULT 0,
+            sales INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, bucket, pump_id)
+        ) WITHOUT ROWID
+    ''')
+    create_trigger(cursor)
+
+# (Re)creates the trigger that adds every new sale to the rollups
+def create_trigger(cursor: sqlite3.Cursor) -> None:
+    rows = ",\n".join(
+        f"('{period}', strftime('{fmt}', new.Date), new.pump_id, new.Price, new.Volume, 1)"
+        for period, fmt in ROLLUP_PERIODS.items()
+    )
+    cursor.execute('DROP TRIGGER IF EXISTS trg_transactions_rollup')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_transactions_rollup AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+            VALUES {rows},
+            ('lifetime', '{LIFETIME_BUCKET}', new.pump_id, new.Price, new.Volume, 1)
+            ON CONFLICT(period, bucket, pump_id) DO UPDATE SET
+                income = income + excluded.income,
+                volume = volume + excluded.volume,
+                sales = sales + excluded.sales;
+        END
+    ''')
+
+# Rebuilds every rollup row from the transactions table, plus the daily
+# totals of archived years (core/archive.py daily_totals) when given
+def backfill(cursor: sqlite3.Cursor, archived: Iterable[Tuple[str, int, float, float, int]] = ()) -> int:
+    cursor.execute('DELETE FROM sales_rollup')
+    for period, fmt in ROLLUP_PERIODS.items():
+        cursor.execute(f'''
+            INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+            SELECT '{period}', strftime('{fmt}', Date) AS bucket, pump_id,
+                   SUM(Price), SUM(Volume), COUNT(*)
+            FROM transactions
+            GROUP BY bucket, pump_id
+        ''')
+    cursor.execute(f'''
+        INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+        SELECT 'lifetime', '{LIFETIME_BUCKET}', pump_id, SUM(Price), SUM(Volume), COUNT(*)
+        FROM transactions
+        GROUP BY pump_id
+    ''')
+    add_daily(cursor, archived)
+    return cursor.execute('SELECT COUNT(*) FROM sales_rollup').fetchone()[0]
+
+# Runs a block with the rollup trigger dropped, for inserts whose sales the
+# rollups already count (or that the caller adds itself). Must run inside
+# the caller's transaction, so other writers never see the table without
+# its trigger.
+@contextmanager
+def trigger_dropped(cursor: sqlite3.Cursor) -> Iterator[None]:
+    cursor.execute('DROP TRIGGER IF EXISTS trg_transactions_rollup')
+    yield
+    create_trigger(cursor)
+
+# Adds (day, pump_id, income, volume, sales) totals to every bucket they fall in
+def add_daily(cursor: sqlite3.Cursor, daily: Iterable[Tuple[str, int, float, float, int]]) -> None:
+    totals: Dict[Tuple[str, str, int], List[float]] = {}
+    for day, pump_id, income, volume, sales in daily:
+        date = datetime.date.fromisoformat(day)
+        for period, fmt in ROLLUP_PERIODS.items():
+            row = totals.setdefault((period, date.strftime(fmt), pump_id), [0.0, 0.0, 0])
+            row[0] += income
+            row[1] += volume
+            row[2] += sales
+        row = totals.setdefault(('lifetime', LIFETIME_BUCKET, pump_id), [0.0, 0.0, 0])
+        row[0] += income
+        row[1] += volume
+        row[2] += sales
+    cursor.executemany('''
+        INSERT INTO sales_rollup(period, bucket, pump_id, income, volume, sales)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(period, bucket, pump_id) DO UPDATE SET
+            income = income + excluded.income,
+            volume = volume + excluded.volume,
+            sales = sales + excluded.sales
+    ''', [key + tuple(row) for key, row in totals.items()])
+
+# Per day and pump totals of a transactions table, for add_daily
+DAILY_TOTALS = '''
+    SELECT substr(Date, 1, 10), pump_id, SUM(Price), SUM(Volume), COUNT(*)
+    FROM {table}
+    WHERE transaction_id > ?
+    GROUP BY 1, 2
+'''
+
+# Runs a bulk insert into transactions with the trigger dropped, then adds
+# the new rows to the rollups: one grouped scan of the new rows per day and
+# pump, from which the other buckets are summed. Must run inside the
+# caller's transaction (see trigger_dropped).
+@contextmanager
+def bulk_insert(cursor: sqlite3.Cursor) -> Iterator[None]:
+    after_id = cursor.execute('SELECT COALESCE(MAX(transaction_id), 0) FROM transactions').fetchone()[0]
+    with trigger_dropped(cursor):
+        yield
+        add_daily(cursor, cursor.execute(DAILY_TOTALS.format(table="transactions"), (after_id,)).fetchall())
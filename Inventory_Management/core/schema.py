@@ -0,0 +1,93 @@
+import sqlite3
+from typing import Callable
+
+from . import migrations, timestamps
+from .auth import hash_password
+from .pricing import price_resolver
+from .pumps import pump_registry
+
+# Asked once for the default admin; returning None or "" asks again
+AskPassword = Callable[[], str | None]
+# Asked once per price Name with (title, message)
+AskPrice = Callable[[str, str], float | None]
+
+FUEL_TYPES = ('Diesel', 'Premium', 'Unleaded')
+DEFAULT_PUMPS = [
+    ('Diesel', 'Diesel 1'),
+    ('Diesel', 'Diesel 2'),
+    ('Premium', 'Premium 1'),
+    ('Premium', 'Premium 2'),
+    ('Premium', 'Premium 3'),
+    ('Unleaded', 'Unleaded'),
+]
+EMPLOYEE_LOGIN = ('user123', 'qwertyuiop')
+
+# (fuel_type_id, price Name, dialog title, dialog message) in the order they are asked
+INITIAL_PRICES = [
+    (1, 'Diesel', "Set Diesel Price", "Enter price per liter of diesel:"),
+    (1, 'Diesel100', "Set Diesel100 Price", "Enter price per 100 liters of diesel:"),
+    (2, 'Premium', "Set Premium Price", "Enter price per liter of premium:"),
+    (2, 'Premium100', "Set Premium100 Price", "Enter price per 100 liters of premium:"),
+    (3, 'Unleaded', "Set Unleaded Price", "Enter price per liter of Unleaded:"),
+    (3, 'Unleaded100', "Set Unleaded100 Price", "Enter price per 100 liters of Unleaded:"),
+]
+
+# True once the fuel types, users and prices are there (one query, so a
+# current database costs no more at startup)
+def is_seeded(conn: sqlite3.Connection) -> bool:
+    return bool(conn.execute('''
+        SELECT EXISTS (SELECT 1 FROM fuel_type)
+           AND EXISTS (SELECT 1 FROM users)
+           AND EXISTS (SELECT 1 FROM price)
+    ''').fetchone()[0])
+
+# Upgrades the schema and seeds a new database. The caller supplies the
+# prompts (dialogs in the GUI, fixed values in scripts); they are only
+# called for tables that are still empty. Returns False when the database
+# was already at the latest version and seeded.
+def setup_database(conn: sqlite3.Connection, ask_admin_password: AskPassword,
+                   ask_price: AskPrice) -> bool:
+    # Nothing to check once the schema is at the latest version and seeded;
+    # `manage.py migrate` on a new file only creates the tables
+    if not migrations.needs_upgrade(conn) and is_seeded(conn):
+        return False
+    datenow = timestamps.stamp()
+    cursor = conn.cursor()
+
+    # Upgrade the tables and seed a new database in one transaction,
+    # so an interrupted first start leaves nothing half done
+    with conn:
+        cursor.execute("BEGIN")
+        migrations.migrate(cursor)
+
+        # Set the fuel types
+        cursor.execute('SELECT COUNT(*) FROM fuel_type')
+        if cursor.fetchone()[0] == 0:
+            fuel_ids = {}
+            for fuel_name in FUEL_TYPES:
+                cursor.execute('INSERT INTO fuel_type (fuel_name) VALUES (?)', (fuel_name,))
+                fuel_ids[fuel_name] = cursor.lastrowid
+            cursor.executemany("INSERT INTO pump (fuel_type_id, pump_label) VALUES (?, ?)",
+                               [(fuel_ids[fuel], label) for fuel, label in DEFAULT_PUMPS])
+
+        #new admin setup
+        cursor.execute('SELECT COUNT(*) FROM users')
+        if cursor.fetchone()[0] == 0:
+            new_admin_password = None
+            while not new_admin_password:
+                new_admin_password = ask_admin_password()
+            cursor.execute('INSERT INTO users (username, password_hash) VALUES (?, ?)',
+                           ('admin', hash_password(new_admin_password)))
+            cursor.execute('INSERT INTO users (username, password_hash) VALUES (?, ?)',
+                           (EMPLOYEE_LOGIN[0], hash_password(EMPLOYEE_LOGIN[1])))
+
+        #setup prices initally
+        cursor.execute('SELECT COUNT(*) FROM price')
+        if cursor.fetchone()[0] == 0:
+            for fuel_type_id, name, title, message in INITIAL_PRICES:
+                cursor.execute('INSERT INTO price(fuel_type_id, price, Name,effective_date) VALUES (?,?,?,?)',
+                               (fuel_type_id, ask_price(title, message), name, datenow))
+
+    price_resolver.invalidate()
+    pump_registry.invalidate()
+    return True
@@ -0,0 +1,309 @@
+# Station server: one process owns the database and the cashier terminals
+# talk to it over TCP or a Unix socket (protocol in core/protocol.py), instead
+# of every terminal opening the file. Started with `manage.py serve`.
+#
+# Each terminal gets a thread with its own read connection. Sales go into the
+# sales journal (core/journal.py) and are acknowledged once they are durable
+# there; its writer thread commits them in batches, so terminals never wait
+# on each other's commits. The few other writes (shifts, prices) take a lock
+# so they are never two at a time. After a change the other terminals are
+# told which data changed, and refresh their pages.
+import datetime
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Set
+
+from . import auth, events, migrations, pricing, protocol, reporting, shifts, transactions
+from .db import close_connection, get_connection
+from .journal import SalesJournal, sales_journal
+from .pricing import price_resolver
+from .pumps import pump_registry
+
+# user_id that gets the admin pages (the first user, as in Mainframe.LoginPage)
+ADMIN_USER_ID = 1
+
+# One connected terminal
+class Session:
+    def __init__(self, sock: socket.socket, wfile: Any):
+        self.socket = sock
+        self.wfile = wfile
+        self.user_id: int | None = None
+        self.shift_id: int | None = None   # the open shift sales are recorded in
+        self._lock = threading.Lock()   # replies and pushed events share the socket
+
+    def send(self, message: Dict[str, Any]) -> None:
+        data = protocol.encode(message)
+        with self._lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    # Ends the connection; its handler thread sees the end of the stream
+    def disconnect(self) -> None:
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def require_login(self) -> int:
+        if self.user_id is None:
+            raise PermissionError("Log in first")
+        return self.user_id
+
+    def require_admin(self) -> int:
+        if self.require_login() != ADMIN_USER_ID:
+            raise PermissionError("Only the admin can do that")
+        return ADMIN_USER_ID
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Listener"
+
+    def handle(self) -> None:
+        station: StationServer = self.server.station
+        session = Session(self.connection, self.wfile)
+        station.add_session(session)
+        try:
+            while True:
+                line = self.rfile.readline(protocol.MAX_LINE + 1)
+                if not line:
+                    return
+                if len(line) > protocol.MAX_LINE:
+                    session.send({"id": None, "ok": False, "error": "Message too long", "kind": "value"})
+                    return
+                if line.strip():
+                    session.send(station.handle(session, line))
+        except (ConnectionError, OSError):
+            pass    # the terminal went away
+        finally:
+            station.remove_session(session)
+            close_connection()
+
+class _Listener(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    station: "StationServer"
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _UnixListener(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        station: "StationServer"
+
+class StationServer:
+    def __init__(self, address: str = protocol.DEFAULT_ADDRESS, journal: SalesJournal = sales_journal,
+                 poll_interval: float = 0.05):
+        self.journal = journal
+        self.poll_interval = poll_interval
+        self._sessions: Set[Session] = set()
+        self._sessions_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._ops: Dict[str, Callable[..., Any]] = {
+            name[3:]: getattr(self, name) for name in dir(self) if name.startswith("op_")
+        }
+        kind, target = protocol.parse_address(address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.remove(target)   # left by a server that was killed
+            self._listener: socketserver.BaseServer = _UnixListener(target, _Handler)
+            self.address = "unix:" + target
+        else:
+            self._listener = _Listener(target, _Handler)
+            host, port = self._listener.server_address[:2]
+            self.address = f"{host}:{port}"
+        self._listener.station = self   # type: ignore[attr-defined]
+        self._unix_path = target if kind == "unix" else None
+
+    # Opens the sales journal and serves until shutdown()
+    def serve_forever(self) -> None:
+        self.journal.open()
+        notifier = threading.Thread(target=self._notify_commits, name="station-notify", daemon=True)
+        notifier.start()
+        try:
+            self._listener.serve_forever()
+        finally:
+            self._stopped.set()
+            self._listener.server_close()
+            with self._sessions_lock:
+                sessions = list(self._sessions)
+            for session in sessions:
+                session.disconnect()
+            if self._unix_path and os.path.exists(self._unix_path):
+                os.remove(self._unix_path)
+            self.journal.close()
+            close_connection()
+
+    def shutdown(self) -> None:
+        self._listener.shutdown()
+
+    def add_session(self, session: Session) -> None:
+        with self._sessions_lock:
+            self._sessions.add(session)
+
+    def remove_session(self, session: Session) -> None:
+        with self._sessions_lock:
+            self._sessions.discard(session)
+
+    def sessions(self) -> int:
+        with self._sessions_lock:
+            return len(self._sessions)
+
+    # Tells every terminal but the one that made the change
+    def broadcast(self, topic: str, origin: Session | None = None) -> None:
+        with self._sessions_lock:
+            sessions = [session for session in self._sessions if session is not origin]
+        for session in sessions:
+            try:
+                session.send({"event": topic})
+            except OSError:
+                pass    # its handler notices and drops the session
+
+    # The reply to one request line
+    def handle(self, session: Session, line: bytes) -> Dict[str, Any]:
+        request_id = None
+        try:
+            request = protocol.decode(line)
+            request_id = request.get("id")
+            op = self._ops.get(request.get("op"))
+            if op is None:
+                raise ValueError(f"Unknown operation {request.get('op')!r}")
+            args = request.get("args") or {}
+            if not isinstance(args, dict):
+                raise ValueError("args must be an object")
+            return {"id": request_id, "ok": True, "result": op(session, **args)}
+        except PermissionError as error:
+            return {"id": request_id, "ok": False, "error": str(error), "kind": "auth"}
+        except (ValueError, TypeError, KeyError) as error:
+            return {"id": request_id, "ok": False, "error": str(error), "kind": "value"}
+        except Exception as error:
+            traceback.print_exc(file=sys.stderr)
+            return {"id": request_id, "ok": False, "error": f"{type(error).__name__}: {error}", "kind": "server"}
+
+    # Sales committed by the journal's writer: every terminal refreshes
+    def _notify_commits(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            if self.journal.poll():
+                self.broadcast(events.TRANSACTIONS)
+
+    # --- operations: op_<name>(session, **args), the result must be JSON ---
+
+    def op_hello(self, session: Session, version: int = protocol.PROTOCOL_VERSION) -> Dict[str, Any]:
+        if version != protocol.PROTOCOL_VERSION:
+            raise ValueError(f"Protocol version {version} is not supported, the server speaks "
+                             f"{protocol.PROTOCOL_VERSION}")
+        return {"version": protocol.PROTOCOL_VERSION, "schema": migrations.current_version(get_connection())}
+
+    # A terminal that reconnects gets back the shift its user has open
+    def op_login(self, session: Session, username: str, password: str) -> Dict[str, Any]:
+        conn = get_connection()
+        success, user_id = auth.check_login(conn, username, password)
+        session.user_id = user_id if success else None
+        session.shift_id = shifts.open_shift_id(conn, user_id) if success and user_id is not None else None
+        return {"ok": success, "user_id": user_id}
+
+    def op_logout(self, session: Session) -> None:
+        session.user_id = None
+        session.shift_id = None
+
+    def op_start_shift(self, session: Session, user_id: int, shift_date: str, shift_type: str,
+                       start_time: str) -> int:
+        self._own(session, user_id)
+        with self._write_lock:
+            shift_id = shifts.start_shift(get_connection(), user_id, shift_date, shift_type, start_time)
+        session.shift_id = shift_id
+        self.broadcast(events.SHIFTS, session)
+        return shift_id
+
+    # Ends the shift open on this terminal; None when another terminal of the
+    # same user ended it first
+    def op_end_shift(self, session: Session, shift_id: int, end_time: str) -> int | None:
+        session.require_login()
+        open_shift = session.shift_id
+        if open_shift is None:
+            return None
+        if int(shift_id) != open_shift:
+            raise ValueError(f"Shift {shift_id} is not the shift open on this terminal")
+        with self._write_lock:
+            shift_id = shifts.end_shift(get_connection(), open_shift, end_time)
+        if shift_id is not None:
+            # Also on the user's other terminals, which can no longer sell in it
+            with self._sessions_lock:
+                for other in self._sessions:
+                    if other.shift_id == shift_id:
+                        other.shift_id = None
+            self.broadcast(events.SHIFTS, session)
+        return shift_id
+
+    def op_last_finished_shift(self, session: Session) -> List[str] | None:
+        session.require_login()
+        row = shifts.last_finished_shift(get_connection())
+        return list(row) if row else None
+
+    def op_forecourt(self, session: Session) -> Dict[str, Any]:
+        session.require_login()
+        return pump_registry.forecourt(get_connection()).to_json()
+
+    # Acknowledged once the sales are in the journal, like a local terminal's
+    # submit. Checked against the session's shift and the pump registry, so a
+    # sale costs no queries before the journal's writer commits it.
+    def op_record_sales(self, session: Session, shift_id: int, sales: List[List[Any]], date: str) -> int:
+        session.require_login()
+        open_shift = session.shift_id
+        if open_shift is None:
+            raise ValueError("No shift is open, start a shift first")
+        if int(shift_id) != open_shift:
+            raise ValueError(f"Shift {shift_id} is not the shift open on this terminal")
+        pumps = pump_registry.forecourt(get_connection()).by_id
+        rows = []
+        for pump_id, volume, price in sales:
+            if int(pump_id) not in pumps:
+                raise ValueError(f"Unknown pump {pump_id}")
+            rows.append((int(pump_id), float(volume), float(price)))
+        if not rows:
+            raise ValueError("No sales")
+        return self.journal.append(open_shift, rows, str(date))
+
+    def op_current_prices(self, session: Session) -> Dict[str, float]:
+        session.require_login()
+        return price_resolver.load(get_connection())
+
+    def op_price_history(self, session: Session, names: List[str]) -> List[List[Any]]:
+        session.require_login()
+        return [list(row) for row in pricing.price_history(get_connection(), names)]
+
+    def op_add_price(self, session: Session, fuel_type_id: int, name: str, price: float) -> None:
+        session.require_admin()
+        with self._write_lock:
+            pricing.add_price(get_connection(), int(fuel_type_id), str(name), float(price))
+        self.broadcast(events.PRICES, session)
+
+    def op_fetch_older(self, session: Session, before_id: int | None = None) -> List[List[Any]]:
+        session.require_login()
+        return [list(row) for row in transactions.fetch_older(get_connection(), before_id)]
+
+    def op_fetch_newer(self, session: Session, after_id: int) -> List[List[Any]]:
+        session.require_login()
+        return [list(row) for row in transactions.fetch_newer(get_connection(), after_id)]
+
+    def op_inventory_report(self, session: Session) -> Dict[str, Any]:
+        session.require_login()
+        conn = get_connection()
+        return asdict(reporting.inventory_report(conn, forecourt=pump_registry.forecourt(conn)))
+
+    def op_time_series(self, session: Session, start: str, end: str, granularity: str = "day",
+                       group_by: str = "pump") -> Dict[str, Any]:
+        session.require_login()
+        conn = get_connection()
+        series = reporting.time_series(conn, datetime.datetime.fromisoformat(start),
+                                       datetime.datetime.fromisoformat(end), granularity, group_by,
+                                       pump_registry.forecourt(conn))
+        return asdict(series)
+
+    # A terminal only opens and closes shifts for the user logged in on it
+    @staticmethod
+    def _own(session: Session, user_id: int) -> None:
+        if session.require_login() != user_id:
+            raise PermissionError("Shifts can only be started by the user who is logged in")
@@ -0,0 +1,67 @@
+import datetime
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, cast
+
+from . import timestamps
+from .pumps import Forecourt
+
+# The shift a terminal is selling in, made by HomePage.toggle_shift when it
+# starts: sales are attributed to its shift_id and checked against the
+# station's pumps without asking the database again
+@dataclass
+class ShiftSession:
+    shift_id: int
+    user_id: int
+    start_time: str
+    forecourt: Forecourt
+
+    # The lines of one submit as a list to record; a pump the station's
+    # registry does not know (removed, or a stale grid after `pumps --add`)
+    # raises ValueError here, before anything is written to the journal
+    def sales(self, lines: Sequence[Tuple[int, float, float]]) -> List[Tuple[int, float, float]]:
+        unknown = [pump_id for pump_id, _, _ in lines if pump_id not in self.forecourt.by_id]
+        if unknown:
+            raise ValueError(f"Unknown pump {unknown[0]}")
+        return [(pump_id, volume, price) for pump_id, volume, price in lines]
+
+# (shift_end_time, shift_date) of the newest finished shift, None if no shift has ended
+def last_finished_shift(conn: sqlite3.Connection) -> Tuple[str, str] | None:
+    return conn.execute('''
+        SELECT shift_end_time, shift_date FROM shift
+        WHERE shift_end_time IS NOT NULL
+        ORDER BY shift_id DESC
+        LIMIT 1
+    ''').fetchone()
+
+# shift_id of the user's newest open shift, None if none is open
+def open_shift_id(conn: sqlite3.Connection, user_id: int) -> int | None:
+    row = conn.execute('''
+        SELECT shift_id FROM shift
+        WHERE user_id = ? AND shift_end_time IS NULL
+        ORDER BY shift_id DESC LIMIT 1
+    ''', (user_id,)).fetchone()
+    return row[0] if row else None
+
+# (shift_date, shift_type, timestamp) the way the shift table stores them
+def shift_stamp(now: datetime.datetime | None = None) -> Tuple[str, str, str]:
+    now = now or datetime.datetime.now()
+    return now.strftime(timestamps.DATE_FORMAT), now.strftime("%p"), timestamps.stamp(now)
+
+# Opens a shift for the user and returns its shift_id
+def start_shift(conn: sqlite3.Connection, user_id: int, shift_date: str, shift_type: str,
+                start_time: str) -> int:
+    with conn:
+        cursor = conn.execute('''
+            INSERT INTO shift(user_id, shift_date, shift_type, shift_start_time)
+            VALUES (?, ?, ?, ?)
+        ''', (user_id, shift_date, shift_type, start_time))
+    return cast(int, cursor.lastrowid)
+
+# Closes the shift shift_id (the terminal's ShiftSession); returns it, None if
+# it was not open (ended on another terminal of the same user)
+def end_shift(conn: sqlite3.Connection, shift_id: int, end_time: str) -> int | None:
+    with conn:
+        cursor = conn.execute('UPDATE shift SET shift_end_time = ? WHERE shift_id = ? AND shift_end_time IS NULL',
+                              (end_time, shift_id))
+    return shift_id if cursor.rowcount else None
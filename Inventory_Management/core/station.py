@@ -0,0 +1,96 @@
+# What the pages ask of the station, whether the terminal opens the database
+# file itself (LocalStation, the default) or talks to a station server that
+# several terminals share (RemoteStation in core/client.py). The program uses
+# whichever was chosen at startup through current().
+#
+# Reads may run on the query workers (see core/executor.py): LocalStation
+# uses the calling thread's connection, RemoteStation is thread-safe.
+# transactions and reporting are imported on first use, after login, so
+# the login window does not wait for them.
+import datetime
+import sqlite3
+from typing import Dict, List, Sequence, Tuple
+
+from . import auth, events, pricing, shifts
+from .db import close_connection, get_connection
+from .journal import sales_journal
+from .pricing import price_resolver
+from .pumps import Forecourt, pump_registry
+
+class LocalStation:
+    remote = False
+
+    # Starts the sales journal (replaying what a crash left in it)
+    def open(self) -> None:
+        sales_journal.open()
+
+    def close(self) -> None:
+        sales_journal.close()
+        close_connection()
+
+    # Topics whose data changed since the last call, to publish on the Tk thread
+    def poll(self) -> List[str]:
+        return [events.TRANSACTIONS] if sales_journal.poll() else []
+
+    # The database connection of the calling thread, for what only works on the file
+    def connection(self) -> sqlite3.Connection:
+        return get_connection()
+
+    def check_login(self, username: str, password: str) -> Tuple[bool, int | None]:
+        return auth.check_login(get_connection(), username, password)
+
+    def start_shift(self, user_id: int, shift_date: str, shift_type: str, start_time: str) -> int:
+        return shifts.start_shift(get_connection(), user_id, shift_date, shift_type, start_time)
+
+    def end_shift(self, shift_id: int, end_time: str) -> int | None:
+        return shifts.end_shift(get_connection(), shift_id, end_time)
+
+    def last_finished_shift(self) -> Tuple[str, str] | None:
+        return shifts.last_finished_shift(get_connection())
+
+    # Fuel types and pumps, read once (core/pumps.py)
+    def forecourt(self) -> Forecourt:
+        return pump_registry.forecourt(get_connection())
+
+    # Safe in the journal once this returns; the journal's writer commits it
+    def record_sales(self, shift_id: int, sales: Sequence[Tuple[int, float, float]], date: str) -> None:
+        sales_journal.append(shift_id, sales, date)
+
+    def current_prices(self) -> Dict[str, float]:
+        return price_resolver.load(get_connection())
+
+    def price_history(self, names: Sequence[str]) -> List[Tuple[str, float, str]]:
+        return pricing.price_history(get_connection(), names)
+
+    def add_price(self, fuel_type_id: int, name: str, price: float) -> None:
+        pricing.add_price(get_connection(), fuel_type_id, name, price)
+
+    def fetch_older(self, before_id: int | None = None) -> list:
+        from . import transactions
+        return transactions.fetch_older(get_connection(), before_id)
+
+    def fetch_newer(self, after_id: int) -> list:
+        from . import transactions
+        return transactions.fetch_newer(get_connection(), after_id)
+
+    def inventory_report(self):
+        from . import reporting
+        conn = get_connection()
+        return reporting.inventory_report(conn, forecourt=pump_registry.forecourt(conn))
+
+    def time_series(self, start: datetime.date, end: datetime.date, granularity: str = "day",
+                    group_by: str = "pump"):
+        from . import reporting
+        conn = get_connection()
+        return reporting.time_series(conn, start, end, granularity, group_by, pump_registry.forecourt(conn))
+
+_current = LocalStation()
+
+# The station the program works with
+def current():
+    return _current
+
+# Switches the program to another station (a RemoteStation at startup)
+def use(station) -> None:
+    global _current
+    _current = station
@@ -0,0 +1,31 @@
+import datetime
+
+# How every date and time is stored (transactions.Date, shift start/end,
+# price.effective_date): ISO-8601 local time. It sorts as text, SQLite's date
+# functions read it, and an index on the column serves range queries.
+FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+def stamp(moment: datetime.datetime | None = None) -> str:
+    return (moment or datetime.datetime.now()).strftime(FORMAT)
+
+def parse(text: str) -> datetime.datetime:
+    return datetime.datetime.strptime(text, FORMAT)
+
+# First timestamp of a day, the inclusive lower bound of range queries
+def day_start(day: datetime.date) -> str:
+    return day.strftime(DATE_FORMAT) + " 00:00:00"
+
+# The formats used before schema version 5, read only by that migration
+LEGACY_TIME_FORMAT = "%I:%M:%S:%p"         # shift_start_time / shift_end_time
+LEGACY_PRICE_DATE_FORMAT = "%m-%d-%Y"      # price.effective_date
+
+# shift_date + a legacy "%I:%M:%S:%p" time, moved to the next day when the
+# time is before the given start (a shift that ran past midnight)
+def from_legacy_shift_time(shift_date: str, time: str,
+                           not_before: datetime.datetime | None = None) -> datetime.datetime:
+    clock = datetime.datetime.strptime(time, LEGACY_TIME_FORMAT).time()
+    moment = datetime.datetime.combine(datetime.datetime.strptime(shift_date, DATE_FORMAT).date(), clock)
+    if not_before is not None and moment < not_before:
+        moment += datetime.timedelta(days=1)
+    return moment
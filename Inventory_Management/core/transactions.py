@@ -0,0 +1,82 @@
+import sqlite3
+from typing import List, Sequence, Tuple
+
+from . import archive
+
+# Rows fetched per page when browsing the transaction history
+PAGE_SIZE = 100
+
+# transaction_id, pump label, fuel name, volume, price, date
+TransactionRow = Tuple[int, str, str, float, float, str]
+
+# One sale to record: pump_id, volume, price
+Sale = Tuple[int, float, float]
+
+_HISTORY_QUERY = '''
+    SELECT
+    transactions.transaction_id,
+    pump.pump_label AS "Pump_label",
+    fuel_type.fuel_name AS "Fuel_type",
+    transactions.Volume,
+    transactions.Price,
+    transactions.Date
+    FROM {table} AS transactions
+    JOIN pump ON transactions.pump_id = pump.pump_id
+    JOIN fuel_type ON pump.fuel_type_id = fuel_type.fuel_type_id
+'''
+
+# Newest transactions older than before_id (newest overall when None), newest first.
+# Keyset pagination on the primary key: the cost does not grow with the history.
+# Archived years (core/archive.py) are only opened once the page could reach them.
+def fetch_older(conn: sqlite3.Connection, before_id: int | None = None,
+                limit: int = PAGE_SIZE) -> List[TransactionRow]:
+    if before_id is None:
+        query, params = _HISTORY_QUERY + '''
+            ORDER BY transactions.transaction_id DESC LIMIT ?
+        ''', (limit,)
+    else:
+        query, params = _HISTORY_QUERY + '''
+            WHERE transactions.transaction_id < ?
+            ORDER BY transactions.transaction_id DESC LIMIT ?
+        ''', (before_id, limit)
+    rows = conn.execute(query.format(table="main.transactions"), params).fetchall()
+    for partition in sorted(archive.partitions(conn), key=lambda p: -p.last_id):
+        if before_id is not None and partition.first_id >= before_id:
+            continue
+        if len(rows) == limit and partition.last_id < rows[-1][0]:
+            continue
+        with archive.attached(conn, partition) as schema:
+            rows += conn.execute(query.format(table=f"{schema}.transactions"), params).fetchall()
+        rows.sort(key=lambda row: -row[0])
+        del rows[limit:]
+    return rows
+
+# Oldest transactions newer than after_id, returned newest first
+def fetch_newer(conn: sqlite3.Connection, after_id: int,
+                limit: int = PAGE_SIZE) -> List[TransactionRow]:
+    query = _HISTORY_QUERY + '''
+        WHERE transactions.transaction_id > ?
+        ORDER BY transactions.transaction_id ASC LIMIT ?
+    '''
+    rows = conn.execute(query.format(table="main.transactions"), (after_id, limit)).fetchall()
+    for partition in sorted(archive.partitions(conn), key=lambda p: p.first_id):
+        if partition.last_id <= after_id:
+            continue
+        if len(rows) == limit and partition.first_id > rows[-1][0]:
+            continue
+        with archive.attached(conn, partition) as schema:
+            rows += conn.execute(query.format(table=f"{schema}.transactions"), (after_id, limit)).fetchall()
+        rows.sort(key=lambda row: row[0])
+        del rows[limit:]
+    rows.reverse()
+    return rows
+
+# Writes a batch of sales with one executemany in one transaction (one commit);
+# if any row fails the whole batch is rolled back
+def record_sales(conn: sqlite3.Connection, shift_id: int, sales: Sequence[Sale], date: str) -> int:
+    with conn:
+        conn.executemany('''
+            INSERT INTO transactions(shift_id, pump_id, Volume, Price, Date)
+            VALUES(?,?,?,?,?)
+        ''', [(shift_id, pump_id, volume, price, date) for pump_id, volume, price in sales])
+    return len(sales)
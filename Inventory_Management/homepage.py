@@ -0,0 +1,1319 @@
+# The pages shown after login: HomePage with its navigation bar and the
+# content pages it switches between. Mainframe imports this module only
+# once the login window is up, so none of it slows down the first frame.
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import datetime
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, cast, Type, TypeVar, Any
+from assets import assets
+from core import events, exporter, reporting, shifts, station, timestamps, transactions
+from core.db import connect
+from core.executor import query_executor
+from core.journal import JournalError
+from core.pricing import price_resolver
+from core.profiling import profiler
+from core.pumps import Pump, pump_registry
+from core.protocol import RemoteError
+if TYPE_CHECKING:
+    from Mainframe import ProjectFrame
+T = TypeVar('T', bound=tk.Frame)
+
+# Runs a read on the query worker, work(backend) with the station the program
+# uses; on_done gets the result back on the Tk thread, unless the widget was
+# destroyed before the query finished. on_error gets the exception instead
+# (a locked database, a lost station server) and has to end the page's loading state.
+def run_query(widget: tk.Misc, work: Callable[[Any], Any], on_done: Callable[[Any], None],
+              on_error: Callable[[BaseException], None]):
+    return query_executor.submit(work, on_done, on_error, alive=lambda: bool(widget.winfo_exists()))
+
+class HomePage(tk.Frame):
+    def __init__(self, parent: tk.Tk, controller: "ProjectFrame", role: str | None, user_id: int |None):
+        
+        self.shift_icon = assets.icon("images/shift.png", (24, 24))
+        self.price_icon = assets.icon("images/price.png", (24, 24))
+        self.delivery_icon = assets.icon("images/delivery.png", (24, 24))
+        self.inventory_icon = assets.icon("images/inventory.png", (24, 24))
+        self.transactions_icon = assets.icon("images/transaction.png", (24, 24))
+        self.logout_icon = assets.icon("images/logout.png", (24, 24))
+        self.login_icon = assets.icon("images/login.png", (36, 36))
+        
+        #navigation buttons 
+        self.buttons = [
+            ("Start Shift", self.shift_icon, lambda: self.Onclick(1)),
+            ("Price", self.price_icon, lambda: self.Onclick(2)),
+            ("Inventory", self.inventory_icon, lambda: self.Onclick(3)),
+            ("Transactions", self.transactions_icon, lambda: self.Onclick(4)),
+            ("Delivery", self.delivery_icon, lambda: self.Onclick(5)),
+            ("Export", self.transactions_icon, lambda: self.Onclick(8)),
+            ("Logout", self.logout_icon, lambda: self.Onclick(6))
+        ]
+        # Query and page timings, only when the program runs with profiling on
+        if profiler.enabled:
+            self.buttons.insert(-1, ("Diagnostics", self.transactions_icon, lambda: self.Onclick(7)))
+
+        super().__init__(parent, bg='#f5f7fa')  # Match login background
+        self.role = role
+        self.user_id = user_id
+        self.controller = controller
+        self.shift_button = None
+
+        # Configure grid
+        self.grid_rowconfigure(0, weight=0) 
+        self.grid_rowconfigure(1, weight=1)   
+        self.grid_columnconfigure(0, weight=1)
+
+        # Navigation bar
+        nav_frame = tk.Frame(self, bg='#2c3e50', height=70) 
+        nav_frame.grid(row=0, column=0, sticky='ew')
+        nav_frame.grid_propagate(False)  
+        
+        # Logo frame for navigation bar
+        logo_frame = tk.Frame(nav_frame, bg="#2c3e50")
+        logo_frame.pack(side='left', padx=20)
+        
+        # Designs at the left side of the navbar 
+        logo_label = tk.Label(
+            logo_frame, 
+            image = self.login_icon, 
+            font=("Arial", 24), 
+            bg='#2c3e50', 
+            fg='#ecf0f1'
+        )
+        logo_label.pack(side='left', padx=(0, 10))
+        
+        title_label = tk.Label(
+            logo_frame, 
+            text="Dwyane's Inventory", 
+            font=("Segoe UI", 16, "bold"), 
+            bg='#2c3e50', 
+            fg='#ecf0f1'
+        )
+        title_label.pack(side='left')
+
+        # Create container for nav buttons
+        button_frame = tk.Frame(nav_frame, bg='#2c3e50')
+        button_frame.pack(side='right', padx=20)
+        
+        # Create buttons based on role
+        self.navbar(button_frame) 
+
+        # Main content area - modern card design
+        self.main_content = tk.Frame(self, bg="#ffffff", bd=0, highlightthickness=0)
+        self.main_content.grid(row=1, column=0, sticky='nsew', padx=20, pady=20)
+        self.main_content.grid_rowconfigure(0, weight=1)
+        self.main_content.grid_columnconfigure(0, weight=1)
+        self.current_page = None
+        
+        # Pages are built once and kept; changed data marks them stale
+        self.pages: Dict[type, tk.Frame] = {}
+        self.unsubscribers = [
+            events.subscribe(topic, lambda topic=topic: self.invalidate(topic))
+            for topic in (events.TRANSACTIONS, events.PRICES, events.SHIFTS)
+        ]
+
+        # Shadow effect of the maincontent area
+        shadow = tk.Frame(self, bg="#b5b7bb", bd=0)
+        shadow.place(in_=self.main_content, relx=0, rely=0, x=-4, y=-4, relwidth=1, relheight=1, width=8, height=8)
+        self.main_content.lift()  # type: ignore
+        
+        self.show_content(DefaultPage, userlogin = False)
+
+    # Admin navigation bar method
+    def navbar(self, parent_frame: tk.Frame):
+        # Create modern styled buttons for user role without changing names
+        for text, icon, cmd in self.buttons:
+            if self.role == "user" and text not in ["Start Shift", "Logout"]:
+                continue
+            # Exports read the database file, which a server terminal does not have
+            if text == "Export" and station.current().remote:
+                continue
+            button_frame = tk.Frame(parent_frame, bg='#2c3e50', padx=5)
+            button_frame.pack(side='left', padx=5)
+            # Button design
+            button = tk.Button(
+                    button_frame,
+                    text=text,
+                    image=icon,
+                    compound='left',
+                    bg='#3498db' if text != "Logout" else '#e74c3c',
+                    fg='white',
+                    font=("Segoe UI", 10, "bold"),
+                    bd=4,
+                    padx=10,
+                    pady=8,
+                    relief='raised',
+                    command=cmd,
+                    cursor="hand2",
+                    activebackground='#2980b9' if text != "Logout" else '#c0392b',
+                    height = 6,  # Set fixed height in text lines
+                )
+            button.pack() 
+               
+            # Store reference to shift button
+            if text == "Start Shift":
+                    self.shift_button = button            
+                
+    # When Start Shift button is clicked, it will toggle the shift status.
+    # Starting one makes the controller's ShiftSession that submit records into
+    def toggle_shift(self):
+        shift_date, shift_type, stamp = shifts.shift_stamp()
+        timenow = timestamps.parse(stamp).strftime("%I:%M:%S %p")
+        user_id = cast(int, self.user_id)
+        backend = station.current()
+        
+        if self.controller.shift is None:
+            try:
+                shift_id = backend.start_shift(user_id, shift_date, shift_type, stamp)
+            except (ConnectionError, RemoteError) as error:
+                messagebox.showerror("Start Shift", f"The shift was not started: {error}")#type: ignore
+                return
+            self.controller.shift = shifts.ShiftSession(shift_id, user_id, stamp, pump_registry.forecourt())
+            events.publish(events.SHIFTS)
+            messagebox.showinfo("Start Shift", f"{shift_type} Shift started successfully at {timenow}")#type: ignore
+            getattr(self, "shift_button").config(text ="End Shift")
+            self.show_content(DefaultPage, userlogin = True)
+        else:
+            try:
+                ended = backend.end_shift(self.controller.shift.shift_id, stamp)
+            except (ConnectionError, RemoteError) as error:
+                messagebox.showerror("End shift", f"The shift was not ended: {error}")#type: ignore
+                return
+            if ended is not None:
+                events.publish(events.SHIFTS)
+                default_page = self.pages.get(DefaultPage)
+                if default_page:
+                    cast(DefaultPage, default_page).set_last_shift(stamp, shift_date)
+            messagebox.showinfo("End shift",f"{shift_type} Shift ended at {timenow}")#type: ignore
+            getattr(self, "shift_button").config(text ="Start Shift")
+            self.controller.shift = None
+            self.show_content(DefaultPage, userlogin = False)
+    
+    # Method to handle button clicks 
+    def Onclick(self, number: int):
+        match number:
+            case 1:
+                self.toggle_shift()
+            case 2: 
+                self.show_content(PricePage)
+            case 3:
+                self.show_content(InventoryPage)
+            case 4:
+                self.show_content(TransactionsPage)
+            case 5:
+                self.show_content(DeliveryPage) 
+            case 6:
+                if self.controller.shift is not None:
+                    messagebox.showwarning("Action Blocked", "You cannot logout while a shift is active. Please end the shift first.")#type: ignore
+                    self.show_content(DefaultPage, userlogin = True)
+                else:
+                    if messagebox.askyesno("Logout", "Are you sure you want to logout?"): #type: ignore
+                        self.controller.show_frame("LoginPage")  
+            case 7:
+                self.show_content(DiagnosticsPage)
+            case 8:
+                self.show_content(ExportPage)
+            case _:
+                pass
+    
+    #method for switching frames when buttons are clicked                
+    def show_content(self, PageClass: Type[T], *args: Any, **kwargs: Any)-> None:
+        if PageClass == DefaultPage:
+            kwargs['user_id'] = self.user_id
+        page = self.pages.get(PageClass)
+        if page is None:
+            with profiler.timed(PageClass.__name__):
+                page = PageClass(self.main_content, *args, **kwargs)
+            self.pages[PageClass] = page
+        elif hasattr(page, "refresh"):
+            # Already built: only bring its data up to date
+            with profiler.timed(f"{PageClass.__name__}.refresh"):
+                getattr(page, "refresh")(*args, **kwargs)
+        if self.current_page is not page:
+            if self.current_page:
+                self.current_page.pack_forget()
+            page.pack(fill='both', expand=True)
+            self.current_page = page
+        # The shown page handles clicks outside its textboxes
+        if hasattr(page, "remove_focus"):
+            page.bind_all("<Button-1>", getattr(page, "remove_focus"))
+    
+    # Marks the pages that show data of this topic, they reload on their next refresh()
+    def invalidate(self, topic: str):
+        for page in self.pages.values():
+            if topic in getattr(page, "depends_on", ()):
+                setattr(page, "stale", True)
+    
+    def destroy(self):
+        for unsubscribe in self.unsubscribers:
+            unsubscribe()
+        super().destroy()
+        
+# Icon of a pump: images/<label>.png (diesel_1.png, ...) when there is one,
+# the generic pump icon for pumps added later
+def pump_icon(pump: Pump) -> str:
+    path = f"images/{pump.label.lower().replace(' ', '_')}.png"
+    return path if os.path.exists(path) else "images/pump.png"
+
+# Button, volume and price boxes of one pump of the DefaultPage grid
+class PumpPanel(tk.Frame):
+    def __init__(self, parent: "DefaultPage", pump: Pump):
+        super().__init__(parent, bg="#91C4EE", bd = 2, relief = "solid", width=50)
+        self.pump = pump
+        self.icon = assets.icon(pump_icon(pump), (48, 48))
+        self.button = tk.Button(
+                self,
+                text=pump.label,
+                image= self.icon,
+                compound='left',
+                bg="#70818c", 
+                fg='white',
+                font=("Segoe UI", 10, "bold"),
+                bd=4,
+                padx=10,
+                pady=5,
+                relief='raised',
+                command=self.activate,
+                cursor="hand2",
+                activebackground="#4f5a62",
+                state = "disabled",
+                width = 150,
+                height = 30 
+        )
+        self.button.pack(anchor='center', padx=10, pady=5)
+        tk.Label(self, text= f"{pump.label} Volume:" ,font=("Comic Sans MS", 14), bg = "#91C4EE").pack(anchor = 'center', padx = 10, pady = 5)
+        self.volume = ttk.Entry(
+        self, 
+        width=20, 
+        font=("Comic Sans MS", 12),
+        state = "disabled"
+        )
+        self.volume.bind("<Return>", lambda e: parent.submit())
+        self.volume.bind('<KeyRelease>', lambda e: self.update_price())
+        self.volume.pack(anchor='center', padx= 10, pady= 5)
+        tk.Label(self, text= "Price:",font=("Comic Sans MS", 14), bg = "#91C4EE").pack(anchor = 'center', padx = 10, pady = 5)
+        self.price = ttk.Entry(
+        self, 
+        width=20, 
+        font=("Comic Sans MS", 12),
+        state= "disabled"
+        )
+        self.price.pack(anchor='center', padx= 10, pady= 5)
+    
+    # The pump button is enabled while a shift is open; the volume box waits for a click on it
+    def set_enabled(self, enabled: bool):
+        self.clear()
+        self.button.config(state = "normal" if enabled else "disabled")
+        if not enabled:
+            self.volume.config(state = "disabled")
+    
+    # Opens the volume box, the other pumps keep theirs so several sales can be submitted together
+    def activate(self):
+        self.volume.config(state = "normal")
+        self.volume.focus_set()
+    
+    # Price of the volume typed so far, from the price of the pump's fuel
+    def update_price(self):
+        try:
+            price_str = f"{price_resolver.sale_price(self.pump.fuel_name, float(self.volume.get())):.2f}"
+        except Exception as e: #type: ignore
+            price_str = ""
+        self.set_price(price_str)
+    
+    def set_price(self, price: str):
+        self.price.config(state = "normal")
+        self.price.delete(0, tk.END)
+        self.price.insert(0, price)
+        self.price.config(state = "disabled")
+    
+    def clear(self):
+        self.volume.delete(0, tk.END)
+        self.set_price("")
+    
+    # (pump_id, volume, price) to record, None when no volume was entered;
+    # ValueError when the boxes do not hold numbers
+    def sale(self) -> Tuple[int, float, float] | None:
+        if str(self.volume['state']) != 'normal' or not self.volume.get().strip():
+            return None
+        return (self.pump.pump_id, float(self.volume.get()), float(self.price.get()))
+
+class DefaultPage(tk.Frame):
+    # Pump panels per row and rows per page of the grid. A station with more
+    # pumps pages through them; the Clear/Submit/clock row stays below
+    GRID_COLUMNS = 3
+    GRID_ROWS = 2
+    
+    def __init__(self, parent: tk.Frame, userlogin: bool = False, user_id: int | None = None):
+        super().__init__(parent, bg='#91C4EE')
+        
+        self.userlogin = userlogin
+        self.user_id = user_id
+        
+        self.dummy_focus = tk.Frame(self)
+        self.dummy_focus.place(x=0, y=0, width=1, height=1)
+        
+        # The pumps of the station (core/pumps.py) in pump_id order. A panel is
+        # built when its page is first shown and kept, so volumes typed on
+        # another page are still there at submit
+        self.pumps = pump_registry.forecourt().pumps
+        self.page_size = self.GRID_COLUMNS * self.GRID_ROWS
+        self.page_count = max(1, -(-len(self.pumps) // self.page_size))
+        self.page = 0
+        self.panels: Dict[int, PumpPanel] = {}
+        bottom_row = self.GRID_ROWS + 1
+        for r in range(self.GRID_ROWS):
+            self.grid_rowconfigure(r, weight=1, minsize=100)
+        self.grid_rowconfigure(bottom_row, weight=1, minsize=100)
+        for c in range(self.GRID_COLUMNS):
+            self.grid_columnconfigure(c, weight=1, minsize=100)
+        
+        # Page buttons, only for stations with more pumps than one page holds
+        self.page_label: tk.Label | None = None
+        if self.page_count > 1:
+            pager = tk.Frame(self, bg="#91C4EE")
+            pager.grid(row = self.GRID_ROWS, column = 0, columnspan = self.GRID_COLUMNS, sticky="ew", padx=10)
+            self.previous_button = tk.Button(pager, text="◀ Previous", font=("Segoe UI", 10, "bold"), bg="#70818c", fg='white',
+                                             activebackground="#4f5a62", cursor="hand2", width=12,
+                                             command=lambda: self.show_page(self.page - 1))
+            self.previous_button.pack(side='left', padx=10, pady=2)
+            self.next_button = tk.Button(pager, text="Next ▶", font=("Segoe UI", 10, "bold"), bg="#70818c", fg='white',
+                                         activebackground="#4f5a62", cursor="hand2", width=12,
+                                         command=lambda: self.show_page(self.page + 1))
+            self.next_button.pack(side='right', padx=10, pady=2)
+            self.page_label = tk.Label(pager, font=("Comic Sans MS", 12), bg="#91C4EE")
+            self.page_label.pack(side='top', pady=2)
+        self.show_page(0)
+            
+        # Container frame on bottom left square
+        bottom_left = tk.Frame(self, bg="#91C4EE" , bd = 2 , relief="solid",  width=50)
+        bottom_left.grid(row = bottom_row, column = 0, sticky="nsew", padx=10, pady=10)
+        bottom_left.grid_propagate(False)
+        
+        clear_button = tk.Button(bottom_left,
+                    text="Clear",
+                    bg="#DD1F1F", 
+                    fg='white',
+                    font=("Segoe UI", 10, "bold"),
+                    bd=4,
+                    padx=10,
+                    pady=5,
+                    relief='raised',
+                    command=lambda: self.clear(),
+                    cursor="hand2",
+                    activebackground="#F10A0A",
+                    width = 15,
+                    height = 2 
+        )
+        clear_button.pack(anchor='center', padx=10, pady=20)
+
+        # Container frame on bottom middle square
+        bottom_middle = tk.Frame(self, bg="#91C4EE" , bd = 2 , relief="solid",  width=50)
+        bottom_middle.grid(row = bottom_row, column = 1, sticky="nsew", padx=10, pady=10)
+        bottom_middle.grid_propagate(False)
+        
+        submit_button = tk.Button(bottom_middle,
+                    text="Submit",
+                    bg="#0EAF0E", 
+                    fg='white',
+                    font=("Segoe UI", 10, "bold"),
+                    bd=4,
+                    padx=10,
+                    pady=5,
+                    relief='raised',
+                    command=lambda: self.submit(),
+                    cursor="hand2",
+                    activebackground="#0A820A",
+                    width = 15,
+                    height = 2 
+        )
+        submit_button.pack(anchor='center', padx=10, pady = 20)
+        
+        # Container frame on lower right square
+        bottom_right = tk.Frame(self, bg="#91C4EE" , bd = 2 , relief="solid",  width=50)
+        bottom_right.grid(row=bottom_row, column=2, sticky="nsew", padx=10, pady=10)
+        bottom_right.grid_propagate(False)  
+
+        # Stack the labels inside the container frame
+        self.clock_label = tk.Label(bottom_right, font=("Comic Sans MS", 14), bg="#91C4EE", anchor='e', justify='right')
+        self.clock_label.pack(side='bottom', anchor='e', padx=10, pady=(0,2), fill='x')        
+        self.date_label = tk.Label(bottom_right, font=("Comic Sans MS", 14), bg="#91C4EE", anchor='e', justify='right')
+        self.date_label.pack(side='bottom', anchor='e', padx=10, pady=(0,2), fill='x')
+        self.last_logout_label = tk.Label(bottom_right, font=("Comic Sans MS", 14), bg="#91C4EE", anchor='e', justify='right')
+        self.last_logout_label.pack(side='bottom', anchor='e', padx=10, pady=(0,2), fill='x')
+        self.clock_job: str | None = None
+        # Loaded once; HomePage.toggle_shift updates it when a shift ends
+        self.last_shift = station.current().last_finished_shift()
+        self.updateclock()  
+        self.bind_all("<Button-1>", self.remove_focus)
+        self.set_login_state()
+    
+    # Called when the page is shown again, e.g. after the shift was toggled
+    def refresh(self, userlogin: bool = False, user_id: int | None = None):
+        self.userlogin = userlogin
+        self.user_id = user_id
+        self.set_login_state()
+        if self.clock_job is not None:
+            self.after_cancel(self.clock_job)
+            self.clock_job = None
+        self.updateclock()
+    
+    # Shows one page of pump panels, building the ones not shown before
+    def show_page(self, page: int):
+        page = max(0, min(page, self.page_count - 1))
+        for panel in self.page_panels(self.page):
+            panel.grid_remove()
+        self.page = page
+        for index, pump in enumerate(self.pumps[page * self.page_size:(page + 1) * self.page_size]):
+            panel = self.panels.get(pump.pump_id)
+            if panel is None:
+                panel = self.panels[pump.pump_id] = PumpPanel(self, pump)
+                panel.grid_propagate(False)
+                panel.set_enabled(self.userlogin)
+            panel.grid(row = index // self.GRID_COLUMNS, column = index % self.GRID_COLUMNS, sticky="nsew", padx=10, pady=10)
+        if self.page_label is not None:
+            first = page * self.page_size + 1
+            last = min(len(self.pumps), first + self.page_size - 1)
+            self.page_label.config(text=f"Pumps {first}-{last} of {len(self.pumps)}  (page {page + 1} of {self.page_count})")
+            self.previous_button.config(state = "normal" if page > 0 else "disabled")
+            self.next_button.config(state = "normal" if page < self.page_count - 1 else "disabled")
+    
+    # Panels of one page that were built already
+    def page_panels(self, page: int) -> List[PumpPanel]:
+        pumps = self.pumps[page * self.page_size:(page + 1) * self.page_size]
+        return [self.panels[pump.pump_id] for pump in pumps if pump.pump_id in self.panels]
+    
+    # Every panel built so far, in pump order
+    def built_panels(self) -> List[PumpPanel]:
+        return [self.panels[pump.pump_id] for pump in self.pumps if pump.pump_id in self.panels]
+    
+    # state of the widgets based if the user has pressed the shift button
+    def set_login_state(self):
+        self.last_logout_label.config(text="" if self.userlogin else self.last_shift_text())
+        # the pump buttons work while a shift is open, and every box starts empty;
+        # panels built later take the same state in show_page
+        for panel in self.built_panels():
+            panel.set_enabled(self.userlogin)
+    
+    # Method to handle transaction submissions: every pump with a volume entered
+    # is confirmed once and written in a single transaction, into the shift
+    # HomePage.toggle_shift started
+    def submit(self):
+        shift = cast("ProjectFrame", self.winfo_toplevel()).shift
+        if shift is None:
+            messagebox.showerror("Transaction Error", "Nothing was recorded: no shift has been started.")#type: ignore
+            return
+        lines = []
+        for panel in self.built_panels():
+            try:
+                sale = panel.sale()
+            except ValueError: 
+                messagebox.showinfo("Input Error", f"Please enter the correct inputs in {panel.pump.label}.")#type: ignore
+                return
+            if sale is not None:
+                lines.append(sale)
+        if not lines:
+            messagebox.showinfo("Input Error", "Please enter the volume of at least one pump.")#type: ignore
+            return
+        
+        summary = "\n".join(f"{self.panels[pump_id].pump.label}: {volume} L  -  ₱{price:.2f}"
+                            for pump_id, volume, price in lines)
+        answer = messagebox.askokcancel("Transaction Confirmation", #type: ignore
+                f"{summary}\n\nAre you sure all the information entered is correct")
+        if not answer:
+            return
+        datenow = timestamps.stamp()
+        try:
+            # Safe in the journal (here or on the station server) once this returns;
+            # its writer commits it and poll_queries publishes the change
+            station.current().record_sales(shift.shift_id, shift.sales(lines), datenow)
+        except (ConnectionError, RemoteError, JournalError, ValueError) as error:
+            messagebox.showerror("Transaction Error", f"Nothing was recorded: {error}")#type: ignore
+            return
+        self.clear()
+    
+    # Method to clear all textboxes
+    def clear(self):
+        for panel in self.built_panels():
+            panel.clear()
+     
+    #Bottom right corner clock and date label, only touches the widgets
+    def updateclock(self):
+        now = datetime.datetime.now()
+        monthnow = now.strftime("%B")
+        weeknow = now.strftime("%A")
+        daynow = now.strftime("%d")
+        yearnow = now.strftime("%Y")
+        timenow = now.strftime("%I:%M:%S %p")
+        self.date_label.config(text=f"Current Date: {weeknow}, {monthnow} {daynow}, {yearnow}")  
+        self.clock_label.config(text = f"Current Time: {timenow}") 
+        if self.userlogin:
+            self.clock_job = self.after(1000, self.updateclock)  
+    
+    #Text of the last shift label from (shift_end_time, shift_date)
+    def last_shift_text(self) -> str:
+        last_logout_date = "N/A"
+        last_logout_time = "N/A"
+        if self.last_shift and self.last_shift[0]:
+            try:
+                lastend = timestamps.parse(self.last_shift[0])
+                last_logout_date = lastend.strftime("%A, %B %d, %Y")
+                last_logout_time = lastend.strftime("%I:%M:%S %p")
+            except Exception as e:
+                last_logout_time = str(self.last_shift[0])
+                last_logout_date = str(self.last_shift[1])
+                print("Error", e)
+        return f"Last Shift: {last_logout_date} at {last_logout_time}"
+    
+    #Called by HomePage.toggle_shift when a shift ends
+    def set_last_shift(self, shift_end_time: str, shift_date: str):
+        self.last_shift = (shift_end_time, shift_date)
+    
+    #Stops the clock so no timer outlives the page
+    def destroy(self):
+        if self.clock_job is not None:
+            self.after_cancel(self.clock_job)
+            self.clock_job = None
+        super().destroy()
+    
+    #Method to remove focus when a textbox is focused on
+    def remove_focus(self, event: tk.Event):
+        widget = event.widget
+        if not isinstance(widget, ttk.Entry):
+            try:
+                if self.dummy_focus.winfo_exists():
+                    self.dummy_focus.focus_set()
+            except tk.TclError:
+                pass  
+    
+# "Loading..." placeholder shown while a page waits for its query
+def loading_label(parent: tk.Frame) -> tk.Label:
+    label = tk.Label(parent, text="Loading...", font=("Segoe UI", 16, "bold"), bg="#ffffff", fg="#2c3e50", padx=20, pady=10)
+    label.place(relx=0.5, rely=0.5, anchor='center')
+    return label
+
+class TransactionsPage(tk.Frame):
+    # Rows kept in the tree at most; older or newer pages are fetched while scrolling
+    MAX_ROWS = 4 * transactions.PAGE_SIZE
+    depends_on = (events.TRANSACTIONS,)
+    stale = False
+    
+    def __init__(self, parent: tk.Frame):
+        super().__init__(parent, bg='white')
+        
+        #Tree style
+        style:ttk.Style = ttk.Style()
+        style.theme_use('alt')
+        style.configure("Custom.Treeview", #type: ignore
+                        background="white",
+                        foreground="black",
+                        rowheight=25,
+                        fieldbackground="white") 
+        
+        #setting columns
+        columns = ('Pump Label', 'Fuel_type', 'Volume(Liters)', 'Price(Pesos)', 'Date & Time')
+        
+        #Make tree
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', style= "Custom.Treeview")
+        tree = self.tree
+        for col in columns:
+            tree.heading(col, text=col, anchor='w')
+            tree.column(col, anchor='w', width=100)
+        tree.pack(side='left', fill='both', expand=True)
+
+        #Vertical scrollbar, loads more rows when the view gets near either end
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=tree.yview) #type: ignore
+        tree.configure(yscroll=self.on_scroll) # type: ignore
+        self.scrollbar.pack(side='right', fill='y')
+
+        # Event binding to remove focus
+        def on_tree_click(event: tk.Event):
+            region = tree.identify("region", event.x, event.y)#type: ignore
+            if region != "cell":
+                tree.selection_remove(tree.selection())
+
+        tree.bind("<Button-1>", on_tree_click)
+        
+        # Window of transaction ids shown in the tree
+        self.newest_id: int | None = None
+        self.oldest_id: int | None = None
+        self.has_older = True
+        self.has_newer = False
+        self.loading = True
+        self.loading_label = loading_label(self)
+        
+        tree.tag_configure('evenrow', background="#c6ccc6")
+        tree.tag_configure('oddrow', background="#949994")
+        style.map('Custom.Treeview', background=[('selected', "#627595")])#type: ignore
+        self.load_older()
+    
+    # Called when the page is shown again; starts over from the newest sale if new ones were recorded
+    def refresh(self):
+        if not self.stale:
+            return
+        if self.loading:
+            self.after(100, self.refresh)
+            return
+        self.stale = False
+        self.tree.delete(*self.tree.get_children())
+        self.newest_id = None
+        self.oldest_id = None
+        self.has_older = True
+        self.has_newer = False
+        self.loading = True
+        self.load_older()
+    
+    #Inserts rows (newest first) at the top or at the bottom of the tree
+    def insert_rows(self, rows: list, index: int | str):
+        for row in (reversed(rows) if index == 0 else rows):
+            tag = 'evenrow' if row[0] % 2 == 0 else 'oddrow'
+            self.tree.insert('', index, iid=str(row[0]), values=row[1:], tags=(tag,))
+    
+    #Scrollbar callback of the tree
+    def on_scroll(self, first: str, last: str):
+        self.scrollbar.set(first, last)
+        if self.loading:
+            return
+        if float(last) > 0.9 and self.has_older:
+            self.loading = True
+            self.after_idle(self.load_older)
+        elif float(first) < 0.1 and self.has_newer:
+            self.loading = True
+            self.after_idle(self.load_newer)
+    
+    #Fetches the next page of older transactions in the background
+    def load_older(self):
+        oldest_id = self.oldest_id
+        self.loading_label.place(relx=0.5, rely=0.5, anchor='center')
+        run_query(self, lambda backend: backend.fetch_older(oldest_id), self.add_older, self.load_failed)
+    
+    #Fetches the previous page of newer transactions in the background
+    def load_newer(self):
+        newest_id = cast(int, self.newest_id)
+        self.loading_label.place(relx=0.5, rely=0.5, anchor='center')
+        run_query(self, lambda backend: backend.fetch_newer(newest_id), self.add_newer, self.load_failed)
+    
+    #A page could not be read: the rows shown stay, showing the page again starts over
+    def load_failed(self, error: BaseException):
+        self.loading_label.place_forget()
+        self.loading = False
+        self.stale = True
+        messagebox.showerror("Transactions", f"The transactions could not be loaded: {error}")#type: ignore
+    
+    #Appends a page of older transactions and drops pages from the top
+    def add_older(self, rows: list):
+        self.loading_label.place_forget()
+        self.has_older = len(rows) == transactions.PAGE_SIZE
+        if rows:
+            top = self.first_visible()
+            self.insert_rows(rows, 'end')
+            self.oldest_id = rows[-1][0]
+            if self.newest_id is None:
+                self.newest_id = rows[0][0]
+            children = self.tree.get_children()
+            extra = len(children) - self.MAX_ROWS
+            if extra > 0:
+                self.tree.delete(*children[:extra])
+                self.newest_id = int(children[extra])
+                self.has_newer = True
+                self.scroll_to(top - extra)
+        self.loading = False
+    
+    #Prepends a page of newer transactions and drops pages from the bottom
+    def add_newer(self, rows: list):
+        self.loading_label.place_forget()
+        self.has_newer = len(rows) == transactions.PAGE_SIZE
+        if rows:
+            top = self.first_visible()
+            self.insert_rows(rows, 0)
+            self.newest_id = rows[0][0]
+            children = self.tree.get_children()
+            extra = len(children) - self.MAX_ROWS
+            if extra > 0:
+                self.tree.delete(*children[-extra:])
+                self.oldest_id = int(children[-extra - 1])
+                self.has_older = True
+            self.scroll_to(top + len(rows))
+        self.loading = False
+    
+    #Index of the first row in view
+    def first_visible(self) -> int:
+        return int(float(self.tree.yview()[0]) * len(self.tree.get_children()))
+    
+    #Keeps the same rows in view after rows were added or removed above them
+    def scroll_to(self, index: int):
+        count = len(self.tree.get_children())
+        if count:
+            self.tree.yview_moveto(max(0, index) / count)
+        
+class PricePage(tk.Frame):
+    # Row colours of the price trees, one per fuel type in turn
+    TAG_COLOURS = ("#c6ccc6", "#949994", "#797D79")
+    
+    def __init__(self, parent: tk.Frame):
+        super().__init__(parent, bg='#91C4EE', bd=2, relief='solid')
+        # Per-liter and per-100-liter price Names of every fuel type the station sells
+        fuels = pump_registry.forecourt().fuels
+        self.names = list(fuels.values())
+        self.names100 = [f"{name}100" for name in self.names]
+        # (fuel_type_id, price Name) changed by each row of the center frame
+        self.prices = [(fuel_type_id, name) for fuel_type_id, name in fuels.items()]
+        self.prices += [(fuel_type_id, f"{name}100") for fuel_type_id, name in fuels.items()]
+        
+        # Main container for centering content
+        self.container = tk.Frame(self, bg='#91C4EE')
+        self.container.pack(fill='both', expand=True)
+        
+        # Left frame (west)
+        self.Current_Liter_Price = tk.Frame(self.container, bg="#ffffff", width=300, height=600,bd=2, relief='solid')
+        self.Current_Liter_Price.pack(side='left', fill='y', padx=(50, 50), pady=30)
+        
+        self.tree_frame = tk.Frame(self.Current_Liter_Price, bg="#c1c9cb")
+        self.tree_frame.pack(fill='both', expand=True)
+    
+        self.style:ttk.Style = ttk.Style()
+        self.style.theme_use('alt')
+        self.style.configure("Custom.Treeview", #type: ignore
+                        background="white",
+                        foreground="black",
+                        rowheight=25,
+                        fieldbackground="white") 
+
+        #setup columns
+        self.columns = ('Fuel_type', 'Price', 'Effective_Date')
+        
+        # Create Treeview
+        self.price_tree = ttk.Treeview(
+            self.tree_frame,
+            columns = self.columns,
+            selectmode='browse',
+            show='headings',
+            height=15,
+            style = "Custom.Treeview",
+        )
+        for col in self.columns:
+            self.price_tree.heading(col, text=col, anchor='w')
+            self.price_tree.column(col, anchor='w', width=100)
+        self.price_tree.pack(side='left', fill='y', expand=True, padx =5, pady = 5)
+        
+        self.tree_scroll = ttk.Scrollbar(self.tree_frame, orient='vertical', command= self.price_tree.yview)# type: ignore
+        self.price_tree.configure(yscroll= self.tree_scroll.set)# type: ignore
+        self.tree_scroll.pack(side='left', fill='y')        
+    
+        self.style.map('Custom.Treeview', background=[('selected', "#627595")])#type: ignore
+        
+        self.refresh()
+        
+        for index, name in enumerate(self.names):
+            self.price_tree.tag_configure(name, background=self.TAG_COLOURS[index % len(self.TAG_COLOURS)])
+
+        #============================================================================================================
+        # Center frame
+        self.EditPriceFrame = tk.Frame(
+            self.container, 
+            bg="#3498db", 
+            width=650, 
+            height=600,
+            bd=0,
+            relief='flat',
+            highlightthickness=1,
+            highlightbackground="#D1E0FF",
+            highlightcolor="#D1E0FF",
+            padx=15,
+            pady=15
+            )
+        self.EditPriceFrame.pack(side='left', fill='both', expand=True, padx=(0, 20), pady=30)
+        
+        self.widgets = [(f"{name}_Norm_Row", f"{name.lower()}norm_button", f"{name.lower()}normentry", number, f"{name} Change Price")
+                        for number, name in enumerate(self.names, start=1)]
+        self.widgets += [(f"{name}100_Row", f"{name.lower()}100button", f"{name.lower()}100entry", number, f"{name} 100L Change Price")
+                         for number, name in enumerate(self.names, start=len(self.names) + 1)]
+        self.dummy_focus = tk.Frame(self)
+        self.dummy_focus.place(x=0, y=0, width=1, height=1)
+        
+    
+        # Configure grid layout with better spacing
+        for r in range(len(self.widgets)):
+            self.EditPriceFrame.grid_rowconfigure(r, weight=1)
+            self.EditPriceFrame.grid_columnconfigure(0, weight=1)
+            # Modern card-like row design
+            row = tk.Frame(
+                self.EditPriceFrame, 
+                bg="#ecf0f1", 
+                bd=0,
+                highlightthickness=1,
+                highlightbackground="#F0F5FF",
+                highlightcolor="#F0F5FF",
+                padx=10,
+                pady=5
+            )
+            row.grid(row=r, column=0, sticky="nsew", padx=5, pady=8)
+            row.grid_propagate(False)
+            row_name = self.widgets[r][0]
+            setattr(self, row_name, row)
+    
+        # Styled button and entry widgets
+        for row_name, buttonname, entryname, button_number, text in self.widgets:
+            # Modern button design
+            button = tk.Button(
+            getattr(self, row_name),
+            text=text,
+            bg="#4A7EFF", 
+            fg='white',
+            font=("Segoe UI", 11, "bold"),
+            bd=0,
+            command=lambda n=button_number: self.Onclick(n, self.widgets[n-1][2]),
+            padx=15,
+            pady=8,
+            relief='flat',
+            cursor="hand2",
+            activebackground="#3460CC",
+            activeforeground="white",
+            height=1,
+            width=20
+        )
+            button.pack(side='left', fill='y', padx=(10, 5), pady=10)
+            setattr(self, buttonname, button)
+        
+            # Modern entry design
+            entry = ttk.Entry(
+                getattr(self, row_name),
+                width=15,
+                font=("Segoe UI", 14),
+                state='disabled',
+                justify='center'
+            )
+            # Style configuration for entry
+            style = ttk.Style()
+            style.configure("Modern.TEntry", #type: ignore
+                        fieldbackground="#F8FAFF", 
+                        foreground="#333333",
+                        bordercolor="#D1E0FF",
+                        lightcolor="#D1E0FF",
+                        darkcolor="#D1E0FF",
+                        padding=(10, 8, 10, 8))
+            style.map("Modern.TEntry", #type: ignore
+                 fieldbackground=[("disabled", "#F8FAFF")],
+                 foreground=[("disabled", "#4A4A4A")])
+        
+            entry.configure(style="Modern.TEntry")
+            entry.pack(side='right', fill='both', expand=True, padx=(5, 15), pady=10)
+            setattr(self, entryname, entry)
+
+        # Right frame (east)
+        self.Current_100L_Price = tk.Frame(
+            self.container, 
+            bg="#ffffff", 
+            width=300, 
+            height=600,
+            bd=2, 
+            relief='solid'
+        )
+        self.Current_100L_Price.pack(side='left', fill='y', padx=(50, 50), pady=30)
+        
+        self.tree100_frame = tk.Frame(self.Current_100L_Price, bg="#c1c9cb")
+        self.tree100_frame.pack(fill='both', expand=True)
+        
+        self.columns100 = ('Fuel_type', 'Price', 'Effective_Date')
+        # Create Treeview
+        self.price100_tree = ttk.Treeview(
+            self.tree100_frame,
+            columns = self.columns,
+            selectmode='browse',
+            show='headings',
+            height=15,
+            style = "Custom.Treeview",
+        )
+        for col in self.columns100:
+            self.price100_tree.heading(col, text=col, anchor='w')
+            self.price100_tree.column(col, anchor='w', width=100)
+        self.price100_tree.pack(side='left', fill='y', expand=True, padx =5, pady = 5)
+        
+        self.tree100_scroll = ttk.Scrollbar(self.tree100_frame, orient='vertical', command= self.price100_tree.yview)# type: ignore
+        self.price100_tree.configure(yscroll= self.tree100_scroll.set)# type: ignore
+        self.tree100_scroll.pack(side='left', fill='y')        
+    
+        self.style.map('Custom.Treeview', background=[('selected', "#627595")])#type: ignore
+        
+        self.refresh100()
+        
+        for index, name in enumerate(self.names100):
+            self.price100_tree.tag_configure(name, background=self.TAG_COLOURS[index % len(self.TAG_COLOURS)])
+        
+        self.bind_all("<Button-1>", self.remove_focus)
+        self.selected = 0
+        self.selected100 = 0
+    
+    #Method on the right side scrollbar
+    def refresh100(self):
+        for item in self.price100_tree.get_children():
+            self.price100_tree.delete(item)
+            
+        rows = station.current().price_history(self.names100)
+        for values in rows:
+            self.price100_tree.insert('', 'end', values=values, tags=(values[0],))  
+    
+    #Method on the left side scrollbar
+    def refresh(self):
+        for item in self.price_tree.get_children():
+            self.price_tree.delete(item)
+            
+        rows = station.current().price_history(self.names)
+        for values in rows:
+            self.price_tree.insert('', 'end', values=values, tags=(values[0],))  
+    
+    # Functionality when buttons are clicked    
+    def Onclick(self, button_number: int, entryname: str):
+        getattr(self, entryname).config(state ='normal')
+        getattr(self, entryname).focus_set()
+        #print(f"Clicked {button_number}", entryname)
+        self.clear(entryname)
+        self.disable(entryname)
+        value = getattr(self, entryname).get()
+        self.getvalue(value, button_number)
+               
+    #function to get values
+    def getvalue(self, value: str, number: int):
+        #this is the number of the row: the per-liter price of each fuel type,
+        #then the per-100-liter prices in the same order (see self.prices)
+        
+        number_id: int = number
+        
+        #try except to add values if they are appropriate and reject if not
+        try:
+            volumechange = float(value)
+            print(f"value of {volumechange} is added")
+            print(type(volumechange))
+            self.clear(None)
+            try:
+                if self.dummy_focus.winfo_exists():
+                    self.dummy_focus.focus_set()
+            except tk.TclError:
+                pass      
+            self.addvalue(volumechange, number_id)
+        except ValueError as e:
+            print(f"{e}")
+    
+    #clear each textbox
+    def clear(self, widget: str | None):
+        for textbox in self.widgets: 
+            if textbox[2] != widget:
+                getattr(self, textbox[2]).delete(0,tk.END)  
+     
+    #disable each textbox              
+    def disable(self, widget: str):
+        for textbox in self.widgets: 
+            if textbox[2] != widget:
+                getattr(self, textbox[2]).config(state = 'disabled')  
+    
+    #add value to database            
+    def addvalue(self, value: float, number_id: int):
+        #passing values from other function
+        fuel_type_id, Name = self.prices[number_id - 1]
+        try:
+            station.current().add_price(fuel_type_id, Name, value)
+        except (ConnectionError, RemoteError) as error:
+            messagebox.showerror("Set Price", f"The {Name} price was not changed: {error}")#type: ignore
+            return
+        events.publish(events.PRICES)
+        self.refresh()
+        self.refresh100()
+    
+    #remove focus    
+    def remove_focus(self, event: tk.Event):
+        widget = event.widget
+        if not isinstance(widget, ttk.Entry):
+            try:
+                if self.selected: 
+                    self.refresh()
+                    self.selected = 0
+                if self.selected100:
+                    self.refresh100()
+                    self.selected100 = 0
+                if self.dummy_focus.winfo_exists():
+                    self.dummy_focus.focus_set()
+                    self.selected = self.price_tree.focus()
+                    self.selected100 = self.price100_tree.focus()
+            except tk.TclError:
+                pass               
+                
+class DeliveryPage(tk.Frame):
+    def __init__(self, parent:tk.Frame):
+        super().__init__(parent, bg='white')
+        tk.Label(self, text="Delivery Content").pack()
+
+# Admin-only summary of the profiler: percentiles per statement or page and
+# the slowest single calls, read from memory (the full history is in the log)
+class DiagnosticsPage(tk.Frame):
+    SLOWEST = 50
+    
+    def __init__(self, parent: tk.Frame):
+        super().__init__(parent, bg='white')
+        
+        header = tk.Frame(self, bg='white')
+        header.pack(fill='x', padx=10, pady=(10, 0))
+        self.status = tk.Label(header, bg='white', fg="#2c3e50", font=("Segoe UI", 11), anchor='w')
+        self.status.pack(side='left', fill='x', expand=True)
+        for text, command in (("Refresh", self.refresh), ("Clear", self.clear)):
+            tk.Button(header, text=text, command=command, bg='#3498db', fg='white',
+                      font=("Segoe UI", 10, "bold"), cursor="hand2", padx=10).pack(side='right', padx=5)
+        
+        self.summary_tree = self.make_tree("Percentiles", ('Kind', 'Count', 'p50 ms', 'p95 ms', 'p99 ms', 'Max ms', 'Statement / page'))
+        self.slowest_tree = self.make_tree(f"Slowest {self.SLOWEST}", ('Kind', 'ms', 'Rows', 'Thread', 'Time', 'Statement / page'))
+        self.refresh()
+    
+    def make_tree(self, title: str, columns: tuple) -> ttk.Treeview:
+        tk.Label(self, text=title, bg='white', fg="#2c3e50", font=("Segoe UI", 12, "bold"), anchor='w').pack(fill='x', padx=10, pady=(10, 0))
+        frame = tk.Frame(self, bg='white')
+        frame.pack(fill='both', expand=True, padx=10, pady=5)
+        tree = ttk.Treeview(frame, columns=columns, show='headings', height=8)
+        for col in columns:
+            tree.heading(col, text=col, anchor='w')
+            tree.column(col, anchor='w', width=600 if col == columns[-1] else 80, stretch=col == columns[-1])
+        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview) #type: ignore
+        tree.configure(yscroll=scrollbar.set) # type: ignore
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        return tree
+    
+    def refresh(self):
+        self.status.config(text=f"{len(profiler.samples)} samples in memory, full log: {profiler.log_path}")
+        self.summary_tree.delete(*self.summary_tree.get_children())
+        for kind, name, count, p50, p95, p99, worst in profiler.summary():
+            self.summary_tree.insert('', 'end', values=(kind, count, f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}", f"{worst:.2f}", name))
+        self.slowest_tree.delete(*self.slowest_tree.get_children())
+        for sample in profiler.slowest(self.SLOWEST):
+            at = datetime.datetime.fromtimestamp(sample.at).strftime("%H:%M:%S")
+            self.slowest_tree.insert('', 'end', values=(sample.kind, f"{sample.ms:.2f}", sample.rows, sample.thread, at, " ".join(sample.name.split())))
+    
+    def clear(self):
+        profiler.clear()
+        self.refresh()
+
+# Admin-only export of transactions, shifts or price history to CSV, .csv.gz
+# or Excel. The export runs on its own thread and connection, so a
+# multi-year file neither freezes the window nor holds up the other pages.
+class ExportPage(tk.Frame):
+    DATASETS = {"Transactions": "transactions", "Shifts": "shifts", "Price history": "prices"}
+    FORMATS = {"CSV": "csv", "CSV (gzip)": "csv.gz", "Excel": "xlsx"}
+    ALL = "All"
+    
+    def __init__(self, parent: tk.Frame):
+        super().__init__(parent, bg='white')
+        self.pumps: Dict[str, int] = {}
+        self.fuels: Dict[str, int] = {}
+        self.rows_written = 0
+        self.outcome: "int | BaseException | None" = None
+        self.worker: threading.Thread | None = None
+        
+        form = tk.Frame(self, bg='white')
+        form.pack(anchor='nw', padx=30, pady=30)
+        self.dataset = self.combobox(form, 0, "Export", list(self.DATASETS))
+        self.start = self.entry(form, 1, "From (YYYY-MM-DD)")
+        self.end = self.entry(form, 2, "To (YYYY-MM-DD, included)")
+        self.pump = self.combobox(form, 3, "Pump", [self.ALL])
+        self.fuel = self.combobox(form, 4, "Fuel type", [self.ALL])
+        self.shift = self.entry(form, 5, "Shift ID")
+        self.format = self.combobox(form, 6, "Format", list(self.FORMATS))
+        
+        self.export_button = tk.Button(form, text="Export...", command=self.export, bg='#3498db', fg='white',
+                                       font=("Segoe UI", 10, "bold"), cursor="hand2", padx=10)
+        self.export_button.grid(row=7, column=1, sticky='w', pady=(15, 0))
+        self.status = tk.Label(form, bg='white', fg="#2c3e50", font=("Segoe UI", 11), anchor='w')
+        self.status.grid(row=8, column=0, columnspan=2, sticky='w', pady=(10, 0))
+        run_query(self, lambda backend: self.load_choices(backend.connection()), self.show_choices,
+                  self.choices_failed)
+    
+    def combobox(self, parent: tk.Frame, row: int, text: str, values: list) -> ttk.Combobox:
+        tk.Label(parent, text=text, bg='white', font=("Segoe UI", 11), anchor='w').grid(row=row, column=0, sticky='w', padx=(0, 15), pady=4)
+        box = ttk.Combobox(parent, values=values, state='readonly', width=28, font=("Segoe UI", 11))
+        box.current(0)
+        box.grid(row=row, column=1, sticky='w', pady=4)
+        return box
+    
+    def entry(self, parent: tk.Frame, row: int, text: str) -> ttk.Entry:
+        tk.Label(parent, text=text, bg='white', font=("Segoe UI", 11), anchor='w').grid(row=row, column=0, sticky='w', padx=(0, 15), pady=4)
+        box = ttk.Entry(parent, width=30, font=("Segoe UI", 11))
+        box.grid(row=row, column=1, sticky='w', pady=4)
+        return box
+    
+    @staticmethod
+    def load_choices(conn) -> tuple:
+        pumps = conn.execute('SELECT pump_label, pump_id FROM pump ORDER BY pump_id').fetchall()
+        fuels = conn.execute('SELECT fuel_name, fuel_type_id FROM fuel_type ORDER BY fuel_type_id').fetchall()
+        return pumps, fuels
+    
+    # Without the pumps and fuel types only the unfiltered export is offered
+    def choices_failed(self, error: BaseException):
+        self.status.config(text=f"Pumps and fuel types could not be loaded: {error}")
+        messagebox.showerror("Export", f"Pumps and fuel types could not be loaded: {error}")#type: ignore
+    
+    def show_choices(self, choices: tuple):
+        self.pumps, self.fuels = dict(choices[0]), dict(choices[1])
+        self.pump.config(values=[self.ALL, *self.pumps])
+        self.fuel.config(values=[self.ALL, *self.fuels])
+    
+    # Reads the form; shows what is wrong and returns None if it can't be used
+    def read_filter(self) -> exporter.ExportFilter | None:
+        try:
+            start = datetime.date.fromisoformat(self.start.get().strip()) if self.start.get().strip() else None
+            end = datetime.date.fromisoformat(self.end.get().strip()) if self.end.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Export", "Dates must look like 2025-07-31.")#type: ignore
+            return None
+        shift = self.shift.get().strip()
+        if shift and not shift.isdigit():
+            messagebox.showerror("Export", "The shift ID must be a number.")#type: ignore
+            return None
+        return exporter.ExportFilter(
+            start=start,
+            end=end + datetime.timedelta(days=1) if end else None,
+            pump_id=self.pumps.get(self.pump.get()),
+            fuel_type_id=self.fuels.get(self.fuel.get()),
+            shift_id=int(shift) if shift else None,
+        )
+    
+    def export(self):
+        if self.worker is not None:
+            return
+        filters = self.read_filter()
+        if filters is None:
+            return
+        dataset = self.DATASETS[self.dataset.get()]
+        fmt = self.FORMATS[self.format.get()]
+        ending = exporter.FORMATS[fmt]
+        path = filedialog.asksaveasfilename(parent=self, title="Export", defaultextension=ending,
+                                            initialfile=f"{dataset}{ending}",
+                                            filetypes=[(self.format.get(), f"*{ending}")])
+        if not path:
+            return
+        self.rows_written = 0
+        self.outcome = None
+        self.export_button.config(state='disabled')
+        self.worker = threading.Thread(target=self.run_export, args=(dataset, path, filters, fmt),
+                                       name="export", daemon=True)
+        self.worker.start()
+        self.poll_export(path)
+    
+    # On the export thread: no Tk calls, only the two fields poll_export reads
+    def run_export(self, dataset: str, path: str, filters: exporter.ExportFilter, fmt: str):
+        conn = connect()
+        try:
+            self.outcome = exporter.export(conn, dataset, path, filters, fmt, self.set_progress)
+        except BaseException as error:
+            self.outcome = error
+        finally:
+            conn.close()
+    
+    def set_progress(self, rows: int):
+        self.rows_written = rows
+    
+    def poll_export(self, path: str):
+        if not self.winfo_exists():
+            return
+        if self.worker is not None and self.worker.is_alive():
+            self.status.config(text=f"Exporting... {self.rows_written:,} rows")
+            self.after(200, self.poll_export, path)
+            return
+        self.worker = None
+        self.export_button.config(state='normal')
+        if isinstance(self.outcome, BaseException):
+            self.status.config(text="Export failed.")
+            messagebox.showerror("Export", f"Export failed:\n{self.outcome}")#type: ignore
+        else:
+            self.status.config(text=f"Exported {self.outcome:,} rows to {path}")
+
+class InventoryPage(tk.Frame):
+    depends_on = (events.TRANSACTIONS,)
+    stale = False
+    
+    def __init__(self, parent:tk.Frame):
+        super().__init__(parent, bg='#91C4EE')
+        self.load()
+    
+    # All figures come from one report, read in the background
+    def load(self):
+        self.loading_label = loading_label(self)
+        run_query(self, lambda backend: backend.inventory_report(), self.show_report, self.load_failed)
+    
+    # Called when the page is shown again; rebuilds the columns if new sales were recorded
+    def refresh(self):
+        if not self.stale:
+            return
+        self.stale = False
+        self.load()
+    
+    # Showing the page again tries once more
+    def load_failed(self, error: BaseException):
+        self.loading_label.destroy()
+        self.stale = True
+        messagebox.showerror("Inventory", f"The inventory report could not be loaded: {error}")#type: ignore
+    
+    # One column per fuel type, replacing whatever was shown before
+    def show_report(self, report: reporting.InventoryReport):
+        for widget in self.winfo_children():
+            widget.destroy()
+        for fuel in report.fuels:
+            self.fuel_column(fuel)
+    
+    # Builds the header, income and volume panels of one fuel type
+    def fuel_column(self, fuel: reporting.FuelReport):
+        column_frame = tk.Frame(self, bg = '#ffffff', width = 500, height = 600, bd = 2, relief = 'solid')
+        column_frame.pack(side = 'left', fill = 'y', padx = 10, pady = 10)
+        
+        # Top frame with the stylish fuel label and decorative elements
+        upper_frame = tk.Frame(column_frame, bg = "#2c3e50", width = 500, height = 100, bd = 0, relief = 'flat')
+        upper_frame.pack(side = 'top', fill = 'x')
+        container = tk.Frame(upper_frame, bg="#3498db", bd=0, highlightthickness=0,height=80)
+        container.pack(side='top', fill='x', padx=10, pady=10, expand=True)
+        tk.Frame(container, bg="#56e73c", width=100, height=80).pack(side='left', fill='y')
+        tk.Label(container, text=fuel.fuel_name.upper(), bg="#3498db",  fg="white", font=('Segoe UI', 28, 'bold'), padx=20).pack(side='left', fill='both', expand=True)
+        accent_frame = tk.Frame(container, bg="#3498db", width=50)
+        accent_frame.pack(side='right', fill='y')
+        tk.Label(accent_frame, text="⛽", bg="#3498db",fg="white",font=('Segoe UI', 28)).pack()
+        
+        # Lower frame split in an income half and a volume half
+        lower_frame = tk.Frame(column_frame, bg = "#e1e9ea", width = 500, height = 500)
+        lower_frame.pack(side = 'top', fill = 'both', expand=True)
+        lower_frame.grid_rowconfigure(0, weight=1)
+        lower_frame.grid_columnconfigure(0, weight=1)
+        lower_frame.grid_columnconfigure(1, weight=1)
+        income_frame = self.half_frame(lower_frame, 0)
+        volume_frame = self.half_frame(lower_frame, 1)
+        
+        #puts the income information into the labels
+        income_rows = [
+            ("Daily Income", fuel.income["day"]),
+            ("Weekly Income", fuel.income["week"]),
+            ("Monthly Income", fuel.income["month"]),
+            ("Yearly Income", fuel.income["year"]),
+            ("Lifetime Income", fuel.income["lifetime"]),
+        ]
+        for row, (title, income) in enumerate(income_rows):
+            self.stat_label(income_frame, row, f"{title} \n-------------------------------\n₱{income}")
+        
+        #puts the lifetime and daily volume of each pump into the labels
+        volume_rows = [(f"Lifetime Volume Pump {number}", fuel.lifetime_volume[pump_id])
+                       for number, pump_id in enumerate(fuel.pump_ids, start=1)]
+        volume_rows += [(f"Daily Volume Pump {number}", fuel.daily_volume[pump_id])
+                        for number, pump_id in enumerate(fuel.pump_ids, start=1)]
+        for row, (title, volume) in enumerate(volume_rows):
+            self.stat_label(volume_frame, row, f"{title}\n------------------------------\n{volume} Liters")
+    
+    # Half of a lower frame holding a column of labels
+    def half_frame(self, parent: tk.Frame, column: int) -> tk.Frame:
+        frame = tk.Frame(parent, bg = "#91C4EE", width = 250, height = 500, bd = 2, relief='solid')
+        frame.grid(row = 0, column = column, sticky='nsew')
+        frame.grid_propagate(False)
+        frame.columnconfigure(0, weight= 1)
+        return frame
+    
+    # Label showing one figure
+    def stat_label(self, parent: tk.Frame, row: int, text: str):
+        label = tk.Label(parent,
+                         text = text,
+                         fg = "#131414",
+                         bg = '#3498db',
+                         font=("Segoe UI", 14)
+                        )
+        label.grid(row=row, column=0, sticky="nsew", pady=7)
@@ -0,0 +1,355 @@
+# Maintenance commands that run without the GUI.
+#
+# Run from the repository root, e.g.:
+#     python Inventory_Management/manage.py migrate
+#     python Inventory_Management/manage.py backfill-rollups
+#     python Inventory_Management/manage.py cache-icons
+#     python Inventory_Management/manage.py report --from 2025-03-01 --to 2025-04-01 --by week --group fuel
+#     python Inventory_Management/manage.py import-sales history.csv
+#     python Inventory_Management/manage.py export transactions sales-2024.csv.gz --from 2024-01-01 --to 2025-01-01
+#     python Inventory_Management/manage.py archive 2022 2023 --compress
+#     python Inventory_Management/manage.py serve --listen 0.0.0.0:8757
+#     python Inventory_Management/manage.py pumps --add "Diesel 3" --fuel Diesel
+#     python Inventory_Management/manage.py rejected-sales
+import argparse
+import csv
+import datetime
+import getpass
+import json
+import sys
+import time
+
+from core import archive, db, exporter, importer, journal, migrations, protocol, pumps, reporting, rollups, schema
+
+# Brings the schema to the latest version. A new database is seeded (admin
+# password, prices) by the app or `serve` on their first start.
+def cmd_migrate(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    before = migrations.current_version(conn)
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        after = migrations.migrate(cursor)
+    print(f"Schema version {before} -> {after}")
+    return 0
+
+# Recomputes the Inventory rollups from the whole transactions table and the archived years
+def cmd_backfill_rollups(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    archived = archive.daily_totals(conn)   # attaching is not allowed inside the transaction
+    with db.transaction(conn) as cursor:
+        count = rollups.backfill(cursor, archived)
+    print(f"Rebuilt {count} rollup rows")
+    return 0
+
+# Writes the pre-resized icons the app reads without decoding the originals
+def cmd_cache_icons(args: argparse.Namespace) -> int:
+    from assets import AssetRegistry
+
+    count = AssetRegistry(args.dir).write_cache()
+    print(f"Wrote {count} icons to {args.dir}")
+    return 0
+
+# Sales per bucket and group over a date range, as a table, CSV or JSON
+def cmd_report(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    series = reporting.time_series(conn, args.start, args.end, args.by, args.group)
+    values = series.series(args.metric)
+    groups = list(series.groups)
+    if args.format == "json":
+        json.dump({
+            "from": args.start.isoformat(), "to": args.end.isoformat(),
+            "granularity": series.granularity, "group_by": series.group_by, "metric": args.metric,
+            "buckets": series.labels,
+            "groups": [{"id": group, "label": series.groups[group], "values": values[group]} for group in groups],
+        }, sys.stdout, indent=2)
+        print()
+        return 0
+
+    header = [series.granularity] + [series.groups[group] for group in groups] + ["Total"]
+    rows = []
+    for index, label in enumerate(series.labels):
+        row = [values[group][index] for group in groups]
+        rows.append([label] + row + [sum(row)])
+    totals = [sum(values[group]) for group in groups]
+    rows.append(["Total"] + totals + [sum(totals)])
+    if args.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(header)
+        writer.writerows(rows)
+        return 0
+
+    number = "{:,.0f}" if args.metric == "sales" else "{:,.2f}"
+    cells = [header] + [[row[0]] + [number.format(value) for value in row[1:]] for row in rows]
+    widths = [max(len(str(line[column])) for line in cells) for column in range(len(header))]
+    for line in cells:
+        print("  ".join(str(cell).ljust(width) if column == 0 else str(cell).rjust(width)
+                        for column, (cell, width) in enumerate(zip(line, widths))))
+    return 0
+
+# Streams the sales of a CSV or XLSX file into the database, resuming an interrupted run
+def cmd_import_sales(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    row = conn.execute('SELECT user_id FROM users WHERE username = ?', (args.user,)).fetchone()
+    if row is None:
+        print(f"No user {args.user!r}", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    first = None
+
+    def progress(result: importer.ImportResult, fraction: float) -> None:
+        nonlocal first
+        if first is None:
+            first = result.resumed_from
+        rate = (result.rows - first) / max(time.perf_counter() - started, 1e-9)
+        print(f"\r{fraction:6.1%}  {result.rows:,} rows read  {result.imported:,} imported  "
+              f"{result.skipped:,} skipped  {rate:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        result = importer.import_sales(conn, args.path, sheet=args.sheet, user_id=row[0],
+                                       chunk_size=args.chunk_size, skip_invalid=args.skip_invalid,
+                                       again=args.again, progress=progress)
+    except ValueError as error:
+        print(file=sys.stderr)
+        print(error, file=sys.stderr)
+        if isinstance(error, importer.InvalidRow):
+            print("The rows before it are saved. Fix the row (or use --skip-invalid) and run "
+                  "the same command again to continue from it.", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    if result.resumed_from:
+        print(f"Resumed after row {result.resumed_from:,}")
+    print(f"Imported {result.imported:,} sales, skipped {result.skipped:,} invalid rows, "
+          f"created {result.shifts_created:,} import shifts")
+    for message in result.errors:
+        print(f"  {message}")
+    if result.skipped > len(result.errors):
+        print(f"  ... and {result.skipped - len(result.errors):,} more")
+    return 0
+
+# Streams transactions, shifts or price history to a CSV, .csv.gz or .xlsx file
+def cmd_export(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    filters = exporter.ExportFilter(args.start, args.end, shift_id=args.shift)
+    if args.pump is not None:
+        row = conn.execute('SELECT pump_id FROM pump WHERE pump_label = ? OR pump_id = ?',
+                           (args.pump, args.pump)).fetchone()
+        if row is None:
+            print(f"No pump {args.pump!r}", file=sys.stderr)
+            return 1
+        filters.pump_id = row[0]
+    if args.fuel is not None:
+        row = conn.execute('SELECT fuel_type_id FROM fuel_type WHERE fuel_name = ? OR fuel_type_id = ?',
+                           (args.fuel, args.fuel)).fetchone()
+        if row is None:
+            print(f"No fuel type {args.fuel!r}", file=sys.stderr)
+            return 1
+        filters.fuel_type_id = row[0]
+
+    def progress(rows: int) -> None:
+        print(f"\r{rows:,} rows", end="", file=sys.stderr, flush=True)
+
+    try:
+        count = exporter.export(conn, args.dataset, args.path, filters, args.format, progress)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(f"Wrote {count:,} {args.dataset} rows to {args.path}")
+    return 0
+
+# Moves closed years out to archive files, or lists / compresses / restores them
+def cmd_archive(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    try:
+        for year in args.years:
+            if args.restore:
+                rows = archive.restore_year(conn, year)
+                print(f"Restored {rows:,} sales of {year}")
+            elif args.compress and any(p.year == year for p in archive.partitions(conn)):
+                partition = archive.compress_year(conn, year)
+                print(f"Compressed {year} to {partition.path}")
+            else:
+                start = time.perf_counter()
+                partition = archive.archive_year(conn, year, compress=args.compress)
+                print(f"Archived {partition.rows:,} sales of {year} to {partition.path} "
+                      f"in {time.perf_counter() - start:.1f}s")
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    if args.vacuum:
+        conn.execute("VACUUM")
+        print("Vacuumed the station database")
+    if args.list or not args.years:
+        for partition in archive.partitions(conn):
+            print(f"{partition.year}  {partition.rows:>12,} sales  {partition.income:>16,.2f} income  "
+                  f"{partition.path}  (archived {partition.archived})")
+    return 0
+
+# Asks for a seed price on the console (a new database served without the GUI)
+def ask_price(title: str, message: str) -> float:
+    while True:
+        try:
+            return float(input(f"{message} "))
+        except ValueError:
+            print("Enter a number, e.g. 58.75")
+
+# Owns the database and serves it to the cashier terminals (Mainframe.py --server)
+def cmd_serve(args: argparse.Namespace) -> int:
+    from core.server import StationServer
+
+    schema.setup_database(db.get_connection(), lambda: getpass.getpass("Password for the admin user: "),
+                          ask_price)
+    server = StationServer(args.listen)
+    print(f"Serving {db.DB_PATH} on {server.address} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+# Lists the pumps, or adds one (and its fuel type when the station does not sell it yet)
+def cmd_pumps(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    if args.add:
+        if not args.fuel:
+            print("--add needs --fuel", file=sys.stderr)
+            return 1
+        prices = None
+        if pumps.read(conn).fuel_id(args.fuel) is None:
+            prices = (ask_price("", f"Price per liter of {args.fuel}:"),
+                      ask_price("", f"Price per 100 liters of {args.fuel}:"))
+        try:
+            pump_id = pumps.add_pump(conn, args.add, args.fuel, prices)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+        print(f"Added pump {pump_id} {args.add!r} ({args.fuel}); restart the terminals and the server to show it")
+    for pump in pumps.read(conn).pumps:
+        print(f"{pump.pump_id:>4}  {pump.label:<20} {pump.fuel_name}")
+    return 0
+
+# Acknowledged sales the database refused to store (the journal keeps them aside)
+def cmd_rejected_sales(args: argparse.Namespace) -> int:
+    conn = db.get_connection()
+    if migrations.needs_upgrade(conn):
+        cmd_migrate(args)
+    rejects = journal.rejected_entries(conn)
+    for reject_id, rejected, entry, error in rejects:
+        print(f"{reject_id:>4}  {rejected}  shift {entry['shift_id']}  sold {entry['date']}  {error}")
+        for pump_id, volume, price in entry["sales"]:
+            print(f"        pump {pump_id}  {volume} L  {price:.2f}")
+    print(f"{len(rejects)} rejected sale(s)")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Gas inventory maintenance commands")
+    parser.add_argument("--db", help="database file (default: %(default)s)", default=db.DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("migrate", help="upgrade the database schema").set_defaults(func=cmd_migrate)
+    commands.add_parser(
+        "backfill-rollups", help="rebuild the Inventory rollup tables from all transactions"
+    ).set_defaults(func=cmd_backfill_rollups)
+    icons = commands.add_parser("cache-icons", help="pre-resize the icons into a cache folder")
+    icons.add_argument("--dir", default="images/.cache", help="cache folder (default: %(default)s)")
+    icons.set_defaults(func=cmd_cache_icons)
+
+    today = datetime.date.today()
+    report = commands.add_parser("report", help="sales per hour/day/week/month/year over a date range")
+    report.add_argument("--from", dest="start", type=datetime.date.fromisoformat,
+                        default=today - datetime.timedelta(days=13),
+                        help="first day, YYYY-MM-DD (default: 13 days ago)")
+    report.add_argument("--to", dest="end", type=datetime.date.fromisoformat,
+                        default=today + datetime.timedelta(days=1),
+                        help="day after the last one, YYYY-MM-DD (default: tomorrow)")
+    report.add_argument("--by", choices=reporting.GRANULARITIES, default="day",
+                        help="bucket size, weeks are ISO weeks (default: %(default)s)")
+    report.add_argument("--group", choices=reporting.GROUPINGS, default="pump",
+                        help="one column per (default: %(default)s)")
+    report.add_argument("--metric", choices=reporting.METRICS, default="income",
+                        help="(default: %(default)s)")
+    report.add_argument("--format", choices=("table", "csv", "json"), default="table",
+                        help="(default: %(default)s)")
+    report.set_defaults(func=cmd_report)
+
+    sales = commands.add_parser(
+        "import-sales", help="import historical sales from a CSV or XLSX file",
+        description="Columns are found by header: pump (label or id), volume, date, and "
+                    "optionally price (else priced from the price history), fuel_type "
+                    "(checked against the pump) and shift_id (else the recorded shift "
+                    "at that time, or a new AM/PM import shift).")
+    sales.add_argument("path")
+    sales.add_argument("--sheet", help="worksheet of an .xlsx file (default: the first with the columns)")
+    sales.add_argument("--user", default="admin", help="owner of created import shifts (default: %(default)s)")
+    sales.add_argument("--chunk-size", type=int, default=importer.CHUNK_SIZE,
+                       help="rows per transaction (default: %(default)s)")
+    sales.add_argument("--skip-invalid", action="store_true", help="skip rows that fail validation")
+    sales.add_argument("--again", action="store_true", help="import a file that was already imported")
+    sales.set_defaults(func=cmd_import_sales)
+
+    export = commands.add_parser("export", help="export transactions, shifts or price history")
+    export.add_argument("dataset", choices=exporter.DATASETS)
+    export.add_argument("path", help="output file; the format follows its ending (.csv, .csv.gz, .xlsx)")
+    export.add_argument("--format", choices=list(exporter.FORMATS), help="override the format of the file name")
+    export.add_argument("--from", dest="start", type=datetime.date.fromisoformat, help="first day, YYYY-MM-DD")
+    export.add_argument("--to", dest="end", type=datetime.date.fromisoformat,
+                        help="day after the last one, YYYY-MM-DD")
+    export.add_argument("--pump", help="pump label or id (transactions)")
+    export.add_argument("--fuel", help="fuel name or id (transactions, prices)")
+    export.add_argument("--shift", type=int, help="shift id (transactions, shifts)")
+    export.set_defaults(func=cmd_export)
+
+    years = commands.add_parser(
+        "archive", help="move closed years of sales into archive files",
+        description="Each year goes to its own database in the archive folder next to the "
+                    "station database (or $GAS_INVENTORY_ARCHIVE); reports, the transaction "
+                    "history and exports still read it. Years are archived oldest first "
+                    "and restored newest first.")
+    years.add_argument("years", type=int, nargs="*", help="years to archive (or with --restore, restore)")
+    years.add_argument("--compress", action="store_true",
+                       help="gzip the archive file (an archived year given again is compressed)")
+    years.add_argument("--restore", action="store_true", help="move the years back into the station database")
+    years.add_argument("--vacuum", action="store_true", help="give the freed space back to the file system")
+    years.add_argument("--list", action="store_true", help="list archived years (the default with no years)")
+    years.set_defaults(func=cmd_archive)
+
+    serve = commands.add_parser("serve", help="serve the database to several cashier terminals",
+                                description="Terminals connect with Mainframe.py --server ADDRESS "
+                                            "(or GAS_INVENTORY_SERVER) instead of opening the file.")
+    serve.add_argument("--listen", default=protocol.DEFAULT_ADDRESS,
+                       help="host:port, or unix:/path for a Unix socket (default: %(default)s)")
+    serve.set_defaults(func=cmd_serve)
+
+    station_pumps = commands.add_parser("pumps", help="list the pumps or add one")
+    station_pumps.add_argument("--add", metavar="LABEL", help="label of a new pump, e.g. \"Diesel 3\"")
+    station_pumps.add_argument("--fuel", help="fuel type of the new pump; a new one asks for its prices")
+    station_pumps.set_defaults(func=cmd_pumps)
+
+    commands.add_parser(
+        "rejected-sales", help="list recorded sales the database refused to store"
+    ).set_defaults(func=cmd_rejected_sales)
+    return parser
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    db.set_database_path(args.db)
+    try:
+        return args.func(args)
+    finally:
+        db.close_connection()
+
+if __name__ == "__main__":
+    sys.exit(main())
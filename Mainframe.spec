@@ -0,0 +1,32 @@
+# PyInstaller build of the app:  pyinstaller Mainframe.spec
+#
+# A one-folder build (dist/Mainframe/) rather than --onefile: a one-file
+# executable unpacks its whole archive into a temp folder on every launch,
+# which was most of the frozen app's start time. Run the executable from a
+# folder that holds Databases/ and images/, like the source version.
+import os
+
+app_dir = os.path.join(SPECPATH, "Inventory_Management")
+
+a = Analysis(
+    [os.path.join(app_dir, "Mainframe.py")],
+    pathex=[app_dir],
+    # Imported after the first frame, inside functions
+    hiddenimports=["homepage"],
+    # Standard library parts the app never uses but the analysis pulls in
+    excludes=["asyncio", "multiprocessing", "unittest", "doctest", "pydoc", "pdb",
+              "xmlrpc", "lib2to3", "tkinter.test", "numpy"],
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name="Mainframe",
+    console=True,
+    upx=False,
+)
+coll = COLLECT(exe, a.binaries, a.datas, name="Mainframe", upx=False)
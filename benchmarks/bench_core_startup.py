@@ -0,0 +1,83 @@
+# Import time of the headless core (it must not pull in tkinter or PIL),
+# import time of Mainframe (no database, dialogs or window on import) and
+# the cost of the core service calls the pages make, on a fresh station.
+#
+# Run from the repository root:
+#     python benchmarks/bench_core_startup.py [repeats]      (default 10)
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Inventory_Management")
+sys.path.insert(0, APP_DIR)
+
+CORE_MODULES = "core.auth, core.schema, core.pricing, core.shifts, core.transactions, core.reporting, core.journal"
+
+IMPORT_PROBE = '''
+import sys, time
+start = time.perf_counter()
+import {modules}
+elapsed = time.perf_counter() - start
+gui = sorted(m for m in ("tkinter", "PIL") if m in sys.modules)
+print(elapsed, ",".join(gui) or "-")
+'''
+
+# Imports the modules in a fresh interpreter; returns (seconds, GUI modules that got loaded)
+def import_once(modules: str) -> tuple[float, str]:
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(modules=modules)],
+                         cwd=APP_DIR, capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), out[1]
+
+def time_call(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def services(repeats: int) -> list[tuple[str, float]]:
+    from core import auth, db, reporting, schema, shifts, transactions
+    from core.pricing import price_resolver
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.set_database_path(os.path.join(tmp, "station.db"))
+        conn = db.get_connection()
+        start = time.perf_counter()
+        schema.setup_database(conn, lambda: "admin", lambda title, message: 60.0)
+        results = [("setup_database (new station)", time.perf_counter() - start)]
+        user_id = auth.check_login(conn, "admin", "admin")[1]
+        stamp = shifts.shift_stamp()
+        shift_id = shifts.start_shift(conn, user_id, *stamp)
+        shift_ids = [shift_id]
+
+        def next_shift():
+            shifts.end_shift(conn, shift_ids[-1], stamp[2])
+            shift_ids.append(shifts.start_shift(conn, user_id, *stamp))
+        results += [
+            ("setup_database (up to date)", time_call(lambda: schema.setup_database(conn, str, float), repeats)),
+            ("check_login", time_call(lambda: auth.check_login(conn, "admin", "admin"), repeats)),
+            ("sale_price", time_call(lambda: price_resolver.sale_price("Diesel", 42.0), repeats)),
+            ("record_sales (3 lines)", time_call(
+                lambda: transactions.record_sales(conn, shift_id, [(1, 20.0, 1200.0)] * 3, stamp[2]), repeats)),
+            ("inventory_report", time_call(lambda: reporting.inventory_report(conn), repeats)),
+            ("end_shift + start_shift", time_call(next_shift, repeats)),
+        ]
+        db.close_connection()
+    return results
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for label, modules in (("core", CORE_MODULES), ("Mainframe", "Mainframe")):
+        runs = [import_once(modules) for _ in range(repeats)]
+        median = statistics.median(seconds for seconds, _ in runs)
+        print(f"import {label:<10} {median * 1000:8.1f} ms   GUI modules loaded: {runs[0][1]}")
+    print()
+    for name, seconds in services(repeats):
+        print(f"{name:<32}{seconds * 1000:10.3f} ms")
+
+if __name__ == "__main__":
+    main()
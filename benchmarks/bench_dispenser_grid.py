@@ -0,0 +1,100 @@
+# Construction time of the dispenser grid (DefaultPage) for stations with
+# 6, 24 and 48 pumps: building the page until it is drawn, starting a shift
+# on it (every built panel is enabled and cleared), flipping to a page not
+# seen before and back to one that was, and for comparison building every
+# panel up front the way the grid used to.
+#
+# Needs a display (Tk); run from the repository root:
+#     python benchmarks/bench_dispenser_grid.py [--pumps 6,24,48] [--runs 5]
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "Inventory_Management"))
+
+import datagen  # noqa: E402
+from core import db, pumps  # noqa: E402
+from core.pricing import price_resolver  # noqa: E402
+from core.pumps import pump_registry  # noqa: E402
+
+# A station with count pumps, the extra ones spread over the fuel types
+def make_station(path: str, count: int) -> None:
+    conn = datagen.generate(path, 0, years=0)
+    fuels = list(datagen.PRICES)
+    for number in range(len(datagen.PUMPS) + 1, count + 1):
+        pumps.add_pump(conn, f"Pump {number}", fuels[number % len(fuels)])
+    conn.close()
+
+def timed(root: tk.Tk, action) -> tuple:
+    start = time.perf_counter()
+    result = action()
+    root.update()
+    return (time.perf_counter() - start) * 1000, result
+
+# {measurement: ms} of one page built on a fresh frame
+def measure(root: tk.Tk) -> dict:
+    from homepage import DefaultPage
+
+    frame = tk.Frame(root)
+    frame.pack(fill='both', expand=True)
+    results = {}
+    results["build"], page = timed(root, lambda: DefaultPage(frame))
+    page.pack(fill='both', expand=True)
+    root.update()
+    results["shift_start"], _ = timed(root, lambda: page.refresh(userlogin=True))
+    results["new_page"], _ = timed(root, lambda: page.show_page(1))
+    results["seen_page"], _ = timed(root, lambda: page.show_page(0))
+    results["shift_end"], _ = timed(root, lambda: page.refresh(userlogin=False))
+    frame.destroy()
+
+    # Every panel built, as the grid did before it was paged
+    frame = tk.Frame(root)
+    frame.pack(fill='both', expand=True)
+
+    def build_all():
+        page = DefaultPage(frame)
+        for number in range(1, page.page_count):
+            page.show_page(number)
+        return page
+    results["all_panels"], page = timed(root, build_all)
+    frame.destroy()
+    return results
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Dispenser grid construction time")
+    parser.add_argument("--pumps", default="6,24,48", help="comma-separated pump counts (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        print(f"needs a display: {error}", file=sys.stderr)
+        return 1
+    root.geometry("1400x900")
+    os.chdir(os.path.join(HERE, ".."))     # the icons are found relative to the repository root
+    names = ("build", "shift_start", "new_page", "seen_page", "shift_end", "all_panels")
+    print(f"{'pumps':>6}" + "".join(f"{name + ' ms':>15}" for name in names))
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (int(value) for value in args.pumps.split(",")):
+            path = os.path.join(tmp, f"station_{count}.db")
+            make_station(path, count)
+            db.set_database_path(path)
+            pump_registry.invalidate()
+            price_resolver.invalidate()
+            measure(root)   # warm the icon cache and the imports
+            runs = [measure(root) for _ in range(args.runs)]
+            print(f"{count:>6}" + "".join(f"{statistics.median(run[name] for run in runs):>15.1f}"
+                                          for name in names))
+            db.close_connection()
+    root.destroy()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
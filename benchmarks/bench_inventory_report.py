@@ -0,0 +1,61 @@
+# Inventory page figures on a large synthetic history: the per-fuel
+# strftime/GROUP BY queries InventoryPage used to run against
+# core.reporting.inventory_report().
+#
+# Run from the repository root:
+#     python benchmarks/bench_inventory_report.py [rows]      (default 5,000,000)
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen  # noqa: E402
+from core import reporting  # noqa: E402
+
+FUEL_PUMPS = [(1, 2), (3, 4, 5), (6,)]
+
+# The queries the old InventoryPage ran for each fuel type
+def legacy_queries(pump_ids: tuple) -> list[str]:
+    income = " or ".join(f"pump_id = {p}" for p in pump_ids)
+    volumes = ", ".join(f"SUM(CASE WHEN pump_id = {p} THEN volume ELSE 0 END)" for p in pump_ids)
+    queries = [
+        f'''SELECT strftime('{fmt}', Date) as Bucket,
+            SUM(CASE WHEN {income} THEN price ELSE 0 END)
+            FROM transactions GROUP BY Bucket ORDER BY Bucket DESC LIMIT 1'''
+        for fmt in ("%Y-%d", "%Y-%W", "%Y-%m", "%Y")
+    ]
+    queries.append(f"SELECT SUM(CASE WHEN {income} THEN price ELSE 0 END) FROM transactions")
+    queries.append(f"SELECT {volumes} FROM transactions")
+    queries.append(f'''SELECT strftime('%Y-%m-%d', Date) AS Bucket, {volumes}
+        FROM transactions GROUP BY Bucket ORDER BY Bucket DESC LIMIT 1''')
+    return queries
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        conn = datagen.generate(os.path.join(tmp, "bench.db"), rows)
+        print(f"generated {rows:,} transactions in {time.perf_counter() - start:.1f}s (includes rollup backfill)")
+
+        queries = [q for pumps in FUEL_PUMPS for q in legacy_queries(pumps)]
+        legacy = timed(lambda: [conn.execute(q).fetchone() for q in queries])
+        # The periods around the newest generated sale, not today's (the history ends earlier)
+        last_day = datetime.date.fromisoformat(
+            conn.execute('SELECT substr(MAX(Date), 1, 10) FROM transactions').fetchone()[0])
+        engine = timed(lambda: reporting.inventory_report(conn, today=last_day))
+        conn.close()
+
+    print(f"legacy InventoryPage ({len(queries)} queries) {legacy * 1000:10.1f} ms")
+    print(f"reporting.inventory_report    {engine * 1000:10.1f} ms")
+    print(f"speedup: {legacy / engine:,.0f}x")
+
+if __name__ == "__main__":
+    main()
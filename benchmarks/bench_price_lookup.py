@@ -0,0 +1,82 @@
+# Keystroke-to-price latency: a fresh sqlite3.connect per keystroke (old
+# DefaultPage.update_price), the shared connection from core.db and the
+# in-memory price_resolver the page uses now.
+#
+# Run from the repository root:
+#     python benchmarks/bench_price_lookup.py [keystrokes]
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Inventory_Management"))
+
+from core import db  # noqa: E402
+from core.pricing import PriceResolver  # noqa: E402
+
+PRICE_QUERY = '''
+    SELECT price from price
+    WHERE fuel_type_id = ?
+    AND Name = ?
+    ORDER BY price_id DESC
+    LIMIT 1
+'''
+
+# One keystroke the way update_price used to handle it
+def keystroke_per_call_connection(path: str, volume: float) -> float:
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM fuel_type')
+    cursor.execute(PRICE_QUERY, (1, "Diesel" if volume < 100 else "Diesel100"))
+    price = volume * cursor.fetchone()[0]
+    conn.commit()
+    conn.close()
+    return price
+
+# One keystroke on the long-lived, configured connection
+def keystroke_shared_connection(volume: float) -> float:
+    cursor = db.get_connection().cursor()
+    cursor.execute(PRICE_QUERY, (1, "Diesel" if volume < 100 else "Diesel100"))
+    return volume * cursor.fetchone()[0]
+
+# One keystroke answered from the in-memory price cache
+def keystroke_price_resolver(resolver: PriceResolver, volume: float) -> float:
+    return resolver.sale_price("Diesel", volume)
+
+def measure(fn, keystrokes: int) -> list[float]:
+    samples = []
+    for i in range(keystrokes):
+        start = time.perf_counter()
+        fn(float(i % 250))
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+def report(name: str, samples: list[float]) -> None:
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<28} median {statistics.median(samples):8.1f} us   p95 {p95:8.1f} us")
+
+def main() -> None:
+    keystrokes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "inventory_db.db")
+        shutil.copy("Databases/inventory_db.db", path)
+        db.set_database_path(path)
+
+        before = measure(lambda v: keystroke_per_call_connection(path, v), keystrokes)
+        after = measure(keystroke_shared_connection, keystrokes)
+        resolver = PriceResolver()
+        cached = measure(lambda v: keystroke_price_resolver(resolver, v), keystrokes)
+        db.close_connection()
+
+    print(f"{keystrokes} keystrokes")
+    report("connect per keystroke", before)
+    report("shared connection", after)
+    report("price resolver", cached)
+    print(f"speedup (median): {statistics.median(before) / statistics.median(after):.1f}x")
+
+if __name__ == "__main__":
+    main()
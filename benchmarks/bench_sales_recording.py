@@ -0,0 +1,70 @@
+# Sales per second recorded synchronously (one commit per sale, the way
+# DefaultPage.submit used to) against the write-behind SalesJournal.
+#
+# Run from the repository root:
+#     python benchmarks/bench_sales_recording.py [sales]      (default 2,000)
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen  # noqa: E402
+from core import db, transactions  # noqa: E402
+from core.journal import SalesJournal  # noqa: E402
+
+SALE = [(1, 20.0, 1160.0)]
+
+def fresh_database(tmp: str, name: str) -> str:
+    path = os.path.join(tmp, name)
+    datagen.generate(path, 0, years=0).close()
+    db.set_database_path(path)
+    return path
+
+# One commit per sale on the shared connection
+def synchronous(sales: int, synchronous_mode: str) -> float:
+    conn = db.get_connection()
+    conn.execute(f"PRAGMA synchronous = {synchronous_mode}")
+    start = time.perf_counter()
+    for _ in range(sales):
+        transactions.record_sales(conn, 1, SALE, "2025-07-19 12:00:00")
+    elapsed = time.perf_counter() - start
+    db.close_connection()
+    return elapsed
+
+# Returns (time until every append returned, time until everything was committed)
+def queued(path: str, sales: int, fsync: bool) -> tuple[float, float]:
+    journal = SalesJournal(os.path.splitext(path)[0] + ".journal", fsync=fsync)
+    journal.open()
+    start = time.perf_counter()
+    for _ in range(sales):
+        journal.append(1, SALE, "2025-07-19 12:00:00")
+    appended = time.perf_counter() - start
+    journal.flush()
+    committed = time.perf_counter() - start
+    journal.close()
+    db.close_connection()
+    return appended, committed
+
+def main() -> None:
+    sales = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh_database(tmp, "sync_normal.db")
+        results.append(("synchronous (WAL, NORMAL)", synchronous(sales, "NORMAL"), None))
+        fresh_database(tmp, "sync_full.db")
+        results.append(("synchronous (WAL, FULL)", synchronous(sales, "FULL"), None))
+        for fsync in (True, False):
+            path = fresh_database(tmp, f"queued_{fsync}.db")
+            appended, committed = queued(path, sales, fsync)
+            results.append((f"queued (fsync={fsync})", appended, committed))
+
+    print(f"{sales} sales")
+    print(f"{'mode':<28}{'cashier sales/s':>18}{'committed sales/s':>20}")
+    for name, elapsed, committed in results:
+        total = committed if committed is not None else elapsed
+        print(f"{name:<28}{sales / elapsed:>18,.0f}{sales / total:>20,.0f}")
+
+if __name__ == "__main__":
+    main()
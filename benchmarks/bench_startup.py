@@ -0,0 +1,58 @@
+# Time to first frame: from launching the app until its imports are done,
+# until the login window is on screen and until startup has finished behind
+# it (schema check, journal replay). The app prints these moments when
+# GAS_INVENTORY_STARTUP_PROBE is set and then closes itself. Without a
+# display only the imports stage can be measured.
+#
+# Run from the repository root:
+#     python benchmarks/bench_startup.py [--runs 10] [--exe dist/Mainframe/Mainframe]
+#
+# --exe also measures a frozen build (see Mainframe.spec).
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SOURCE = [sys.executable, os.path.join("Inventory_Management", "Mainframe.py")]
+STAGES = ("imports", "first-frame", "ready")
+
+# {stage: seconds since launch} of one start, None if the app did not report
+def launch(command: list[str]) -> dict[str, float] | None:
+    env = dict(os.environ, GAS_INVENTORY_STARTUP_PROBE="1")
+    start = time.time()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    stages = {}
+    for line in result.stdout.splitlines():
+        stage, _, stamp = line.partition(" ")
+        if stage in STAGES:
+            stages[stage] = float(stamp) - start
+    if "first-frame" not in stages:
+        print(f"  {' '.join(command)} did not show a window: {result.stderr.strip().splitlines()[-1:]}")
+    return stages or None
+
+def measure(label: str, command: list[str], runs: int) -> None:
+    launch(command)  # warm the OS file cache
+    samples = [stages for stages in (launch(command) for _ in range(runs)) if stages]
+    if not samples:
+        return
+    for stage in STAGES:
+        times = sorted(s[stage] * 1000 for s in samples if stage in s)
+        if not times:
+            continue
+        print(f"{label:<10}{stage:<14}median {statistics.median(times):8.1f} ms   "
+              f"min {times[0]:8.1f} ms   max {times[-1]:8.1f} ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time to first frame of the app")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--exe", help="frozen executable to measure as well")
+    args = parser.parse_args()
+    measure("source", SOURCE, args.runs)
+    if args.exe:
+        measure("frozen", [os.path.abspath(args.exe)], args.runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# Synthetic station databases for the benchmarks.
+#
+# generate() fills every table with years of station history: two shifts a
+# day worked by a pool of cashiers, weekly price changes and sales spread over
+# the shifts (busier weekends and evenings). It can also be run directly:
+#     python benchmarks/datagen.py station.db --transactions 1000000 --years 3
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Inventory_Management"))
+
+from core import migrations, rollups  # noqa: E402
+from core import timestamps  # noqa: E402
+from core.auth import hash_password  # noqa: E402
+
+PUMPS = [
+    (1, 'Diesel 1'),
+    (1, 'Diesel 2'),
+    (2, 'Premium 1'),
+    (2, 'Premium 2'),
+    (2, 'Premium 3'),
+    (3, 'Unleaded'),
+]
+PRICES = {"Diesel": (1, 58.0), "Premium": (2, 66.0), "Unleaded": (3, 62.0)}
+
+# Password of every generated user
+PASSWORD = "password"
+BULK_DISCOUNT = 0.95
+
+# Daily prices of each price Name over the generated period: a small random
+# walk that changes every price_change_days days
+def price_walk(rng: random.Random, days: int, price_change_days: int) -> dict[str, list[float]]:
+    walk: dict[str, list[float]] = {}
+    for name, (_, price) in PRICES.items():
+        daily = []
+        for day in range(days):
+            if day and day % price_change_days == 0:
+                price = round(max(30.0, price + rng.uniform(-1.5, 1.6)), 2)
+            daily.append(price)
+        walk[name] = daily
+        walk[name + "100"] = [round(p * BULK_DISCOUNT, 2) for p in daily]
+    return walk
+
+# Creates a station at path holding years of history with the given number
+# of transactions (none for an empty station with its seed rows and one day
+# of shifts). The newest shift is left open, like a station mid-shift.
+def generate(path: str, transactions: int, years: float = 3, users: int = 6, seed: int = 7,
+             start: datetime.date = datetime.date(2022, 1, 1), price_change_days: int = 7,
+             chunk: int = 50_000) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    days = max(1, int(years * 365))
+    dates = [start + datetime.timedelta(days=d) for d in range(days)]
+    prices = price_walk(rng, days, price_change_days)
+    fuel_names = [""] + list(PRICES)
+    fuel_of_pump = [0] + [fuel for fuel, _ in PUMPS]
+    # Busier pumps get picked more often
+    pump_weights = [rng.uniform(0.6, 1.4) for _ in PUMPS]
+    pump_ids = list(range(1, len(PUMPS) + 1))
+
+    conn = sqlite3.connect(path)
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        migrations.migrate(cursor)
+        cursor.execute('DROP TRIGGER IF EXISTS trg_transactions_rollup')
+        cursor.executemany('INSERT INTO fuel_type (fuel_name) VALUES (?)', [(name,) for name in PRICES])
+        cursor.executemany("INSERT INTO pump (fuel_type_id, pump_label) VALUES (?, ?)", PUMPS)
+        password_hash = hash_password(PASSWORD)
+        cursor.executemany('INSERT INTO users (username, password_hash) VALUES (?, ?)',
+                           [("admin", password_hash)] +
+                           [(f"cashier{n:02d}", password_hash) for n in range(1, users)])
+
+        price_rows = []
+        for name, daily in prices.items():
+            fuel_type_id = PRICES[name.removesuffix("100")][0]
+            for day, price in enumerate(daily):
+                if day == 0 or price != daily[day - 1]:
+                    price_rows.append((day, fuel_type_id, price, name, timestamps.day_start(dates[day])))
+        price_rows.sort()
+        cursor.executemany('INSERT INTO price(fuel_type_id, price, Name, effective_date) VALUES (?,?,?,?)',
+                           [row[1:] for row in price_rows])
+
+        # Two twelve-hour shifts a day; weekends and PM shifts sell more
+        shift_rows, shift_starts, weights = [], [], []
+        for date in dates:
+            weekend = date.weekday() >= 5
+            for shift_type, hour, weight in (("AM", 6, 1.0), ("PM", 18, 1.2)):
+                begin = datetime.datetime.combine(date, datetime.time(hour))
+                end = begin + datetime.timedelta(hours=12, seconds=-1)
+                user_id = rng.randint(2, users) if users > 1 else 1
+                shift_rows.append((user_id, date.strftime("%Y-%m-%d"), shift_type,
+                                   timestamps.stamp(begin), timestamps.stamp(end)))
+                shift_starts.append(begin)
+                weights.append(weight * (1.3 if weekend else 1.0) * rng.uniform(0.8, 1.2))
+        shift_rows[-1] = shift_rows[-1][:4] + (None,)
+        cursor.executemany('''INSERT INTO shift(user_id, shift_date, shift_type, shift_start_time, shift_end_time)
+            VALUES (?, ?, ?, ?, ?)''', shift_rows)
+
+        # Number of sales that end within each shift, from the cumulative weights
+        total, running, bounds = sum(weights), 0.0, []
+        for weight in weights:
+            running += weight
+            bounds.append(round(transactions * running / total))
+
+        # Sales of a shift are spread evenly over its twelve hours
+        shift, done = 0, 0
+        first, seconds_apart = 0, 43200 / max(1, bounds[0])
+        while done < transactions:
+            batch = []
+            end = min(transactions, done + chunk)
+            pumps = rng.choices(pump_ids, pump_weights, k=end - done)
+            for i, pump_id in zip(range(done, end), pumps):
+                while bounds[shift] <= i:
+                    shift += 1
+                    first = bounds[shift - 1]
+                    seconds_apart = 43200 / max(1, bounds[shift] - first)
+                day = shift // 2
+                volume = round(min(rng.lognormvariate(3.0, 0.7), 400.0), 2)
+                name = fuel_names[fuel_of_pump[pump_id]]
+                price = prices[name if volume < 100 else name + "100"][day]
+                moment = shift_starts[shift] + datetime.timedelta(seconds=int((i - first) * seconds_apart))
+                batch.append((shift + 1, pump_id, volume, round(volume * price, 2), moment.isoformat(" ")))
+            cursor.executemany('INSERT INTO transactions(shift_id, pump_id, Volume, Price, Date) VALUES (?,?,?,?,?)', batch)
+            done += len(batch)
+        rollups.create_rollups(cursor)
+        rollups.backfill(cursor)
+    return conn
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic station database")
+    parser.add_argument("path", help="database file to create (must not exist)")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--users", type=int, default=6, help="admin plus cashiers (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    if os.path.exists(args.path):
+        parser.error(f"{args.path} already exists")
+    start = time.perf_counter()
+    generate(args.path, args.transactions, args.years, args.users, args.seed).close()
+    print(f"generated {args.transactions:,} transactions in {time.perf_counter() - start:.1f}s -> {args.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# Load test of the station server: N cashier terminals on one machine, each a
+# process that logs in as its own cashier, starts a shift and then records
+# sales as fast as it can (or with --think-ms between them), reading the
+# prices before every sale and the Inventory report and transaction history
+# every --report-every sales. Prints latency percentiles per operation and
+# checks that every acknowledged sale is in the database afterwards.
+#
+# --mode direct runs the same terminals on the database file itself, one
+# synchronous commit per sale, the way several copies of the app share it
+# without a server.
+#
+# Run from the repository root:
+#     python benchmarks/load_test.py --terminals 8 --duration 10
+#     python benchmarks/load_test.py --terminals 8 --mode direct
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(HERE, "..", "Inventory_Management")
+sys.path.insert(0, HERE)
+
+import datagen  # noqa: E402
+from core import db, shifts, timestamps, transactions  # noqa: E402
+
+OPERATIONS = ("login", "prices", "record_sale", "report", "history")
+
+# What one terminal does; returns {operation: [latency ms, ...], "errors": [...]}
+def terminal(mode: str, target: str, number: int, duration: float, think: float,
+             report_every: int, seed: int) -> dict:
+    rng = random.Random(seed + number)
+    username = f"cashier{number:02d}"
+    latencies: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+    errors: List[str] = []
+    recorded = 0
+
+    def timed(op: str, call):
+        start = time.perf_counter()
+        try:
+            return call()
+        except Exception as error:
+            errors.append(f"{op}: {type(error).__name__}: {error}")
+            return None
+        finally:
+            latencies[op].append((time.perf_counter() - start) * 1000)
+
+    if mode == "server":
+        from core.client import RemoteStation
+        backend = RemoteStation(target)
+        backend.open()
+    else:
+        db.set_database_path(target)
+        from core.station import LocalStation
+        backend = LocalStation()
+    user_id = timed("login", lambda: backend.check_login(username, datagen.PASSWORD))[1]
+    shift_date, shift_type, stamp = shifts.shift_stamp()
+    shift_id = backend.start_shift(user_id, shift_date, shift_type, stamp)
+    pump_ids = [pump.pump_id for pump in backend.forecourt().pumps]
+
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        prices = timed("prices", backend.current_prices)
+        if prices is None:
+            continue
+        pump_id = rng.choice(pump_ids)
+        volume = round(rng.uniform(2, 60), 2)
+        sale = [(pump_id, volume, round(volume * prices["Diesel"], 2))]
+        if mode == "server":
+            ok = timed("record_sale", lambda: backend.record_sales(shift_id, sale, timestamps.stamp()) or True)
+        else:
+            # No shared journal between processes: one commit per sale
+            ok = timed("record_sale", lambda: transactions.record_sales(
+                db.get_connection(), shift_id, sale, timestamps.stamp()))
+        if ok:
+            recorded += 1
+        if report_every and recorded % report_every == 0:
+            timed("report", backend.inventory_report)
+            timed("history", backend.fetch_older)
+        if think:
+            time.sleep(think)
+    backend.end_shift(shift_id, shifts.shift_stamp()[2])
+    backend.close()
+    return {"latencies": latencies, "errors": errors, "recorded": recorded}
+
+def _run_terminal(args: tuple) -> dict:
+    return terminal(*args)
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+# Starts manage.py serve on the database; returns the process and its address
+def start_server(path: str, listen: str) -> subprocess.Popen:
+    server = subprocess.Popen([sys.executable, os.path.join(APP, "manage.py"), "--db", path, "serve",
+                               "--listen", listen], stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline() if server.stdout else ""
+    if not line.startswith("Serving"):
+        server.kill()
+        raise RuntimeError(f"The server did not start: {line!r}")
+    return server
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test of the station server")
+    parser.add_argument("--terminals", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of selling (default: %(default)s)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between sales (default: none)")
+    parser.add_argument("--report-every", type=int, default=50,
+                        help="sales between Inventory/history reads, 0 for none (default: %(default)s)")
+    parser.add_argument("--transactions", type=int, default=100_000, help="history of the generated station")
+    parser.add_argument("--mode", choices=("server", "direct"), default="server")
+    parser.add_argument("--listen", help="server address (default: a Unix socket, or TCP on Windows)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "station.db")
+        print(f"generating {args.transactions:,} transactions ...", flush=True)
+        datagen.generate(path, args.transactions, users=args.terminals + 1).close()
+        before = sqlite3.connect(path).execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+
+        server = None
+        target = path
+        if args.mode == "server":
+            target = args.listen or (f"unix:{os.path.join(tmp, 'station.sock')}"
+                                     if hasattr(os, "fork") else "127.0.0.1:8758")
+            server = start_server(path, target)
+        started = time.perf_counter()
+        try:
+            work = [(args.mode, target, number, args.duration, args.think_ms / 1000,
+                     args.report_every, args.seed) for number in range(1, args.terminals + 1)]
+            with multiprocessing.get_context("spawn").Pool(args.terminals) as pool:
+                results = pool.map(_run_terminal, work)
+        finally:
+            if server is not None:
+                server.send_signal(2)   # SIGINT: the server commits its journal and stops
+                server.wait(30)
+        elapsed = time.perf_counter() - started
+        after = sqlite3.connect(path).execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+
+    recorded = sum(result["recorded"] for result in results)
+    errors = [error for result in results for error in result["errors"]]
+    report = {"mode": args.mode, "terminals": args.terminals, "duration_s": args.duration,
+              "sales_recorded": recorded, "sales_in_database": after - before,
+              "sales_per_s": recorded / args.duration, "errors": len(errors), "operations": {}}
+    print(f"\n{args.mode}: {args.terminals} terminals, {recorded:,} sales in {args.duration:.0f}s "
+          f"({recorded / args.duration:,.0f}/s), {after - before:,} in the database, "
+          f"{len(errors)} errors ({elapsed:.1f}s wall)")
+    print(f"  {'operation':<14}{'count':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for op in OPERATIONS:
+        samples = [sample for result in results for sample in result["latencies"][op]]
+        if not samples:
+            continue
+        stats = {"count": len(samples), "p50_ms": statistics.median(samples),
+                 "p95_ms": percentile(samples, 0.95), "p99_ms": percentile(samples, 0.99),
+                 "max_ms": max(samples)}
+        report["operations"][op] = stats
+        print(f"  {op:<14}{stats['count']:>9,}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    for error in sorted(set(errors))[:10]:
+        print(f"  ! {error}")
+    if recorded != after - before:
+        print("  ! acknowledged sales and database rows differ")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Times the queries the pages run (InventoryPage, TransactionsPage,
+# PricePage.refresh/refresh100, DefaultPage.update_price, the journal append
+# behind submit and manage.py report) on generated stations of 10K, 1M and 10M transactions, and
+# writes the results as JSON so runs of different versions can be compared.
+#
+# Run from the repository root:
+#     python benchmarks/suite.py                       (all scales)
+#     python benchmarks/suite.py --scales 10k,1m --repeats 50
+#
+# Generated stations are cached in --data-dir and reused by later runs. Each
+# run works on a copy, so the rows written by the submit case never pile up.
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen  # noqa: E402
+from core import db, pricing, reporting, timestamps, transactions  # noqa: E402
+from core.journal import SalesJournal  # noqa: E402
+from core.pricing import PriceResolver  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+PRICE_NAMES = ('Diesel', 'Premium', 'Unleaded')
+PRICE100_NAMES = ('Diesel100', 'Premium100', 'Unleaded100')
+
+# Path of the cached station with that many transactions, generated on first use
+def station(data_dir: str, rows: int) -> str:
+    path = os.path.join(data_dir, f"station_{rows}.db")
+    if not os.path.exists(path):
+        print(f"generating {rows:,} transactions into {path} ...", flush=True)
+        datagen.generate(path + ".tmp", rows).close()
+        os.replace(path + ".tmp", path)
+    return path
+
+# name -> call, each made on the app's own connection to the working copy;
+# submit appends to an open journal, which is all a cashier waits for
+def cases(conn: sqlite3.Connection, journal: SalesJournal) -> Dict[str, Callable[[], object]]:
+    newest = conn.execute('SELECT MAX(transaction_id) FROM transactions').fetchone()[0]
+    shift_id = conn.execute('SELECT MAX(shift_id) FROM shift').fetchone()[0]
+    date = timestamps.stamp()
+    last_day = datetime.date.fromisoformat(
+        conn.execute('SELECT substr(MAX(Date), 1, 10) FROM transactions').fetchone()[0])
+    day_after = last_day + datetime.timedelta(days=1)
+    month = last_day.replace(day=1)
+    warm = PriceResolver()
+    warm.load(conn)
+    sale = [(1, 25.0, 1450.0), (3, 120.0, 7524.0), (6, 8.5, 527.0)]
+    return {
+        # The periods around the newest generated sale, not today's (the history ends earlier)
+        "inventory_report": lambda: reporting.inventory_report(conn, today=last_day),
+        "transactions_first_page": lambda: transactions.fetch_older(conn),
+        "transactions_scroll_back": lambda: transactions.fetch_older(conn, newest // 2),
+        "transactions_scroll_forward": lambda: transactions.fetch_newer(conn, newest // 2),
+        "sales_last_day": lambda: reporting.sales_between(
+            conn, timestamps.day_start(last_day), timestamps.day_start(day_after)),
+        "series_month_by_day": lambda: reporting.time_series(conn, month, day_after, "day", "pump"),
+        "series_day_by_hour": lambda: reporting.time_series(conn, last_day, day_after, "hour", "fuel"),
+        "series_month_by_shift": lambda: reporting.time_series(conn, month, day_after, "day", "shift"),
+        "price_refresh": lambda: pricing.price_history(conn, PRICE_NAMES),
+        "price_refresh100": lambda: pricing.price_history(conn, PRICE100_NAMES),
+        "price_load": lambda: PriceResolver().load(conn),
+        "update_price": lambda: warm.sale_price("Premium", 130.0),
+        "submit": lambda: journal.append(shift_id, sale, date),
+    }
+
+def measure(fn: Callable[[], object], repeats: int) -> dict:
+    fn()  # warm the page cache and the statement cache
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+        "max_ms": samples[-1],
+        "repeats": repeats,
+    }
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_scale(data_dir: str, label: str, repeats: int) -> dict:
+    source = station(data_dir, SCALES[label])
+    work = os.path.join(data_dir, "work.db")
+    shutil.copyfile(source, work)
+    db.set_database_path(work)
+    journal = SalesJournal()
+    journal.open()
+    journal_path = journal.path
+    try:
+        results = {name: measure(fn, repeats) for name, fn in cases(db.get_connection(), journal).items()}
+    finally:
+        journal.close()
+        db.close_connection()
+        for path in (work, work + "-wal", work + "-shm", journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return {"transactions": SCALES[label], "cases": results}
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Station database benchmark suite")
+    parser.add_argument("--scales", default=",".join(SCALES),
+                        help="comma separated, from %s (default: all)" % ", ".join(SCALES))
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--data-dir", default=os.path.join(HERE, ".data"),
+                        help="where generated stations are cached (default: %(default)s)")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<time>.json)")
+    args = parser.parse_args(argv)
+    labels = [label.strip().lower() for label in args.scales.split(",")]
+    unknown = [label for label in labels if label not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    now = datetime.datetime.now()
+    report = {
+        "created": now.isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "scales": {},
+    }
+    for label in labels:
+        report["scales"][label] = scale = run_scale(args.data_dir, label, args.repeats)
+        print(f"\n{label} ({scale['transactions']:,} transactions)")
+        for name, result in scale["cases"].items():
+            print(f"  {name:<30}{result['median_ms']:10.3f} ms  p95 {result['p95_ms']:8.3f} ms")
+
+    output = args.output or os.path.join(HERE, "results", now.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {output}")
+
+if __name__ == "__main__":
+    main()